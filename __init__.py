@@ -1,12 +1,43 @@
-from .src import BeatmapIO
-from .src import BeatmapBase
-from .src import Gamemode
-from .src import Hitobject
+import importlib
 
 
+# Names are resolved on first access through ``src``, which imports their modules lazily
 __all__ = [
     'BeatmapIO',
+    'BeatmapLoader',
     'BeatmapBase',
     'Gamemode',
-    'Hitobject'
+    'Mods',
+    'Hitobject',
+    'BeatmapIndex',
+    'SharedBeatmap',
+    'SharedBeatmapView',
+    'BeatmapCorpus',
+    'BeatmapCorpusWriter',
+    'Features',
+    'BeatGrid',
+    'Stacking',
+    'ManiaColumns',
+    'BeatmapCache',
+    'MetadataIO',
+    'BeatmapDiff',
+    'diff_beatmaps',
+    'Fingerprint',
+    'FingerprintIndex',
+    'BeatmapWatcher',
+    'TableExport',
+    'TableShardWriter'
 ]
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(importlib.import_module('.src', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
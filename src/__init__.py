@@ -1,4 +1,44 @@
-from .beatmapIO import BeatmapIO
-from .beatmap_base import BeatmapBase
-from .gamemode import Gamemode
-from .hitobject import Hitobject
+import importlib
+
+# Public name -> module defining it. Modules are imported on first access of one of
+# their names, so e.g. reading metadata with ``MetadataIO`` never imports NumPy or the
+# hitobject classes, and ``import beatmap_reader`` on its own costs next to nothing.
+_EXPORTS = {
+    'BeatmapIO'           : '.beatmapIO',
+    'BeatmapLoader'       : '.beatmapIO',
+    'BeatmapBase'         : '.beatmap_base',
+    'BeatmapCache'        : '.beatmap_cache',
+    'Gamemode'            : '.gamemode',
+    'Mods'                : '.mods',
+    'Stacking'            : '.stacking',
+    'ManiaColumns'        : '.mania_columns',
+    'Hitobject'           : '.hitobject',
+    'BeatmapIndex'        : '.beatmap_index',
+    'SharedBeatmap'       : '.shared_beatmap',
+    'SharedBeatmapView'   : '.shared_beatmap',
+    'BeatmapCorpus'       : '.beatmap_corpus',
+    'BeatmapCorpusWriter' : '.beatmap_corpus',
+    'Features'            : '.features',
+    'BeatGrid'            : '.beat_grid',
+    'MetadataIO'          : '.metadata_io',
+    'BeatmapDiff'         : '.beatmap_diff',
+    'Fingerprint'         : '.fingerprint',
+    'FingerprintIndex'    : '.fingerprint',
+    'BeatmapWatcher'      : '.beatmap_watcher',
+    'TableExport'         : '.table_export',
+    'TableShardWriter'    : '.table_export',
+    'diff_beatmaps'       : '.beatmap_diff',
+}
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
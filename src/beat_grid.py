@@ -0,0 +1,175 @@
+import numpy as np
+
+from .beatmap_base import BeatmapBase
+from .hitobject.hitobject import Hitobject
+
+
+
+class BeatGrid():
+    """
+    Beat/measure lines and snap divisors derived from uninherited timing points
+
+    Everything is computed with array operations over all timing sections at
+    once; times are matched to their section with ``np.searchsorted``.
+    """
+
+    DIVISORS = ( 1, 2, 3, 4, 6, 8, 12, 16 )
+
+    SNAP_TOLERANCE_MS = 2
+
+    MIN_BEAT_LENGTH_MS = 1
+    """
+    Sections with shorter beats (gimmick maps use near-infinite BPMs) only get
+    a line at their offset, and times in them only snap to that line.
+    """
+
+
+    @staticmethod
+    def sections(beatmap: BeatmapBase) -> np.ndarray:
+        """
+        Returns the uninherited timing points as a (S, 7) array indexed by ``BeatmapBase.TPDATA_*``
+        """
+        timing_data = beatmap.timing_array()
+        return timing_data[timing_data[:, BeatmapBase.TPDATA_INHR] == 0]
+
+
+    @staticmethod
+    def lines(beatmap: BeatmapBase, end_time: float | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Generates every beat line of the map
+
+        Args:
+            beatmap: (BeatmapBase) beatmap to generate the lines for
+            end_time: (float) time to stop at. Defaults to the end of the last hitobject
+
+        Returns:
+            (beat times, boolean mask of which beats are also measure lines)
+        """
+        sections = BeatGrid.sections(beatmap)
+        if len(sections) == 0:
+            return np.zeros(0), np.zeros(0, dtype=bool)
+
+        if end_time is None:
+            hitobject_data = beatmap.hitobject_array()
+            end_time = np.nanmax(hitobject_data[:, Hitobject.HDATA_TEND]) if len(hitobject_data) > 0 else sections[-1, BeatmapBase.TPDATA_OFFS]
+
+        offsets      = sections[:, BeatmapBase.TPDATA_OFFS]
+        beat_lengths = sections[:, BeatmapBase.TPDATA_BLEN]
+        meters       = np.maximum(sections[:, BeatmapBase.TPDATA_METR].astype(np.int64), 1)
+
+        section_ends = np.append(offsets[1:], max(end_time, offsets[-1]) + 1)
+        degenerate   = beat_lengths < BeatGrid.MIN_BEAT_LENGTH_MS
+
+        num_beats = np.ones(len(sections), dtype=np.int64)
+        num_beats[~degenerate] = np.maximum(np.ceil((section_ends[~degenerate] - offsets[~degenerate]) / beat_lengths[~degenerate]), 1).astype(np.int64)
+
+        # Beat index within its section for every generated beat
+        section_idx = np.repeat(np.arange(len(sections)), num_beats)
+        beat_idx    = np.arange(num_beats.sum()) - np.repeat(np.cumsum(num_beats) - num_beats, num_beats)
+
+        times = offsets[section_idx] + beat_idx*np.where(degenerate, 0, beat_lengths)[section_idx]
+        is_measure = ( beat_idx % meters[section_idx] ) == 0
+
+        return times, is_measure
+
+
+    @staticmethod
+    def locate(beatmap: BeatmapBase, times: np.ndarray, tolerance_ms: float = SNAP_TOLERANCE_MS) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds which measure each time falls in and where in that measure it is
+
+        Times up to ``tolerance_ms`` before a measure line count as being on it,
+        since hitobject times are rounded to whole milliseconds. Their beat
+        position is then slightly negative.
+
+        Returns:
+            (measure index counted from the first section, beat position within the measure as a float)
+        """
+        sections = BeatGrid.sections(beatmap)
+        times = np.asarray(times, dtype=np.float64)
+
+        if len(sections) == 0:
+            return np.zeros(len(times), dtype=np.int64), np.zeros(len(times))
+
+        offsets      = sections[:, BeatmapBase.TPDATA_OFFS]
+        beat_lengths = np.maximum(sections[:, BeatmapBase.TPDATA_BLEN], BeatGrid.MIN_BEAT_LENGTH_MS)
+        meters       = np.maximum(sections[:, BeatmapBase.TPDATA_METR], 1)
+
+        # Measures each section spans; a new section always starts a new measure
+        section_beats    = np.append(np.diff(offsets) / beat_lengths[:-1], 0)
+        section_measures = np.ceil(section_beats / meters)
+        first_measure    = np.concatenate(([ 0 ], np.cumsum(section_measures)[:-1]))
+
+        idx  = BeatGrid.__section_idx(offsets, times)
+        beat = (times - offsets[idx]) / beat_lengths[idx]
+        measure_in_section = np.floor((beat + tolerance_ms/beat_lengths[idx]) / meters[idx])
+
+        return (first_measure[idx] + measure_in_section).astype(np.int64), beat - measure_in_section*meters[idx]
+
+
+    @staticmethod
+    def snap(beatmap: BeatmapBase, times: np.ndarray, divisors: tuple = DIVISORS, tolerance_ms: float = SNAP_TOLERANCE_MS) -> np.ndarray:
+        """
+        Classifies each time by the smallest snap divisor it lies on
+
+        Args:
+            times: (array) times to classify
+            divisors: (tuple) candidate divisors, e.g. 4 for 1/4 beats. Checked smallest first
+            tolerance_ms: (float) max distance from a snap line to still count as on it
+
+        Returns:
+            divisor per time; 0 where the time is not on any of the divisors
+        """
+        sections = BeatGrid.sections(beatmap)
+        times = np.asarray(times, dtype=np.float64)
+
+        if len(sections) == 0 or len(times) == 0:
+            return np.zeros(len(times), dtype=np.int64)
+
+        offsets      = sections[:, BeatmapBase.TPDATA_OFFS]
+        beat_lengths = sections[:, BeatmapBase.TPDATA_BLEN]
+
+        idx = BeatGrid.__section_idx(offsets, times)
+        beat_length = beat_lengths[idx]
+        degenerate  = beat_length < BeatGrid.MIN_BEAT_LENGTH_MS
+
+        beat_length = np.where(degenerate, 1, beat_length)
+        beat = (times - offsets[idx]) / beat_length
+
+        # (times, divisors) matrix of distances in ms to the nearest line of each divisor
+        divisors = np.asarray(sorted(divisors), dtype=np.float64)
+        sub_beat = beat[:, None] * divisors[None, :]
+        error_ms = np.abs(sub_beat - np.round(sub_beat)) * beat_length[:, None] / divisors[None, :]
+
+        on_line = error_ms <= tolerance_ms
+        snapped = on_line.any(axis=1)
+        result  = np.where(snapped, divisors[np.argmax(on_line, axis=1)], 0).astype(np.int64)
+
+        # Degenerate sections only have a line at their offset
+        on_offset = np.abs(times - offsets[idx]) <= tolerance_ms
+        result[degenerate] = np.where(on_offset[degenerate], 1, 0)
+
+        return result
+
+
+    @staticmethod
+    def snap_hitobjects(beatmap: BeatmapBase, divisors: tuple = DIVISORS, tolerance_ms: float = SNAP_TOLERANCE_MS) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            (start time divisors, end time divisors) per hitobject. End divisors of
+            circles are 0 since they have no end.
+        """
+        hitobject_data = beatmap.hitobject_array()
+        start_snaps = BeatGrid.snap(beatmap, hitobject_data[:, Hitobject.HDATA_TSRT], divisors, tolerance_ms)
+        end_snaps   = BeatGrid.snap(beatmap, hitobject_data[:, Hitobject.HDATA_TEND], divisors, tolerance_ms)
+
+        is_circle = ( hitobject_data[:, Hitobject.HDATA_TYPE].astype(np.int64) & Hitobject.CIRCLE ) > 0
+        end_snaps[is_circle] = 0
+
+        return start_snaps, end_snaps
+
+
+    @staticmethod
+    def __section_idx(offsets: np.ndarray, times: np.ndarray) -> np.ndarray:
+        # Times before the first section belong to it, like in __postprocess_hitobjects
+        return np.maximum(np.searchsorted(offsets, times, side='right') - 1, 0)
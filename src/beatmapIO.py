@@ -1,12 +1,21 @@
 import io
+import os
 import hashlib
+import zipfile
+import operator
+
+import numpy as np
 
 
 from .beatmap_base import BeatmapBase
+from .beatmap_cache import BeatmapCache
+from .mania_columns import ManiaColumns
 from .gamemode import Gamemode
 
 from .hitobject.hitobject import Hitobject
 
+from .utils.parallel import imap_ordered, starred
+
 #from .hitobject.std.std_singlenote_io import StdSingleNoteIO
 #from .hitobject.std.std_holdnote_io import StdHoldNoteIO
 #from .hitobject.std.std_spinner_io import StdSpinnerIO
@@ -16,13 +25,13 @@ from .hitobject.std.std_holdnote_hitobject_base import StdHoldNoteHitobjectBase
 from .hitobject.std.std_spinner_hitobject_base import StdSpinnerHitobjectBase
 
 
-#from .hitobject.taiko.taiko_singlenote_hitobject import TaikoSingleNoteHitobject
-#from .hitobject.taiko.taiko_holdnote_hitobject import TaikoHoldNoteHitobject
-#from .hitobject.taiko.taiko_spinner_hitobject import TaikoSpinnerHitobject
+from .hitobject.taiko.taiko_singlenote_hitobject import TaikoSingleNoteHitobject
+from .hitobject.taiko.taiko_holdnote_hitobject import TaikoHoldNoteHitobject
+from .hitobject.taiko.taiko_spinner_hitobject import TaikoSpinnerHitobject
 
-#from .hitobject.catch.catch_singlenote_hitobject import CatchSingleNoteHitobject
-#from .hitobject.catch.catch_holdnote_hitobject import CatchHoldNoteHitobject
-#from .hitobject.catch.catch_spinner_hitobject import CatchSpinnerHitobject
+from .hitobject.catch.catch_singlenote_hitobject import CatchSingleNoteHitobject
+from .hitobject.catch.catch_holdnote_hitobject import CatchHoldNoteHitobject
+from .hitobject.catch.catch_spinner_hitobject import CatchSpinnerHitobject
 
 #from .hitobject.mania.mania_singlenote_io import ManiaSingleNoteIO
 #from .hitobject.mania.mania_holdnote_io import ManiaHoldNoteIO
@@ -60,6 +69,28 @@ class BeatmapIO():
         SECTION_HITOBJECTS   = 8
 
 
+    WRITE_FORMAT_VERSION = 14
+    WRITE_BUFFER_SIZE    = 1 << 16
+
+    PARALLEL_TICK_THRESHOLD = 2000
+    """
+    Maps with fewer sliders than this generate ticks serially even when
+    ``tick_workers`` is given; below it, pool startup and pickling cost more
+    than they save.
+    """
+
+    SLIDER_TICK_ATTRS = ( 'tdata', 'gen_points', 'length_sums', 'tick_types' )
+    """
+    Slider attributes generated by ``generate_tick_data`` that are sent back
+    from the workers when generating ticks in parallel
+    """
+
+    default_loader: "BeatmapLoader"
+    """
+    Loader the static loading methods delegate to. Replace it to change the
+    defaults for the whole process, e.g. ``BeatmapIO.default_loader = BeatmapLoader(cache=BeatmapCache())``
+    """
+
     class BeatmapIOException(Exception):
         pass
 
@@ -79,58 +110,248 @@ class BeatmapIO():
 
 
     @staticmethod
-    def open_beatmap(filepath: str):
+    def enable_cache(max_entries: int = 128, max_bytes: int | None = None) -> BeatmapCache:
+        """
+        Caches beatmaps loaded through the default loader from ``str`` or ``bytes``
+        data by a hash of their contents, fidelity and time range. Loading the same contents again returns a copy of
+        the cached beatmap instead of parsing it, see ``BeatmapCache``.
+        Replaces any cache already enabled.
+
+        The default loader is replaced by one with the cache, see ``BeatmapLoader.with_options``;
+        loaders already handed out, e.g. to a ``BeatmapWatcher``, keep their options.
+
+        Args:
+            max_entries: (int) max number of beatmaps kept
+            max_bytes: (int) max estimated total size of the beatmaps kept. ``None`` is unbounded
+
+        Returns:
+            The cache, for its ``stats()``
+        """
+        cache = BeatmapCache(max_entries, max_bytes)
+        BeatmapIO.default_loader = BeatmapIO.default_loader.with_options(cache=cache)
+        return cache
+
+
+    @staticmethod
+    def disable_cache():
+        """
+        Replaces the default loader by one without a cache, see ``enable_cache``
+        """
+        BeatmapIO.default_loader = BeatmapIO.default_loader.with_options(cache=None)
+
+
+    @staticmethod
+    def open_beatmap(filepath: str, tick_workers: int | None = None, tick_threads: bool = False, fidelity: str = Hitobject.FIDELITY_FULL, time_range: tuple[float, float] | None = None):
         """
         Opens a beatmap file and reads it
 
         Args:
             filepath: (string) filepath to the beatmap file to load
+            tick_workers: (int) see ``load_beatmap``
+            tick_threads: (bool) see ``load_beatmap``
+            fidelity: (str) see ``load_beatmap``
+            time_range: (tuple) see ``load_beatmap``
         """
-        with open(filepath, 'rt', encoding='utf-8') as beatmap_file:
-            beatmap = BeatmapIO.load_beatmap(beatmap_file)
+        with open(filepath, 'rb') as beatmap_file:
+            beatmap_data = beatmap_file.read()
 
-        beatmap.metadata.beatmap_md5 = hashlib.md5(open(filepath, 'rb').read()).hexdigest()
-        return beatmap
+        return BeatmapIO.load_beatmap(beatmap_data, tick_workers, tick_threads, fidelity, time_range)
+
+
+    @staticmethod
+    def open_beatmaps(filepaths, num_workers: int | None = None, process=None, skip_errors: bool = False):
+        """
+        Bulk loads beatmap files, optionally on a process pool
+
+        Args:
+            filepaths: (iterable) filepaths to the beatmap files to load
+            num_workers: (int) number of processes to parse the beatmaps with. ``None`` parses serially
+            process: (callable) applied to each loaded beatmap in the worker; its return value is
+                yielded instead of the beatmap. Must be picklable when ``num_workers`` > 1
+            skip_errors: (bool) warn and continue instead of raising if a beatmap fails to load
+
+        Yields:
+            (filepath, beatmap or processed result) in input order
+        """
+        funcs = [ BeatmapIO.open_beatmap ]
+        if process is not None:
+            funcs.append(process)
+
+        for filepath, result, error in imap_ordered(funcs, filepaths, num_workers):
+            if error is not None:
+                if not skip_errors:
+                    raise BeatmapIO.BeatmapIOException(f'Failed to load "{filepath}": {error}') from error
+
+                print(f'WARN[beatmap_reader]: failed to load "{filepath}": {error}')
+                continue
+
+            yield filepath, result
+
+
+    @staticmethod
+    def open_osz(filepath: str, num_workers: int | None = None) -> dict[str, BeatmapBase]:
+        """
+        Opens a *.osz beatmap set and reads every *.osu file in it without extracting
+        the archive. Audio, image, and other members are never decompressed.
+
+        Args:
+            filepath: (string) filepath to the *.osz file to load
+            num_workers: (int) number of processes to parse the beatmaps with. ``None`` parses serially
+
+        Returns:
+            dict of archive member name -> beatmap, in archive order
+        """
+        with zipfile.ZipFile(filepath, 'r') as osz_file:
+            members = BeatmapIO.__read_osz_members(osz_file)
+
+        beatmaps = {}
+        for (name, _), beatmap, error in imap_ordered([ operator.itemgetter(-1), BeatmapIO.load_beatmap ], members, num_workers):
+            if error is not None:
+                raise BeatmapIO.BeatmapIOException(f'Failed to load "{name}" from "{filepath}": {error}') from error
+
+            beatmaps[name] = beatmap
+
+        return beatmaps
+
+
+    @staticmethod
+    def open_osz_dir(dirpath: str, num_workers: int | None = None, skip_errors: bool = False):
+        """
+        Reads every *.osu file in every *.osz archive found in a directory. Beatmaps
+        of all the archives are parsed together, so workers stay busy across archive
+        boundaries.
+
+        Args:
+            dirpath: (string) directory containing *.osz files
+            num_workers: (int) number of processes to parse the beatmaps with. ``None`` parses serially
+            skip_errors: (bool) warn and continue instead of raising if an archive or beatmap fails to load
+
+        Yields:
+            (osz filepath, archive member name, beatmap) in directory and archive order
+        """
+        def __members():
+            for filename in sorted(os.listdir(dirpath)):
+                if not filename.lower().endswith('.osz'):
+                    continue
+
+                filepath = os.path.join(dirpath, filename)
+
+                try:
+                    with zipfile.ZipFile(filepath, 'r') as osz_file:
+                        members = BeatmapIO.__read_osz_members(osz_file)
+                except (OSError, zipfile.BadZipFile) as e:
+                    if not skip_errors:
+                        raise BeatmapIO.BeatmapIOException(f'Failed to read "{filepath}": {e}') from e
+
+                    print(f'WARN[beatmap_reader]: failed to read "{filepath}": {e}')
+                    continue
+
+                for name, beatmap_data in members:
+                    yield filepath, name, beatmap_data
+
+        for (filepath, name, _), beatmap, error in imap_ordered([ operator.itemgetter(-1), BeatmapIO.load_beatmap ], __members(), num_workers):
+            if error is not None:
+                if not skip_errors:
+                    raise BeatmapIO.BeatmapIOException(f'Failed to load "{name}" from "{filepath}": {error}') from error
+
+                print(f'WARN[beatmap_reader]: failed to load "{name}" from "{filepath}": {error}')
+                continue
+
+            yield filepath, name, beatmap
 
 
     @staticmethod
-    def load_beatmap(beatmap_data: str | bytes | io.TextIOWrapper):
+    def load_beatmap(beatmap_data: str | bytes | io.TextIOWrapper, tick_workers: int | None = None, tick_threads: bool = False, fidelity: str = Hitobject.FIDELITY_FULL, time_range: tuple[float, float] | None = None):
         """
         Loads beatmap data
 
         Args:
             beatmap_file: (string) contents of the beatmap file
+            tick_workers: (int) number of workers to generate slider curves and ticks with. Only
+                used for maps with at least ``PARALLEL_TICK_THRESHOLD`` sliders. ``None`` is serial
+            tick_threads: (bool) use threads instead of processes for ``tick_workers``
+            fidelity: (str) how much of the slider curves and ticks to generate; one of
+                ``Hitobject.FIDELITY_*``. Hitobject start and end times are always exact.
+                A slider generates the rest on first access of its ticks, e.g. ``tick_array()``, unless
+                a lower minimum is passed, e.g. ``tick_array(Hitobject.FIDELITY_ENDPOINTS)``
+            time_range: (tuple) (start, end) ms; only load hitobjects overlapping this window.
+                Timing points are always loaded in full. Hitobjects are kept whole, ticks and all,
+                and stacking only sees the hitobjects loaded. ``None`` loads everything
+
+        Delegates to ``BeatmapIO.default_loader`` with these options, so ``str`` and
+        ``bytes`` data goes through its cache when one is enabled, see ``enable_cache``
         """
-        def __load(osu_file_data):
-            beatmap = BeatmapBase()
+        loader = BeatmapIO.default_loader.with_options(tick_workers=tick_workers, tick_threads=tick_threads, fidelity=fidelity, time_range=time_range)
+        return loader.load_beatmap(beatmap_data)
 
-            # Load all the data
-            BeatmapIO.__parse_beatmap_file_format(osu_file_data, beatmap)
-            BeatmapIO.__parse_beatmap_content(osu_file_data, beatmap)
 
-            # Process all the data
-            BeatmapIO.__process_timing_points(beatmap)
-            BeatmapIO.__postprocess_hitobjects(beatmap)
+    @staticmethod
+    def parse_beatmap(beatmap_data: io.TextIOBase, tick_workers: int | None = None, tick_threads: bool = False, fidelity: str = Hitobject.FIDELITY_FULL, time_range: tuple[float, float] | None = None) -> BeatmapBase:
+        """
+        Parses a beatmap from a text stream, bypassing any cache. Keeps no state
+        outside of the beatmap being built, so any number of threads can parse at once.
 
-            # Fill in extra data if it's missing
-            BeatmapIO.__postprocess_map(beatmap)
+        Args:
+            beatmap_data: (text stream) *.osu file contents positioned at the start
+            tick_workers: (int) see ``load_beatmap``
+            tick_threads: (bool) see ``load_beatmap``
+            fidelity: (str) see ``load_beatmap``
+            time_range: (tuple) see ``load_beatmap``
+        """
+        beatmap = BeatmapBase()
 
-            return beatmap
+        # Load all the data
+        BeatmapIO.__parse_beatmap_file_format(beatmap_data, beatmap)
+        BeatmapIO.__parse_beatmap_content(beatmap_data, beatmap, time_range)
 
-        # Ensure a stringio object is passed to parsing
-        if isinstance(beatmap_data, str):
-            with io.StringIO() as f:
-                f.write(beatmap_data)
-                f.seek(0)
-                return __load(f)
+        # Process all the data
+        BeatmapIO.__process_timing_points(beatmap)
+        BeatmapIO.__postprocess_hitobjects(beatmap, tick_workers, tick_threads, fidelity, time_range)
 
-        if isinstance(beatmap_data, bytes):
-            with io.StringIO() as f:
-                f.write(beatmap_data.decode('utf-8'))
-                f.seek(0)
-                return __load(f)
+        # Fill in extra data if it's missing
+        BeatmapIO.__postprocess_map(beatmap, fidelity)
+
+        return beatmap
+
+
+    @staticmethod
+    def replace_hitobjects(beatmap: BeatmapBase, start: int, stop: int, lines: list[str], fidelity: str = Hitobject.FIDELITY_FULL):
+        """
+        Replaces ``beatmap.hitobjects[start:stop]`` with hitobjects parsed from *.osu [HitObjects]
+        lines. Only the new hitobjects get curves and ticks generated; the beatmap level data
+        (derived difficulty, stacking, mania columns) is then recomputed. Metadata, difficulty and
+        timing points must be the same as when the beatmap was loaded.
+
+        The beatmap gets a new hitobject list, so copies sharing the old one are unaffected.
+
+        Args:
+            beatmap: (BeatmapBase) loaded beatmap to update
+            start: (int) index of the first hitobject replaced
+            stop: (int) index after the last hitobject replaced
+            lines: (list) [HitObjects] lines of the new hitobjects, in order
+            fidelity: (str) see ``load_beatmap``
+        """
+        # Parsed on a copy so the beatmap is untouched if a line fails to parse
+        scratch = beatmap.copy()
+        scratch.hitobjects = []
+
+        for line in lines:
+            BeatmapIO.__parse_hitobjects_section(line, scratch)
+
+        BeatmapIO.__postprocess_hitobjects(scratch, fidelity=fidelity)
 
-        return __load(beatmap_data)
+        beatmap.hitobjects = [ *beatmap.hitobjects[:start], *scratch.hitobjects, *beatmap.hitobjects[stop:] ]
+        beatmap.clear_cached()
+        BeatmapIO.__postprocess_map(beatmap, fidelity)
+
+
+    @staticmethod
+    def __read_osz_members(osz_file: zipfile.ZipFile) -> list[tuple[str, bytes]]:
+        # Only *.osu members are decompressed; everything else is skipped via the central directory
+        return [
+            (info.filename, osz_file.read(info)) for info in osz_file.infolist()
+                if not info.is_dir() and info.filename.lower().endswith('.osu')
+        ]
 
 
     """
@@ -146,7 +367,129 @@ class BeatmapIO():
 
 
     @staticmethod
-    def __postprocess_map(beatmap: BeatmapBase):
+    def write_beatmap(beatmap: BeatmapBase, target: str | io.TextIOBase):
+        """
+        Serializes a beatmap into *.osu format
+
+        Everything the reader understands is written, so loading the output
+        gives back the same metadata, difficulty, timing points and hitobjects.
+        Hitsounds, events, colours and other ignored data are not preserved.
+
+        Beatmaps with mods applied can't be written. *.osu files have whole ms
+        hitobject times, so rate changed times would be rounded, and slider end
+        times then depend on which timing point the rounded start lands on.
+
+        Args:
+            beatmap: (BeatmapBase) beatmap to write
+            target: (string | text stream) filepath to save the beatmap as, or a stream to write to
+
+        Raises:
+            ValueError: the beatmap has mods applied
+        """
+        if beatmap.mods != 0:
+            raise ValueError(f'Beatmaps with mods applied can\'t be written; write the beatmap they were applied to   mods = {beatmap.mods}')
+
+        if not isinstance(target, str):
+            target.writelines(BeatmapIO.__beatmap_lines(beatmap))
+            return
+
+        with open(target, 'wt', encoding='utf-8', newline='\r\n', buffering=BeatmapIO.WRITE_BUFFER_SIZE) as f:
+            f.writelines(BeatmapIO.__beatmap_lines(beatmap))
+
+
+    @staticmethod
+    def write_beatmaps(beatmaps, num_workers: int | None = None):
+        """
+        Writes many beatmaps, optionally on a process pool
+
+        Args:
+            beatmaps: (iterable) (beatmap, filepath) pairs
+            num_workers: (int) number of processes to write with. ``None`` writes serially
+        """
+        for (_, filepath), _, error in imap_ordered([ starred(BeatmapIO.write_beatmap) ], beatmaps, num_workers):
+            if error is not None:
+                raise BeatmapIO.BeatmapIOException(f'Failed to write "{filepath}": {error}') from error
+
+
+    @staticmethod
+    def __beatmap_lines(beatmap: BeatmapBase):
+        fmt = BeatmapIO.__format_number
+
+        beatmap_format = beatmap.metadata.beatmap_format if beatmap.metadata.beatmap_format != -1 else BeatmapIO.WRITE_FORMAT_VERSION
+        yield f'osu file format v{beatmap_format}\n'
+
+        yield '\n[General]\n'
+        yield f'StackLeniency: {fmt(beatmap.stack_leniency)}\n'
+        yield f'Mode: {beatmap.gamemode.value}\n'
+
+        yield '\n[Metadata]\n'
+        yield f'Title:{beatmap.metadata.title}\n'
+        yield f'Artist:{beatmap.metadata.artist}\n'
+        yield f'Creator:{beatmap.metadata.creator}\n'
+        yield f'Version:{beatmap.metadata.version}\n'
+        if beatmap.metadata.beatmap_id    != '': yield f'BeatmapID:{beatmap.metadata.beatmap_id}\n'
+        if beatmap.metadata.beatmapset_id != '': yield f'BeatmapSetID:{beatmap.metadata.beatmapset_id}\n'
+
+        yield '\n[Difficulty]\n'
+        if beatmap.difficulty.hp is not None: yield f'HPDrainRate:{fmt(beatmap.difficulty.hp)}\n'
+        if beatmap.difficulty.cs is not None: yield f'CircleSize:{fmt(beatmap.difficulty.cs)}\n'
+        if beatmap.difficulty.od is not None: yield f'OverallDifficulty:{fmt(beatmap.difficulty.od)}\n'
+        if beatmap.difficulty.ar is not None: yield f'ApproachRate:{fmt(beatmap.difficulty.ar)}\n'
+        if beatmap.difficulty.sm is not None: yield f'SliderMultiplier:{fmt(beatmap.difficulty.sm)}\n'
+        if beatmap.difficulty.st is not None: yield f'SliderTickRate:{fmt(beatmap.difficulty.st)}\n'
+
+        yield '\n[TimingPoints]\n'
+        for timing_point in beatmap.timing_points:
+            uninherited = 0 if timing_point.inherited else 1
+            yield f'{fmt(timing_point.offset)},{fmt(timing_point.beat_interval)},{timing_point.meter},0,0,100,{uninherited},0\n'
+
+        yield '\n[HitObjects]\n'
+        for hitobject in beatmap.hitobjects:
+            yield BeatmapIO.__hitobject_line(beatmap, hitobject)
+
+
+    @staticmethod
+    def __hitobject_line(beatmap: BeatmapBase, hitobject: Hitobject) -> str:
+        fmt = BeatmapIO.__format_number
+
+        pos_x  = int(round(hitobject.pos_x()))
+        pos_y  = int(round(hitobject.pos_y()))
+        tstart = int(round(hitobject.start_time()))
+        htype  = int(hitobject.hdata[Hitobject.HDATA_TYPE])
+        hsound = getattr(hitobject, 'hitsound', 0)
+
+        if beatmap.gamemode == Gamemode.MANIA:
+            # Column back to the center of its x range; floors back to the same column when read
+            keys  = beatmap.difficulty.cs
+            pos_x = int((pos_x + 0.5) * BeatmapBase.PLAYFIELD_WIDTH / keys)
+
+            if hitobject.is_htype(Hitobject.MANIALONG):
+                return f'{pos_x},{pos_y},{tstart},{htype},0,{int(round(hitobject.end_time()))}:0:0:0:0:\n'
+
+            return f'{pos_x},{pos_y},{tstart},{htype},0,0:0:0:0:\n'
+
+        if hitobject.is_htype(Hitobject.SLIDER):
+            curve_points = '|'.join(f'{int(round(x))}:{int(round(y))}' for x, y in hitobject.curve_points[1:])
+            return f'{pos_x},{pos_y},{tstart},{htype},{hsound},{hitobject.curve_type}|{curve_points},{hitobject.repeats},{fmt(hitobject.px_len)}\n'
+
+        if hitobject.is_htype(Hitobject.SPINNER):
+            return f'{pos_x},{pos_y},{tstart},{htype},{hsound},{int(round(hitobject.end_time()))},0:0:0:0:\n'
+
+        return f'{pos_x},{pos_y},{tstart},{htype},{hsound},0:0:0:0:\n'
+
+
+    @staticmethod
+    def __format_number(value: float) -> str:
+        # Whole numbers are written without a trailing ".0"; everything else keeps full precision
+        value = float(value)
+        if value.is_integer():
+            return str(int(value))
+
+        return repr(value)
+
+
+    @staticmethod
+    def __postprocess_map(beatmap: BeatmapBase, fidelity: str = Hitobject.FIDELITY_FULL):
         # Old maps dont have explicit ar and hp - they take on od value
         if beatmap.difficulty.ar is None:
             if beatmap.difficulty.od is None:
@@ -160,6 +503,13 @@ class BeatmapIO():
 
         beatmap.metadata.name = beatmap.metadata.artist + ' - ' + beatmap.metadata.title + ' (' + beatmap.metadata.creator + ') ' + '[' + beatmap.metadata.version + ']'
 
+        beatmap.update_derived()
+
+        # Stacking needs slider end positions; at lower fidelity it is left to be computed on first access
+        if fidelity == Hitobject.FIDELITY_FULL:
+            beatmap.update_stacking()
+        beatmap.update_mania_columns()
+
 
     @staticmethod
     def __parse_beatmap_file_format(beatmap_data: io.StringIO, beatmap: BeatmapBase):
@@ -171,7 +521,7 @@ class BeatmapIO():
 
 
     @staticmethod
-    def __parse_beatmap_content(beatmap_data: io.StringIO, beatmap: BeatmapBase):
+    def __parse_beatmap_content(beatmap_data: io.StringIO, beatmap: BeatmapBase, time_range: tuple[float, float] | None = None):
         if beatmap.metadata.beatmap_format == -1: return
 
         section = BeatmapIO.__Section.SECTION_NONE
@@ -191,9 +541,50 @@ class BeatmapIO():
             elif line == '':
                 return
             else:
+                if time_range is not None and section == BeatmapIO.__Section.SECTION_HITOBJECTS:
+                    window = BeatmapIO.__hitobject_window(line, time_range)
+
+                    # Hitobjects are sorted by start time and are the last section, so nothing after this is needed
+                    if window > 0: return
+                    if window < 0: continue
+
                 BeatmapIO.__parse_section(section, line, beatmap)
 
 
+    @staticmethod
+    def __hitobject_window(line: str, time_range: tuple[float, float]) -> int:
+        """
+        Where a hitobject line is relative to the time window, without constructing the hitobject
+
+        Returns:
+            -1 if it ends before the window, 1 if it starts after it, 0 if it may overlap. Sliders
+            starting before the window are 0; their end time is only known after the timing pass
+        """
+        data = line.split(',', 6)
+        if len(data) < 4:
+            return 0
+
+        start_time = int(data[2])
+        if start_time > time_range[1]:
+            return 1
+
+        if start_time >= time_range[0]:
+            return 0
+
+        hitobject_type = int(data[3])
+        end_time = start_time
+
+        if hitobject_type & Hitobject.SLIDER > 0:
+            return 0
+
+        if hitobject_type & Hitobject.SPINNER > 0 and len(data) > 5:
+            end_time = int(data[5])
+        elif hitobject_type & Hitobject.MANIALONG > 0 and len(data) > 5:
+            end_time = int(data[5].split(':')[0])
+
+        return -1 if end_time < time_range[0] else 0
+
+
     @staticmethod
     def __parse_section(section, line: str, beatmap: BeatmapBase):
         if section != BeatmapIO.__Section.SECTION_NONE:
@@ -220,7 +611,7 @@ class BeatmapIO():
             return
 
         if data[0] == 'StackLeniency':
-            # ignore
+            beatmap.stack_leniency = float(data[1])
             return
 
         if data[0] == 'Mode':
@@ -416,35 +807,75 @@ class BeatmapIO():
             raise BeatmapIO.BeatmapIOException(f'Unexpected osu!std hitobject encountered: {hitobject_type}')
 
         if beatmap.gamemode == Gamemode(Gamemode.TAIKO):
-            raise BeatmapIO.BeatmapIOException('No support osu!taiko gamemode yet!')
-
             if hitobject_type & Hitobject.CIRCLE > 0:
-                #beatmap.hitobjects.append(TaikoSingleNoteHitobject(data))
+                beatmap.hitobjects.append(TaikoSingleNoteHitobject(
+                    posx     = int(data[0]),
+                    posy     = int(data[1]),
+                    tstart   = int(data[2]),
+                    htype    = int(data[3]),
+                    hitsound = int(data[4]),
+                ))
                 return
 
             if hitobject_type & Hitobject.SLIDER > 0:
-                #beatmap.hitobjects.append(TaikoHoldNoteHitobject(data))
+                beatmap.hitobjects.append(TaikoHoldNoteHitobject(
+                    posx     = int(data[0]),
+                    posy     = int(data[1]),
+                    tstart   = int(data[2]),
+                    htype    = int(data[3]),
+                    hitsound = int(data[4]),
+                    sdata    = data[5],
+                    repeats  = int(data[6]),
+                    px_len   = float(data[7]),
+                ))
                 return
 
             if hitobject_type & Hitobject.SPINNER > 0:
-                #beatmap.hitobjects.append(TaikoSpinnerHitobject(data))
+                beatmap.hitobjects.append(TaikoSpinnerHitobject(
+                    posx     = int(data[0]),
+                    posy     = int(data[1]),
+                    tstart   = int(data[2]),
+                    htype    = int(data[3]),
+                    hitsound = int(data[4]),
+                    tend     = int(data[5]),
+                ))
                 return
 
             raise BeatmapIO.BeatmapIOException(f'Unexpected osu!taiko hitobject encountered: {hitobject_type}')
 
         if beatmap.gamemode == Gamemode(Gamemode.CATCH):
-            raise BeatmapIO.BeatmapIOException('No support osu!catch gamemode yet!')
-
             if hitobject_type & Hitobject.CIRCLE > 0:
-                #beatmap.hitobjects.append(CatchSingleNoteHitobject(data))
+                beatmap.hitobjects.append(CatchSingleNoteHitobject(
+                    posx     = int(data[0]),
+                    posy     = int(data[1]),
+                    tstart   = int(data[2]),
+                    htype    = int(data[3]),
+                    hitsound = int(data[4]),
+                ))
                 return
 
             if hitobject_type & Hitobject.SLIDER > 0:
-                #beatmap.hitobjects.append(CatchHoldNoteHitobject(data))
+                beatmap.hitobjects.append(CatchHoldNoteHitobject(
+                    posx     = int(data[0]),
+                    posy     = int(data[1]),
+                    tstart   = int(data[2]),
+                    htype    = int(data[3]),
+                    hitsound = int(data[4]),
+                    sdata    = data[5],
+                    repeats  = int(data[6]),
+                    px_len   = float(data[7]),
+                ))
                 return
 
             if hitobject_type & Hitobject.SPINNER > 0:
-                #beatmap.hitobjects.append(CatchSpinnerHitobject(data))
+                beatmap.hitobjects.append(CatchSpinnerHitobject(
+                    posx     = int(data[0]),
+                    posy     = int(data[1]),
+                    tstart   = int(data[2]),
+                    htype    = int(data[3]),
+                    hitsound = int(data[4]),
+                    tend     = int(data[5]),
+                ))
                 return
 
             raise BeatmapIO.BeatmapIOException(f'Unexpected osu!catch hitobject encountered: {hitobject_type}')
@@ -456,7 +887,6 @@ class BeatmapIO():
                     posy   = int(data[1]),
                     tstart = int(data[2]),
                     htype  = int(data[3]),
-                    keys   = beatmap.difficulty.cs
                 ))
                 return
 
@@ -467,7 +897,6 @@ class BeatmapIO():
                     tstart = int(data[2]),
                     htype  = int(data[3]),
                     sdata  = data[5],
-                    keys   = beatmap.difficulty.cs
                 ))
                 return
 
@@ -507,19 +936,72 @@ class BeatmapIO():
 
 
     @staticmethod
-    def __postprocess_hitobjects(beatmap: BeatmapBase):
+    def generate_slider_ticks(sliders: list[tuple[Hitobject, dict]]) -> dict[str, np.ndarray]:
+        """
+        Generates the curves and ticks of a chunk of sliders. Runs in the
+        workers when ``load_beatmap`` is given ``tick_workers``.
+
+        Args:
+            sliders: (list) (slider, ``generate_tick_data`` arguments) pairs
+
+        Returns:
+            end times and fidelities, plus every attribute in ``SLIDER_TICK_ATTRS`` of all the sliders concatenated,
+            along with offsets (``<attr>_offsets``) to split them back up
+        """
+        for slider, kargs in sliders:
+            slider.generate_tick_data(**kargs)
+
+        # Packed into a few flat arrays; far cheaper to send back than the slider objects
+        packed = {
+            'end_times' : np.asarray([ slider.end_time() for slider, _ in sliders ], dtype=np.float64),
+            'fidelity'  : [ slider.fidelity for slider, _ in sliders ],
+        }
+
+        for attr in BeatmapIO.SLIDER_TICK_ATTRS:
+            if not hasattr(sliders[0][0], attr):
+                continue
+
+            # Empty values (e.g. the path of a zero length slider) take on the shape of the others
+            values = [ np.asarray(getattr(slider, attr)) for slider, _ in sliders ]
+            shape  = next((value.shape[1:] for value in values if len(value) > 0), ())
+            values = [ value.reshape(len(value), *shape) for value in values ]
+
+            packed[f'{attr}_offsets'] = np.cumsum([ len(value) for value in values ])[:-1]
+            packed[attr] = np.concatenate(values)
+
+        return packed
+
+
+    @staticmethod
+    def __postprocess_hitobjects(beatmap: BeatmapBase, tick_workers: int | None = None, tick_threads: bool = False, fidelity: str = Hitobject.FIDELITY_FULL, time_range: tuple[float, float] | None = None):
         t_idx = 0
 
+        # Sliders only depend on their own data and timing point, so their ticks are generated after the timing pass
+        sliders: list[tuple[int, dict]] = []
+
+        # Sliders ending before ``time_range`` are dropped here, before anything is generated for them
+        hitobjects = []
+
+        # osu!mania notes are read with their x; their columns are computed for all of them at once
+        if beatmap.gamemode == Gamemode.MANIA and len(beatmap.hitobjects) > 0:
+            pos_x   = np.fromiter(( hitobject.hdata[Hitobject.HDATA_POSX] for hitobject in beatmap.hitobjects ), dtype=np.float64, count=len(beatmap.hitobjects))
+            columns = ManiaColumns.columns_from_x(pos_x, beatmap.difficulty.cs).tolist()
+
+            for hitobject, column in zip(beatmap.hitobjects, columns):
+                hitobject.hdata[Hitobject.HDATA_POSX] = column
+
         for hitobject in beatmap.hitobjects:
-            if beatmap.gamemode == Gamemode.OSU or beatmap.gamemode == None:
+            # osu!taiko and osu!catch sliders are timed the same way as osu!std ones
+            if beatmap.gamemode != Gamemode.MANIA:
                 if not hitobject.is_htype(Hitobject.SLIDER):
                     hitobject.generate_tick_data()
+                    hitobjects.append(hitobject)
                     continue
 
                 # Find the last timing that occurs before (or when) the hitobject starts
-                for i in range(t_idx + 1, len(beatmap.timing_points)):
-                    if beatmap.timing_points[i].offset <= hitobject.start_time():
-                        t_idx = i
+                for j in range(t_idx + 1, len(beatmap.timing_points)):
+                    if beatmap.timing_points[j].offset <= hitobject.start_time():
+                        t_idx = j
                     else:
                         break
 
@@ -528,8 +1010,185 @@ class BeatmapIO():
                 velocity = (100/beat_length) * (-100/timing_point.slider_multiplier) * beatmap.difficulty.sm
                 end_time = hitobject.start_time() + hitobject.repeats * hitobject.px_len / velocity
 
-                hitobject.generate_tick_data(end_time=end_time, velocity=velocity, beat_length=timing_point.beat_length, tick_rate=beatmap.difficulty.st)
+                if time_range is not None and end_time < time_range[0]:
+                    continue
+
+                sliders.append((len(hitobjects), dict(end_time=end_time, velocity=velocity, beat_length=timing_point.beat_length, tick_rate=beatmap.difficulty.st, fidelity=fidelity)))
+                hitobjects.append(hitobject)
             else:
                 hitobject.generate_tick_data()
+                hitobjects.append(hitobject)
+
+        beatmap.hitobjects = hitobjects
+
+        if tick_workers is not None and tick_workers < 0:
+            tick_workers = os.cpu_count()
+
+        # Without curves there is nothing worth parallelizing
+        if tick_workers is None or tick_workers <= 1 or len(sliders) == 0 or len(sliders) < BeatmapIO.PARALLEL_TICK_THRESHOLD or fidelity == Hitobject.FIDELITY_NONE:
+            for i, kargs in sliders:
+                beatmap.hitobjects[i].generate_tick_data(**kargs)
+            return
+
+        # A few chunks per worker to even out sliders of different complexity
+        chunk_size = -(-len(sliders) // (4*tick_workers))
+        chunks = [ sliders[start:start + chunk_size] for start in range(0, len(sliders), chunk_size) ]
+        items  = [ [ (beatmap.hitobjects[i], kargs) for i, kargs in chunk ] for chunk in chunks ]
+
+        results = imap_ordered([ BeatmapIO.generate_slider_ticks ], items, tick_workers, threads=tick_threads)
+
+        for chunk, (_, packed, error) in zip(chunks, results):
+            if error is not None:
+                raise error
+
+            sliders = [ beatmap.hitobjects[i] for i, _ in chunk ]
+            for slider, (_, kargs), end_time, fidelity in zip(sliders, chunk, packed['end_times'].tolist(), packed['fidelity']):
+                slider.hdata[Hitobject.HDATA_TEND] = end_time
+                slider.fidelity  = fidelity
+                slider.tick_args = kargs
+
+            for attr in BeatmapIO.SLIDER_TICK_ATTRS:
+                if attr not in packed:
+                    continue
+
+                for slider, value in zip(sliders, np.split(packed[attr], packed[f'{attr}_offsets'])):
+                    setattr(slider, attr, value)
+
+
+
+
+class BeatmapLoader():
+    """
+    Loads beatmaps with its own configuration and cache
+
+    Loaders are independent of each other, so beatmaps can be loaded with
+    different options side by side. A loader is safe to share across threads:
+    its options are not changed after construction (``with_options`` returns a
+    new loader), parsing keeps all of its state in the beatmap being built, and
+    the cache locks around its own bookkeeping.
+
+    Beatmaps from the cache share fully generated hitobjects between threads;
+    treat them as read-only. Sliders loaded below full fidelity are copied for
+    each caller instead, since upgrading them changes their data, see
+    ``BeatmapCache.copy_entry``.
+
+    The static ``BeatmapIO`` loading methods delegate to ``BeatmapIO.default_loader``.
+
+    Usage:
+        loader = BeatmapLoader(fidelity=Hitobject.FIDELITY_NONE, cache=BeatmapCache(max_entries=1024))
+        with concurrent.futures.ThreadPoolExecutor() as pool:
+            beatmaps = list(pool.map(loader.open_beatmap, filepaths))
+    """
+
+    FIDELITIES = Hitobject.FIDELITIES
+
+    KEY_DIGEST_SIZE = 16   # Bytes of the hash keying ``str`` data in the cache
+
+    def __init__(self, fidelity: str = Hitobject.FIDELITY_FULL, tick_workers: int | None = None, tick_threads: bool = False, cache: BeatmapCache | None = None, time_range: tuple[float, float] | None = None):
+        """
+        Args:
+            fidelity: (str) see ``BeatmapIO.load_beatmap``
+            tick_workers: (int) see ``BeatmapIO.load_beatmap``
+            tick_threads: (bool) see ``BeatmapIO.load_beatmap``
+            cache: (BeatmapCache) cache for ``str`` and ``bytes`` data. ``None`` doesn't cache
+            time_range: (tuple) see ``BeatmapIO.load_beatmap``
+        """
+        if fidelity not in BeatmapLoader.FIDELITIES:
+            raise ValueError(f'Invalid fidelity   fidelity = {fidelity}')
+
+        if time_range is not None:
+            if len(time_range) != 2 or time_range[0] > time_range[1]:
+                raise ValueError(f'Invalid time range   time_range = {time_range}')
+
+            time_range = (time_range[0], time_range[1])
+
+        self.fidelity     = fidelity
+        self.tick_workers = tick_workers
+        self.tick_threads = tick_threads
+        self.cache        = cache
+        self.time_range   = time_range
+
+
+    def with_options(self, **options) -> "BeatmapLoader":
+        """
+        Returns a loader with some of the options replaced, sharing this loader's cache
+
+        Args:
+            options: any of the ``__init__`` arguments
+        """
+        kargs = {
+            'fidelity'     : self.fidelity,
+            'tick_workers' : self.tick_workers,
+            'tick_threads' : self.tick_threads,
+            'cache'        : self.cache,
+            'time_range'   : self.time_range,
+        }
+        kargs.update(options)
+        return BeatmapLoader(**kargs)
+
+
+    def open_beatmap(self, filepath: str) -> BeatmapBase:
+        """
+        Opens a beatmap file and reads it
+
+        Args:
+            filepath: (string) filepath to the beatmap file to load
+        """
+        with open(filepath, 'rb') as beatmap_file:
+            beatmap_data = beatmap_file.read()
+
+        return self.load_beatmap(beatmap_data)
+
+
+    def load_beatmap(self, beatmap_data: str | bytes | io.TextIOWrapper) -> BeatmapBase:
+        """
+        Loads beatmap data
+
+        Args:
+            beatmap_data: (string | bytes | text stream) contents of the beatmap file. Streams are never cached
+        """
+        cache = self.cache
+
+        if not isinstance(beatmap_data, (str, bytes)):
+            return self.__parse(beatmap_data)
+
+        # Raw file contents are hashed from the same buffer that is parsed. The md5 is needed for the
+        # metadata anyway, so it doubles as the cache key instead of hashing the contents twice
+        md5 = None
+        if isinstance(beatmap_data, bytes):
+            md5 = hashlib.md5(beatmap_data).hexdigest()
+
+        if cache is not None:
+            # Type is part of the key; str and bytes with the same contents differ in newline handling and md5 metadata
+            if md5 is not None:
+                key = (md5, bytes, self.fidelity, self.time_range)
+            else:
+                key = (hashlib.blake2b(beatmap_data.encode('utf-8'), digest_size=BeatmapLoader.KEY_DIGEST_SIZE).digest(), str, self.fidelity, self.time_range)
+
+            beatmap = cache.get(key)
+            if beatmap is not None:
+                return beatmap
+
+        if isinstance(beatmap_data, bytes):
+            # BytesIO shares the buffer and the wrapper decodes it a chunk at a time as lines are read,
+            # so the contents are decoded once and never copied whole
+            beatmap = self.__parse(io.TextIOWrapper(io.BytesIO(beatmap_data), encoding='utf-8', newline=None))
+            beatmap.metadata.beatmap_md5 = md5
+        else:
+            beatmap = self.__parse(io.StringIO(beatmap_data))
+
+        if cache is None:
+            return beatmap
+
+        # The cache keeps the loaded instance, so callers get a copy of it same as on a hit
+        cache.put(key, beatmap)
+        return BeatmapCache.copy_entry(beatmap)
+
+
+    def __parse(self, beatmap_data: io.TextIOBase) -> BeatmapBase:
+        return BeatmapIO.parse_beatmap(beatmap_data, self.tick_workers, self.tick_threads, self.fidelity, self.time_range)
+
+
 
 BeatmapIO.init()
+BeatmapIO.default_loader = BeatmapLoader()
@@ -1,13 +1,29 @@
+import copy
+
 import numpy as np
 
 from osu_interfaces import IBeatmap
 
 from .gamemode import Gamemode
 from .hitobject import Hitobject
+from .hitobject.std.std_holdnote_hitobject_base import StdHoldNoteHitobjectBase
+from .mods import Mods
+from .stacking import Stacking
+from .mania_columns import ManiaColumns
 
 
 class BeatmapBase(IBeatmap):
 
+    TPDATA_OFFS = 0   # Timing point offset
+    TPDATA_BINT = 1   # Timing point beat interval as read from the file
+    TPDATA_METR = 2   # Timing point meter
+    TPDATA_INHR = 3   # Timing point inherited flag
+    TPDATA_BLEN = 4   # Timing point beat length
+    TPDATA_BPM  = 5   # Timing point bpm
+    TPDATA_SMUL = 6   # Timing point slider multiplier
+
+    TPDATA_NUM  = 7
+
     class Metadata():
 
         def __init__(self):
@@ -49,6 +65,102 @@ class BeatmapBase(IBeatmap):
             self.slider_multiplier: float
 
 
+    class DerivedDifficulty():
+        """
+        Values derived from the difficulty settings, in the beatmap's time scale
+        (i.e. already divided by the mod rate), plus per-hitobject arrays
+
+        Computed on first access of ``BeatmapBase.derived`` and recomputed after
+        any ``set_*`` setter runs. The object is picklable, so
+        ``operator.attrgetter('derived')`` can be passed as ``process`` to
+        ``BeatmapIO.open_beatmaps`` to collect these across a library.
+        """
+
+        def __init__(self, beatmap: "BeatmapBase"):
+            ar = beatmap.difficulty.ar if beatmap.difficulty.ar is not None else beatmap.difficulty.od
+            od = beatmap.difficulty.od
+            cs = beatmap.difficulty.cs
+            rate = beatmap.rate
+
+            self.rate = rate
+
+            # https://osu.ppy.sh/wiki/en/Beatmap/Approach_rate
+            self.preempt = None   # ms between the hitobject appearing and its start time
+            self.fade_in = None   # ms the hitobject takes to fully fade in
+            if ar is not None:
+                if ar < 5:
+                    self.preempt = (1200 + 600*(5 - ar)/5) / rate
+                    self.fade_in = (800  + 400*(5 - ar)/5) / rate
+                else:
+                    self.preempt = (1200 - 750*(ar - 5)/5) / rate
+                    self.fade_in = (800  - 500*(ar - 5)/5) / rate
+
+            # https://osu.ppy.sh/wiki/en/Beatmap/Overall_difficulty
+            self.hit_windows: dict[int, float] = {}   # judgement -> +/- ms
+            if od is not None:
+                if beatmap.gamemode == Gamemode.MANIA:
+                    self.hit_windows = {
+                        320 : 16 / rate,
+                        300 : (64  - 3*od) / rate,
+                        200 : (97  - 3*od) / rate,
+                        100 : (127 - 3*od) / rate,
+                        50  : (151 - 3*od) / rate,
+                    }
+                elif beatmap.gamemode == Gamemode.TAIKO:
+                    # There is no 50 in osu!taiko
+                    self.hit_windows = {
+                        300 : (50 - 3*od) / rate,
+                        100 : ( (120 - 8*od) if od <= 5 else (110 - 6*od) ) / rate,
+                    }
+                elif beatmap.gamemode == Gamemode.CATCH:
+                    # osu!catch has no hit windows; fruits are caught or missed
+                    pass
+                else:
+                    self.hit_windows = {
+                        300 : (80  - 6*od) / rate,
+                        100 : (140 - 8*od) / rate,
+                        50  : (200 - 10*od) / rate,
+                    }
+
+            # https://osu.ppy.sh/wiki/en/Beatmap/Circle_size
+            self.circle_radius = None   # osu!px
+            if cs is not None and beatmap.gamemode != Gamemode.MANIA:
+                self.circle_radius = 54.4 - 4.48*cs
+
+            # Per hitobject
+            hitobject_data = beatmap.hitobject_array()
+            timing_data    = beatmap.timing_array()
+
+            self.start_times = hitobject_data[:, Hitobject.HDATA_TSRT].copy()
+            self.end_times   = hitobject_data[:, Hitobject.HDATA_TEND].copy()
+
+            # Slider velocity in osu!px/ms from the timing point in effect at each start time; NaN for non-sliders
+            self.velocities = np.full(len(hitobject_data), np.nan)
+            is_slider = ( hitobject_data[:, Hitobject.HDATA_TYPE].astype(np.int64) & Hitobject.SLIDER ) > 0
+
+            if len(timing_data) > 0 and beatmap.difficulty.sm is not None and beatmap.gamemode != Gamemode.MANIA:
+                t_idx = np.searchsorted(timing_data[:, BeatmapBase.TPDATA_OFFS], self.start_times[is_slider], side='right') - 1
+                t_idx = np.maximum(t_idx, 0)
+
+                beat_length = timing_data[t_idx, BeatmapBase.TPDATA_BLEN]
+                slider_mult = timing_data[t_idx, BeatmapBase.TPDATA_SMUL]
+                self.velocities[is_slider] = (100/beat_length) * (-100/slider_mult) * beatmap.difficulty.sm
+
+
+        def scalars(self) -> dict:
+            """
+            Returns the per-beatmap values as a flat dict, e.g. for one row of a library table
+            """
+            data = {
+                'rate'          : self.rate,
+                'preempt'       : self.preempt,
+                'fade_in'       : self.fade_in,
+                'circle_radius' : self.circle_radius,
+            }
+            data.update({ f'hit_window_{judgement}' : window for judgement, window in self.hit_windows.items() })
+            return data
+
+
     def __init__(self):
         self.metadata   = BeatmapBase.Metadata()
         self.difficulty = BeatmapBase.Difficulty()
@@ -62,6 +174,18 @@ class BeatmapBase(IBeatmap):
         self.bpm_min = float('inf')
         self.bpm_max = float('-inf')
 
+        self.stack_leniency = Stacking.DEFAULT_LENIENCY
+
+        # Mods applied through `apply_mods`. Times are already scaled by `rate`;
+        # difficulty values are not, the same way the game treats them
+        self.mods = Mods.NONE
+        self.rate = 1.0
+
+        self.__mod_cache: dict[int, BeatmapBase] = {}
+        self.__derived: BeatmapBase.DerivedDifficulty | None = None
+        self.__stack_heights: np.ndarray | None = None
+        self.__mania_columns: ManiaColumns | None = None
+
 
     def data(self) -> np.ndarray:
         data = []
@@ -77,6 +201,313 @@ class BeatmapBase(IBeatmap):
         return np.asarray(data)
 
 
+    def hitobject_array(self) -> np.ndarray:
+        """
+        Returns hitobject data as an (N, 5) float array indexed by ``Hitobject.HDATA_*``
+        """
+        return np.asarray([ hitobject.hdata for hitobject in self.hitobjects ], dtype=np.float64).reshape(-1, 5)
+
+
+    def tick_array(self, fidelity: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the tick data of all hitobjects concatenated, along with offsets
+        such that ``ticks[offsets[i]:offsets[i + 1]]`` are the ticks of hitobject i
+
+        Ticks are indexed by ``Hitobject.TDATA_*`` for osu!std. osu!mania ticks
+        are (column, time) pairs.
+
+        Args:
+            fidelity: (str) lowest ``Hitobject.FIDELITY_*`` needed; sliders loaded at a lower one
+                are upgraded first. Defaults to full. ``FIDELITY_NONE`` returns the ticks as they were loaded.
+        """
+        tick_data = [ hitobject.tick_data(fidelity) for hitobject in self.hitobjects ]
+
+        offsets = np.zeros(len(tick_data) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([ len(ticks) for ticks in tick_data ])
+
+        if offsets[-1] == 0:
+            return np.zeros((0, 2 if self.gamemode == Gamemode.MANIA else 3)), offsets
+
+        return np.concatenate([ ticks for ticks in tick_data if len(ticks) > 0 ]).astype(np.float64), offsets
+
+
+    def resample_paths(self, spacing_px: float | None = None, num_points: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the slider paths resampled to evenly spaced points, see ``StdHoldNoteHitobjectBase.resample_path``,
+        along with offsets such that ``points[offsets[i]:offsets[i + 1]]`` are the points of hitobject i.
+        Only osu!std sliders and osu!catch juice streams have points; osu!taiko drumrolls have no path.
+
+        Args:
+            spacing_px: (float) distance along the path between consecutive points
+            num_points: (int) number of points per slider. Give this or ``spacing_px``
+        """
+        is_slider = np.asarray([ isinstance(hitobject, StdHoldNoteHitobjectBase) for hitobject in self.hitobjects ], dtype=bool)
+        if self.gamemode == Gamemode.TAIKO:
+            is_slider[:] = False
+
+        sliders = [ hitobject for hitobject, slider in zip(self.hitobjects, is_slider) if slider ]
+
+        points, slider_offsets = StdHoldNoteHitobjectBase.resample_paths(sliders, spacing_px, num_points)
+
+        counts = np.zeros(len(self.hitobjects), dtype=np.int64)
+        counts[is_slider] = np.diff(slider_offsets)
+
+        offsets = np.zeros(len(self.hitobjects) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+        return points, offsets
+
+
+    def timing_array(self) -> np.ndarray:
+        """
+        Returns timing point data as an (N, 7) float array indexed by ``BeatmapBase.TPDATA_*``
+        """
+        return np.asarray([
+            [
+                timing_point.offset,
+                timing_point.beat_interval,
+                timing_point.meter,
+                timing_point.inherited,
+                timing_point.beat_length,
+                timing_point.bpm,
+                timing_point.slider_multiplier
+            ]
+            for timing_point in self.timing_points
+        ], dtype=np.float64).reshape(-1, BeatmapBase.TPDATA_NUM)
+
+
+    @property
+    def derived(self) -> "BeatmapBase.DerivedDifficulty":
+        if self.__derived is None:
+            self.__derived = BeatmapBase.DerivedDifficulty(self)
+
+        return self.__derived
+
+
+    def update_derived(self):
+        """
+        Recomputes the derived difficulty attributes. Needed only if hitobjects
+        or timing points were modified directly.
+        """
+        self.__derived = BeatmapBase.DerivedDifficulty(self)
+
+
+    @property
+    def stack_heights(self) -> np.ndarray:
+        """
+        Stack height of every hitobject, see ``Stacking``. Computed on first
+        access and recomputed after any ``set_*`` setter runs.
+        """
+        if self.__stack_heights is None:
+            self.__stack_heights = Stacking.stack_heights(self)
+
+        return self.__stack_heights
+
+
+    def update_stacking(self):
+        """
+        Recomputes the stack heights. Needed only if hitobjects or the stack
+        leniency were modified directly.
+        """
+        self.__stack_heights = Stacking.stack_heights(self)
+
+
+    @property
+    def mania_columns(self) -> ManiaColumns | None:
+        """
+        Column-partitioned note arrays, see ``ManiaColumns``. None for gamemodes other than osu!mania.
+        """
+        if self.__mania_columns is None and self.gamemode == Gamemode.MANIA:
+            self.__mania_columns = ManiaColumns(self)
+
+        return self.__mania_columns
+
+
+    def update_mania_columns(self):
+        """
+        Rebuilds the column arrays. Needed only if hitobjects were modified directly.
+        """
+        self.__mania_columns = ManiaColumns(self) if self.gamemode == Gamemode.MANIA else None
+
+
+    def clear_cached(self):
+        """
+        Drops the derived difficulty, stack heights, mania columns and modded copies computed
+        so far; each is recomputed on next access. Needed only if hitobjects were replaced directly.
+        """
+        self.__invalidate()
+        self.__mania_columns = None
+
+
+    def stacked_hitobject_array(self) -> np.ndarray:
+        """
+        Same as ``hitobject_array``, with positions moved to where the game displays stacked hitobjects
+        """
+        hitobject_data = np.array(self.hitobject_array(), dtype=np.float64)
+        offsets = Stacking.stack_offsets(self, self.stack_heights)
+
+        hitobject_data[:, Hitobject.HDATA_POSX] += offsets
+        hitobject_data[:, Hitobject.HDATA_POSY] += offsets
+        return hitobject_data
+
+
+    def stacked_tick_array(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Same as ``tick_array``, with tick positions moved along with their stacked hitobject
+        """
+        tick_data, tick_offsets = self.tick_array()
+        tick_data = np.array(tick_data, dtype=np.float64)
+
+        if self.gamemode != Gamemode.OSU:
+            return tick_data, tick_offsets
+
+        offsets = np.repeat(Stacking.stack_offsets(self, self.stack_heights), np.diff(tick_offsets))
+
+        tick_data[:, Hitobject.TDATA_X] += offsets
+        tick_data[:, Hitobject.TDATA_Y] += offsets
+        return tick_data, tick_offsets
+
+
+    def copy(self) -> "BeatmapBase":
+        """
+        Returns a shallow copy of the beatmap. Metadata and difficulty are copied
+        and can be changed independently; hitobjects, timing points and the
+        computed arrays are shared with the original and must not be modified
+        in place.
+        """
+        beatmap = copy.copy(self)
+        beatmap.metadata   = copy.copy(self.metadata)
+        beatmap.difficulty = copy.copy(self.difficulty)
+        beatmap.__mod_cache = {}
+        return beatmap
+
+
+    def apply_mods(self, mods: int, cache: bool = False) -> "BeatmapBase":
+        """
+        Returns a copy of the beatmap with mods applied. The original is not modified.
+
+        Rate changes scale every hitobject, tick and timing point time; HR flips
+        hitobject, tick and slider curve positions vertically (osu!std); EZ/HR
+        scale the difficulty through the setters. Everything is done as array
+        operations over the already generated data, so no curves or ticks are
+        regenerated.
+
+        Args:
+            mods: (int) ``Mods`` bit flags
+            cache: (bool) keep the result so applying the same mods again is free
+        """
+        if self.mods & mods:
+            raise ValueError(f'Mods are already applied   mods = {Mods.to_str(self.mods & mods)}')
+
+        Mods.validate(self.mods | mods)
+
+        if cache and mods in self.__mod_cache:
+            return self.__mod_cache[mods]
+
+        rate = Mods.rate(mods)
+        flip = ( mods & Mods.HARDROCK ) and self.gamemode == Gamemode.OSU
+
+        beatmap = self.copy()
+        beatmap.mods = self.mods | mods
+        beatmap.rate = self.rate * rate
+        beatmap.__derived       = None
+        beatmap.__stack_heights = None
+        beatmap.__mania_columns = None
+
+        # Timing points
+        beatmap.timing_points = []
+        for timing_point in self.timing_points:
+            timing_point = copy.copy(timing_point)
+            timing_point.offset /= rate
+
+            if not timing_point.inherited:
+                timing_point.beat_interval /= rate
+
+            timing_point.beat_length /= rate
+            timing_point.bpm *= rate
+            beatmap.timing_points.append(timing_point)
+
+        beatmap.bpm_min = self.bpm_min * rate
+        beatmap.bpm_max = self.bpm_max * rate
+
+        # Hitobjects and ticks
+        hitobject_data = np.array(self.hitobject_array(), dtype=np.float64)
+        tick_data, tick_offsets = self.tick_array(Hitobject.FIDELITY_NONE)   # Sliders not generated in full upgrade lazily, see below
+        tick_data = np.array(tick_data, dtype=np.float64)
+
+        hitobject_data[:, [ Hitobject.HDATA_TSRT, Hitobject.HDATA_TEND ]] /= rate
+        tick_data[:, -1] /= rate
+
+        if flip:
+            hitobject_data[:, Hitobject.HDATA_POSY] = BeatmapBase.PLAYFIELD_HEIGHT - hitobject_data[:, Hitobject.HDATA_POSY]
+            tick_data[:, Hitobject.TDATA_Y] = BeatmapBase.PLAYFIELD_HEIGHT - tick_data[:, Hitobject.TDATA_Y]
+
+        hitobject_rows = hitobject_data.tolist()
+        beatmap.hitobjects = []
+
+        for i, hitobject in enumerate(self.hitobjects):
+            source = hitobject
+
+            hitobject = copy.copy(hitobject)
+            hitobject.hdata = hitobject_rows[i][:Hitobject.HDATA_TYPE] + [ hitobject.hdata[Hitobject.HDATA_TYPE] ]
+            hitobject.tdata = tick_data[tick_offsets[i]:tick_offsets[i + 1]]
+
+            # Sliders not generated in full yet get the rest from their source, transformed the same way
+            if isinstance(source, StdHoldNoteHitobjectBase) and source.fidelity != Hitobject.FIDELITY_FULL:
+                hitobject.tick_source = (source, rate, BeatmapBase.PLAYFIELD_HEIGHT if flip else None)
+
+            beatmap.hitobjects.append(hitobject)
+
+        if flip:
+            BeatmapBase.__flip_slider_curves(beatmap.hitobjects)
+
+        # Difficulty
+        if mods & Mods.HARDROCK:
+            if beatmap.gamemode != Gamemode.MANIA:
+                beatmap.set_cs(min(beatmap.difficulty.cs * Mods.HR_CS_MULTIPLIER, 10))
+
+            beatmap.set_ar(min(beatmap.difficulty.ar * Mods.HR_MULTIPLIER, 10))
+            beatmap.set_od(min(beatmap.difficulty.od * Mods.HR_MULTIPLIER, 10))
+            beatmap.set_hp(min(beatmap.difficulty.hp * Mods.HR_MULTIPLIER, 10))
+
+        if mods & Mods.EASY:
+            if beatmap.gamemode != Gamemode.MANIA:
+                beatmap.set_cs(beatmap.difficulty.cs * Mods.EZ_MULTIPLIER)
+
+            beatmap.set_ar(beatmap.difficulty.ar * Mods.EZ_MULTIPLIER)
+            beatmap.set_od(beatmap.difficulty.od * Mods.EZ_MULTIPLIER)
+            beatmap.set_hp(beatmap.difficulty.hp * Mods.EZ_MULTIPLIER)
+
+        if cache:
+            self.__mod_cache[mods] = beatmap
+
+        return beatmap
+
+
+    @staticmethod
+    def __flip_slider_curves(hitobjects: list[Hitobject]):
+        # Only sliders that generated a curve have one to flip; e.g. ``SharedBeatmapView`` hitobjects just have ticks
+        sliders = [ hitobject for hitobject in hitobjects if isinstance(hitobject, StdHoldNoteHitobjectBase) ]
+        if len(sliders) == 0:
+            return
+
+        # Flip every slider's points in one pass over the concatenated points, then split them back up
+        for attr in [ 'curve_points', 'gen_points' ]:
+            points  = [ np.asarray(getattr(slider, attr), dtype=np.float64).reshape(-1, 2) for slider in sliders ]
+            offsets = np.cumsum([ len(p) for p in points ])[:-1]
+
+            flipped = np.concatenate(points)
+            flipped[:, 1] = BeatmapBase.PLAYFIELD_HEIGHT - flipped[:, 1]
+
+            for slider, slider_points in zip(sliders, np.split(flipped, offsets)):
+                setattr(slider, attr, slider_points.tolist() if attr == 'curve_points' else slider_points)
+
+
+    def __invalidate(self):
+        self.__mod_cache.clear()
+        self.__derived = None
+        self.__stack_heights = None
+
+
     def get_diff_data(self) -> Difficulty:
         return self.difficulty
 
@@ -94,29 +525,35 @@ class BeatmapBase(IBeatmap):
                 raise ValueError(f'CS must be between 0 and 10, inclusive! CS = {cs}')
 
         self.difficulty.cs = float(cs)
+        self.__invalidate()
 
 
     def set_ar(self, ar: float):
         if not 0 <= ar <= 10:
             raise ValueError(f'AR must be between 0 and 10, inclusive! AR = {ar}')
         self.difficulty.ar = float(ar)
+        self.__invalidate()
 
 
     def set_od(self, od: float):
         if not 0 <= od <= 10:
             raise ValueError(f'OD must be between 0 and 10, inclusive! OD = {od}')
         self.difficulty.od = float(od)
+        self.__invalidate()
 
 
     def set_hp(self, hp: float):
         if not 0 <= hp <= 10:
             raise ValueError(f'HP must be between 0 and 10, inclusive! HP = {hp}')
         self.difficulty.hp = float(hp)
+        self.__invalidate()
 
 
     def set_sm(self, sm: float):
         self.difficulty.sm = float(sm)
+        self.__invalidate()
 
 
     def set_st(self, st: float):
         self.difficulty.st = float(st)
+        self.__invalidate()
@@ -0,0 +1,173 @@
+import copy
+import threading
+import collections
+
+import numpy as np
+
+from .beatmap_base import BeatmapBase
+from .hitobject.hitobject import Hitobject
+from .hitobject.std.std_holdnote_hitobject_base import StdHoldNoteHitobjectBase
+
+
+
+class BeatmapCache():
+    """
+    Thread-safe LRU cache of loaded beatmaps keyed by content hash
+
+    Entries are evicted least recently used first once either the entry count
+    or the estimated total size goes over capacity. ``get`` hands out copies
+    made with ``copy_entry``; beatmap level data (metadata, difficulty, mods
+    applied later) can be changed freely, while hitobjects and timing points
+    are shared with the cached beatmap. ``put`` makes them read-only so they
+    can't be changed by mistake: ``hitobjects`` and ``timing_points`` become
+    tuples, each hitobject's ``hdata`` a tuple and its ``tdata`` and curve
+    arrays read-only. Sliders loaded below full fidelity get their own copy
+    per caller, since upgrading them replaces their curve and ticks.
+
+    Usage:
+        BeatmapIO.enable_cache(max_entries=256, max_bytes=512 << 20)
+        beatmap = BeatmapIO.load_beatmap(data)
+        BeatmapIO.default_loader.cache.stats()
+    """
+
+    HITOBJECT_BYTES = 1024   # Rough size of a hitobject's Python objects, excluding its ticks and curve
+    POINT_BYTES     = 100    # Rough size of one tick or curve point
+
+    def __init__(self, max_entries: int = 128, max_bytes: int | None = None):
+        """
+        Args:
+            max_entries: (int) max number of beatmaps kept
+            max_bytes: (int) max estimated total size of the beatmaps kept. ``None`` is unbounded
+        """
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+
+        self.__lock    = threading.Lock()
+        self.__entries: collections.OrderedDict[object, tuple[BeatmapBase, int]] = collections.OrderedDict()
+        self.__nbytes  = 0
+
+        self.__hits      = 0
+        self.__misses    = 0
+        self.__evictions = 0
+
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+
+    def __contains__(self, key) -> bool:
+        with self.__lock:
+            return key in self.__entries
+
+
+    def get(self, key) -> BeatmapBase | None:
+        """
+        Returns a copy of the cached beatmap, or None on a miss
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+
+        return BeatmapCache.copy_entry(entry[0])
+
+
+    def put(self, key, beatmap: BeatmapBase):
+        """
+        Adds a beatmap. The cache keeps the given instance and makes its hitobjects read-only.
+        """
+        BeatmapCache.__freeze(beatmap)
+        size = BeatmapCache.estimate_size(beatmap)
+
+        with self.__lock:
+            if key in self.__entries:
+                self.__nbytes -= self.__entries.pop(key)[1]
+
+            self.__entries[key] = (beatmap, size)
+            self.__nbytes += size
+
+            while len(self.__entries) > 0 and self.__over_capacity():
+                _, (_, evicted_size) = self.__entries.popitem(last=False)
+                self.__nbytes -= evicted_size
+                self.__evictions += 1
+
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__nbytes = 0
+
+
+    def stats(self) -> dict:
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return {
+                'entries'   : len(self.__entries),
+                'bytes'     : self.__nbytes,
+                'hits'      : self.__hits,
+                'misses'    : self.__misses,
+                'evictions' : self.__evictions,
+                'hit_rate'  : self.__hits / lookups if lookups > 0 else 0.0,
+            }
+
+
+    @staticmethod
+    def copy_entry(beatmap: BeatmapBase) -> BeatmapBase:
+        """
+        Returns the copy of a cached beatmap handed out to callers, see ``BeatmapBase.copy``.
+        Sliders below full fidelity are copied as well, since ``upgrade`` replaces their curve
+        and ticks; the cached beatmap keeps them at the fidelity they were loaded at.
+        """
+        ret = beatmap.copy()
+
+        if any(BeatmapCache.__upgradable(hitobject) for hitobject in beatmap.hitobjects):
+            ret.hitobjects = tuple(copy.copy(hitobject) if BeatmapCache.__upgradable(hitobject) else hitobject for hitobject in beatmap.hitobjects)
+
+        return ret
+
+
+    @staticmethod
+    def estimate_size(beatmap: BeatmapBase) -> int:
+        """
+        Rough memory footprint of a beatmap in bytes, from its hitobject, tick and curve point counts
+        """
+        points = sum(len(hitobject.tdata) + len(getattr(hitobject, 'gen_points', [])) for hitobject in beatmap.hitobjects)
+        return len(beatmap.hitobjects)*BeatmapCache.HITOBJECT_BYTES + points*BeatmapCache.POINT_BYTES
+
+
+    @staticmethod
+    def __freeze(beatmap: BeatmapBase):
+        for hitobject in beatmap.hitobjects:
+            hitobject.hdata = tuple(hitobject.hdata)
+
+            for attr in [ 'tdata', 'gen_points', 'length_sums' ]:
+                value = getattr(hitobject, attr, None)
+                if value is None or ( attr != 'tdata' and len(value) == 0 ):
+                    continue
+
+                value = np.asarray(value)
+                value.flags.writeable = False
+                setattr(hitobject, attr, value)
+
+        beatmap.hitobjects    = tuple(beatmap.hitobjects)
+        beatmap.timing_points = tuple(beatmap.timing_points)
+
+
+    @staticmethod
+    def __upgradable(hitobject: Hitobject) -> bool:
+        return isinstance(hitobject, StdHoldNoteHitobjectBase) and hitobject.fidelity != Hitobject.FIDELITY_FULL
+
+
+    def __over_capacity(self) -> bool:
+        if self.max_entries is not None and len(self.__entries) > self.max_entries:
+            return True
+
+        if self.max_bytes is not None and self.__nbytes > self.max_bytes:
+            return True
+
+        return False
@@ -0,0 +1,319 @@
+import os
+import json
+
+import numpy as np
+
+from .beatmapIO import BeatmapIO
+from .beatmap_base import BeatmapBase
+from .beatmap_index import BeatmapIndex
+
+
+
+class BeatmapCorpus():
+    """
+    Read-only, memory-mapped store of many processed beatmaps
+
+    A corpus consists of three files:
+        <path>           - hitobject, tick, tick offset and timing arrays of every
+                           beatmap appended one after another
+        <path>.idx       - offset table; one row of ``IDX_NUM`` int64 per beatmap
+        <path>.meta.jsonl - metadata sidecar; one JSON record per beatmap
+
+    ``corpus[i]`` returns array views into the mapped file for beatmap i, so
+    nothing besides that beatmap's pages is read. Use ``BeatmapCorpusWriter``
+    to build or append to a corpus.
+    """
+
+    IDX_HOBJ_OFFS = 0   # Byte offset of hitobject array
+    IDX_HOBJ_NUM  = 1   # Number of hitobjects
+    IDX_TICK_OFFS = 2   # Byte offset of tick array
+    IDX_TICK_NUM  = 3   # Number of ticks
+    IDX_TICK_COLS = 4   # Number of columns per tick
+    IDX_TOFS_OFFS = 5   # Byte offset of per-hitobject tick offsets (hitobjects + 1 entries)
+    IDX_TPNT_OFFS = 6   # Byte offset of timing point array
+    IDX_TPNT_NUM  = 7   # Number of timing points
+    IDX_END       = 8   # Byte offset of the end of the beatmap's record
+
+    IDX_NUM       = 9
+
+    ALIGNMENT = 64
+
+
+    class Entry():
+
+        def __init__(self, hitobjects: np.ndarray, ticks: np.ndarray, tick_offsets: np.ndarray, timing_points: np.ndarray):
+            self.hitobjects    = hitobjects     # (N, 5) indexed by Hitobject.HDATA_*
+            self.ticks         = ticks          # (M, C) indexed by Hitobject.TDATA_*
+            self.tick_offsets  = tick_offsets   # (N + 1,) ticks[tick_offsets[i]:tick_offsets[i + 1]] belong to hitobject i
+            self.timing_points = timing_points  # (T, 7) indexed by BeatmapBase.TPDATA_*
+
+
+        def hitobject_ticks(self, idx: int) -> np.ndarray:
+            return self.ticks[self.tick_offsets[idx]:self.tick_offsets[idx + 1]]
+
+
+    class BeatmapCorpusException(Exception):
+        pass
+
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: (string) filepath to the corpus data file
+        """
+        self.path = path
+        self.__metadata = None
+        self.refresh()
+
+
+    def __len__(self) -> int:
+        return len(self.__idx)
+
+
+    def __getitem__(self, idx: int) -> "BeatmapCorpus.Entry":
+        if idx < 0:
+            idx += len(self)
+
+        if not 0 <= idx < len(self):
+            raise IndexError(f'Beatmap index out of range   idx = {idx}')
+
+        row = self.__idx[idx]
+        num_hitobjects = int(row[BeatmapCorpus.IDX_HOBJ_NUM])
+
+        return BeatmapCorpus.Entry(
+            hitobjects    = self.__view(row[BeatmapCorpus.IDX_HOBJ_OFFS], np.float64, (num_hitobjects, 5)),
+            ticks         = self.__view(row[BeatmapCorpus.IDX_TICK_OFFS], np.float64, (int(row[BeatmapCorpus.IDX_TICK_NUM]), int(row[BeatmapCorpus.IDX_TICK_COLS]))),
+            tick_offsets  = self.__view(row[BeatmapCorpus.IDX_TOFS_OFFS], np.int64,   (num_hitobjects + 1,)),
+            timing_points = self.__view(row[BeatmapCorpus.IDX_TPNT_OFFS], np.float64, (int(row[BeatmapCorpus.IDX_TPNT_NUM]), BeatmapBase.TPDATA_NUM)),
+        )
+
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+    def refresh(self):
+        """
+        Re-maps the files to pick up beatmaps appended since the corpus was opened
+        """
+        self.__idx  = BeatmapCorpus.read_idx(self.path)
+        self.__data = None
+        self.__metadata = None
+
+        if len(self.__idx) > 0:
+            self.__data = np.memmap(self.path, dtype=np.uint8, mode='r', shape=(int(self.__idx[-1, BeatmapCorpus.IDX_END]),))
+
+
+    def metadata(self, idx: int) -> dict:
+        """
+        Returns the metadata record of beatmap i. The sidecar is read on first use.
+        """
+        if self.__metadata is None:
+            with open(BeatmapCorpus.meta_path(self.path), 'rt', encoding='utf-8') as f:
+                self.__metadata = [ json.loads(line) for _, line in zip(range(len(self)), f) ]
+
+        return self.__metadata[idx]
+
+
+    @staticmethod
+    def idx_path(path: str) -> str:
+        return path + '.idx'
+
+
+    @staticmethod
+    def meta_path(path: str) -> str:
+        return path + '.meta.jsonl'
+
+
+    @staticmethod
+    def read_idx(path: str) -> np.ndarray:
+        idx_path = BeatmapCorpus.idx_path(path)
+        if not os.path.exists(idx_path):
+            return np.zeros((0, BeatmapCorpus.IDX_NUM), dtype=np.int64)
+
+        # A partially written trailing row is ignored
+        size = os.path.getsize(idx_path) // (8*BeatmapCorpus.IDX_NUM)
+        if size == 0:
+            return np.zeros((0, BeatmapCorpus.IDX_NUM), dtype=np.int64)
+
+        return np.memmap(idx_path, dtype=np.int64, mode='r', shape=(size, BeatmapCorpus.IDX_NUM))
+
+
+    @staticmethod
+    def beatmap_arrays(beatmap: BeatmapBase) -> dict:
+        """
+        Extracts everything the corpus stores for a beatmap. Runs in the
+        parsing workers when building from files in parallel.
+        """
+        ticks, tick_offsets = beatmap.tick_array()
+
+        return {
+            'hitobjects'    : beatmap.hitobject_array(),
+            'ticks'         : ticks,
+            'tick_offsets'  : tick_offsets,
+            'timing_points' : beatmap.timing_array(),
+            'record'        : BeatmapIndex.beatmap_record(beatmap),
+        }
+
+
+    def __view(self, offset: int, dtype, shape: tuple) -> np.ndarray:
+        offset = int(offset)
+        size   = int(np.prod(shape))*np.dtype(dtype).itemsize
+
+        if size == 0:
+            return np.zeros(shape, dtype=dtype)
+
+        return self.__data[offset:offset + size].view(dtype).reshape(shape)
+
+
+
+class BeatmapCorpusWriter():
+    """
+    Builds a ``BeatmapCorpus`` or appends beatmaps to an existing one
+
+    Usage:
+        with BeatmapCorpusWriter('maps.corpus') as writer:
+            writer.add_files(filepaths, num_workers=8)
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: (string) filepath to the corpus data file. Created if it does not exist
+        """
+        self.path = path
+
+        idx = BeatmapCorpus.read_idx(path)
+        self.__num_beatmaps = len(idx)
+        self.__end = int(idx[-1, BeatmapCorpus.IDX_END]) if len(idx) > 0 else 0
+        del idx
+
+        self.__recover()
+
+        self.__data_file = open(path, 'ab')
+        self.__idx_file  = open(BeatmapCorpus.idx_path(path), 'ab')
+        self.__meta_file = open(BeatmapCorpus.meta_path(path), 'at', encoding='utf-8')
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def __len__(self) -> int:
+        return self.__num_beatmaps
+
+
+    def close(self):
+        self.__data_file.close()
+        self.__idx_file.close()
+        self.__meta_file.close()
+
+
+    def add(self, beatmap: BeatmapBase, source: str | None = None) -> int:
+        """
+        Appends a loaded beatmap
+
+        Args:
+            beatmap: (BeatmapBase) beatmap to append
+            source: (string) optional filepath recorded in the metadata sidecar
+
+        Returns:
+            index of the beatmap in the corpus
+        """
+        return self.__append(BeatmapCorpus.beatmap_arrays(beatmap), source)
+
+
+    def add_files(self, filepaths, num_workers: int | None = None, skip_errors: bool = False) -> int:
+        """
+        Loads and appends beatmap files. Parsing and array extraction run in the
+        workers; only writing happens in this process, in input order.
+
+        Returns:
+            number of beatmaps appended
+        """
+        count = 0
+        for filepath, arrays in BeatmapIO.open_beatmaps(filepaths, num_workers, process=BeatmapCorpus.beatmap_arrays, skip_errors=skip_errors):
+            self.__append(arrays, filepath)
+            count += 1
+
+        return count
+
+
+    def flush(self):
+        self.__data_file.flush()
+        self.__meta_file.flush()
+        self.__idx_file.flush()
+
+
+    def __append(self, arrays: dict, source: str | None) -> int:
+        row = np.zeros(BeatmapCorpus.IDX_NUM, dtype=np.int64)
+
+        row[BeatmapCorpus.IDX_HOBJ_OFFS] = self.__write(arrays['hitobjects'].astype(np.float64))
+        row[BeatmapCorpus.IDX_HOBJ_NUM]  = len(arrays['hitobjects'])
+        row[BeatmapCorpus.IDX_TICK_OFFS] = self.__write(arrays['ticks'].astype(np.float64))
+        row[BeatmapCorpus.IDX_TICK_NUM]  = arrays['ticks'].shape[0]
+        row[BeatmapCorpus.IDX_TICK_COLS] = arrays['ticks'].shape[1]
+        row[BeatmapCorpus.IDX_TOFS_OFFS] = self.__write(arrays['tick_offsets'].astype(np.int64))
+        row[BeatmapCorpus.IDX_TPNT_OFFS] = self.__write(arrays['timing_points'].astype(np.float64))
+        row[BeatmapCorpus.IDX_TPNT_NUM]  = len(arrays['timing_points'])
+        row[BeatmapCorpus.IDX_END]       = self.__end
+
+        record = dict(arrays['record'])
+        record['source'] = source
+        self.__meta_file.write(json.dumps(record) + '\n')
+
+        # The offset table row is written last; it is what makes the beatmap visible to readers
+        self.__data_file.flush()
+        self.__meta_file.flush()
+        self.__idx_file.write(row.tobytes())
+        self.__idx_file.flush()
+
+        self.__num_beatmaps += 1
+        return self.__num_beatmaps - 1
+
+
+    def __write(self, array: np.ndarray) -> int:
+        padding = -self.__end % BeatmapCorpus.ALIGNMENT
+        if padding > 0:
+            self.__data_file.write(b'\x00'*padding)
+            self.__end += padding
+
+        offset = self.__end
+        data   = np.ascontiguousarray(array).tobytes()
+
+        self.__data_file.write(data)
+        self.__end += len(data)
+        return offset
+
+
+    def __recover(self):
+        """
+        Drops anything written after the last complete offset table row, e.g. by an interrupted build
+        """
+        idx_path  = BeatmapCorpus.idx_path(self.path)
+        meta_path = BeatmapCorpus.meta_path(self.path)
+
+        if os.path.exists(idx_path):
+            with open(idx_path, 'r+b') as f:
+                f.truncate(self.__num_beatmaps*8*BeatmapCorpus.IDX_NUM)
+
+        if os.path.exists(self.path) and os.path.getsize(self.path) > self.__end:
+            with open(self.path, 'r+b') as f:
+                f.truncate(self.__end)
+
+        if os.path.exists(meta_path):
+            with open(meta_path, 'rt', encoding='utf-8') as f:
+                lines = [ line for _, line in zip(range(self.__num_beatmaps), f) ]
+                extra = f.read(1) != ''
+
+            if len(lines) < self.__num_beatmaps:
+                raise BeatmapCorpus.BeatmapCorpusException(f'Metadata sidecar is missing records   path = {meta_path}')
+
+            if extra:
+                with open(meta_path, 'wt', encoding='utf-8') as f:
+                    f.writelines(lines)
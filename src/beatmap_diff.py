@@ -0,0 +1,325 @@
+import numpy as np
+
+from .beatmap_base import BeatmapBase
+from .hitobject.hitobject import Hitobject
+
+
+
+class BeatmapDiff():
+    """
+    Structural differences between two versions of a beatmap
+
+    Hitobjects are aligned by start time, timing points by offset. Both sides
+    are sorted once and merged as arrays; entries with the same time pair up in
+    position order (column order for osu!mania), so the whole alignment is
+    O(n log n) with no pairwise comparisons. Field comparisons of the aligned
+    pairs are array operations as well. Fields that aren't in the hitobject
+    array (hitsounds, slider paths) are gathered into arrays once per side and
+    compared the same way, so only the changed entries are visited in Python.
+
+    Indices refer to ``a.hitobjects``/``a.timing_points`` (deleted, old side)
+    and ``b.hitobjects``/``b.timing_points`` (inserted, new side).
+
+    Usage:
+        diff = diff_beatmaps(old, new, max_shift_ms=5)
+        for i, j, changes in diff.modified:
+            print(i, j, changes)   # e.g. { 'x' : (100, 120) }
+    """
+
+    HITOBJECT_FIELDS = {
+        'x'          : Hitobject.HDATA_POSX,
+        'y'          : Hitobject.HDATA_POSY,
+        'start_time' : Hitobject.HDATA_TSRT,
+        'end_time'   : Hitobject.HDATA_TEND,
+        'type'       : Hitobject.HDATA_TYPE,
+    }
+
+    SLIDER_FIELDS = ( 'curve_type', 'curve_points', 'repeats', 'px_len' )
+
+    TIMING_FIELDS = {
+        'offset'        : BeatmapBase.TPDATA_OFFS,
+        'beat_interval' : BeatmapBase.TPDATA_BINT,
+        'meter'         : BeatmapBase.TPDATA_METR,
+        'inherited'     : BeatmapBase.TPDATA_INHR,
+    }
+
+    DIFFICULTY_FIELDS = ( 'hp', 'cs', 'od', 'ar', 'sm', 'st' )
+
+    KIND_MASK = Hitobject.CIRCLE | Hitobject.SLIDER | Hitobject.SPINNER | Hitobject.MANIALONG
+
+    def __init__(self, a: BeatmapBase, b: BeatmapBase, max_shift_ms: float = 0):
+        """
+        Args:
+            a: (BeatmapBase) old version
+            b: (BeatmapBase) new version
+            max_shift_ms: (float) hitobjects of the same kind that moved in time by at most this
+                much are reported as modified instead of as a deletion plus an insertion
+        """
+        # Hitobjects
+        hitobjects_a = a.hitobject_array()
+        hitobjects_b = b.hitobject_array()
+
+        matched, deleted, inserted = BeatmapDiff.__align(
+            [ hitobjects_a[:, Hitobject.HDATA_POSY], hitobjects_a[:, Hitobject.HDATA_POSX], hitobjects_a[:, Hitobject.HDATA_TSRT] ],
+            [ hitobjects_b[:, Hitobject.HDATA_POSY], hitobjects_b[:, Hitobject.HDATA_POSX], hitobjects_b[:, Hitobject.HDATA_TSRT] ],
+        )
+
+        if max_shift_ms > 0:
+            matched, deleted, inserted = BeatmapDiff.__align_shifted(hitobjects_a, hitobjects_b, matched, deleted, inserted, max_shift_ms)
+
+        self.matched  = matched    # (M, 2) pairs of (index in a, index in b), ordered by index in a
+        self.deleted  = deleted    # Indices in a of the hitobjects not in b
+        self.inserted = inserted   # Indices in b of the hitobjects not in a
+        self.modified: list[tuple[int, int, dict]] = BeatmapDiff.__compare(
+            matched, hitobjects_a, hitobjects_b, BeatmapDiff.HITOBJECT_FIELDS,
+            lambda i, j: BeatmapDiff.__compare_hitobjects(a.hitobjects[i], b.hitobjects[j]),
+            BeatmapDiff.__objects_changed(matched, BeatmapDiff.__object_fields(a), BeatmapDiff.__object_fields(b))
+        )
+
+        # Timing points
+        timing_a = a.timing_array()
+        timing_b = b.timing_array()
+
+        matched, deleted, inserted = BeatmapDiff.__align(
+            [ timing_a[:, BeatmapBase.TPDATA_INHR], timing_a[:, BeatmapBase.TPDATA_OFFS] ],
+            [ timing_b[:, BeatmapBase.TPDATA_INHR], timing_b[:, BeatmapBase.TPDATA_OFFS] ],
+        )
+
+        self.timing_deleted  = deleted
+        self.timing_inserted = inserted
+        self.timing_modified: list[tuple[int, int, dict]] = BeatmapDiff.__compare(matched, timing_a, timing_b, BeatmapDiff.TIMING_FIELDS)
+
+        # Beatmap level values
+        self.difficulty_changes = {
+            field : (getattr(a.difficulty, field), getattr(b.difficulty, field))
+                for field in BeatmapDiff.DIFFICULTY_FIELDS if getattr(a.difficulty, field) != getattr(b.difficulty, field)
+        }
+
+        if a.stack_leniency != b.stack_leniency:
+            self.difficulty_changes['stack_leniency'] = (a.stack_leniency, b.stack_leniency)
+
+        self.gamemode_changed = a.gamemode != b.gamemode
+
+
+    def is_empty(self) -> bool:
+        """
+        Returns whether the two beatmaps are structurally the same
+        """
+        return (
+            len(self.deleted) == 0 and len(self.inserted) == 0 and len(self.modified) == 0 and
+            len(self.timing_deleted) == 0 and len(self.timing_inserted) == 0 and len(self.timing_modified) == 0 and
+            len(self.difficulty_changes) == 0 and not self.gamemode_changed
+        )
+
+
+    def summary(self) -> dict:
+        """
+        Returns the number of changes of each kind
+        """
+        return {
+            'inserted'        : len(self.inserted),
+            'deleted'         : len(self.deleted),
+            'modified'        : len(self.modified),
+            'timing_inserted' : len(self.timing_inserted),
+            'timing_deleted'  : len(self.timing_deleted),
+            'timing_modified' : len(self.timing_modified),
+            'difficulty'      : len(self.difficulty_changes),
+        }
+
+
+    @staticmethod
+    def __align(keys_a: list[np.ndarray], keys_b: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pairs up entries with equal times. ``keys_*`` are ``np.lexsort`` keys with the time last;
+        the other keys only decide which entries with the same time pair up first.
+
+        Returns:
+            (matched (M, 2) pairs, unmatched indices in a, unmatched indices in b)
+        """
+        order_a = np.lexsort(keys_a)
+        order_b = np.lexsort(keys_b)
+
+        times_a = keys_a[-1][order_a]
+        times_b = keys_b[-1][order_b]
+
+        # Rank of each entry among the entries with the same time
+        ranks_a = np.arange(len(times_a)) - np.searchsorted(times_a, times_a, side='left')
+        ranks_b = np.arange(len(times_b)) - np.searchsorted(times_b, times_b, side='left')
+
+        # Merge both sides; a (time, rank) pair present on both sides ends up as adjacent a, b entries
+        times  = np.concatenate((times_a, times_b))
+        ranks  = np.concatenate((ranks_a, ranks_b))
+        source = np.concatenate((np.zeros(len(times_a), dtype=np.int64), np.ones(len(times_b), dtype=np.int64)))
+        merged = np.lexsort((source, ranks, times))
+
+        same  = ( times[merged[:-1]] == times[merged[1:]] ) & ( ranks[merged[:-1]] == ranks[merged[1:]] )
+        first = np.flatnonzero(same)
+
+        idx_a = order_a[merged[first]]
+        idx_b = order_b[merged[first + 1] - len(times_a)]
+
+        is_matched_a = np.zeros(len(times_a), dtype=bool)
+        is_matched_b = np.zeros(len(times_b), dtype=bool)
+        is_matched_a[idx_a] = True
+        is_matched_b[idx_b] = True
+
+        matched = np.stack((idx_a, idx_b), axis=1).reshape(-1, 2)
+        matched = matched[np.argsort(matched[:, 0], kind='stable')]
+        return matched, np.flatnonzero(~is_matched_a), np.flatnonzero(~is_matched_b)
+
+
+    @staticmethod
+    def __align_shifted(hitobjects_a: np.ndarray, hitobjects_b: np.ndarray, matched: np.ndarray, deleted: np.ndarray, inserted: np.ndarray, max_shift_ms: float):
+        # Pairs each unmatched old hitobject with the nearest unmatched new one of the same kind
+        # within the shift. Only the unmatched entries are visited.
+        kinds_a = hitobjects_a[:, Hitobject.HDATA_TYPE].astype(np.int64) & BeatmapDiff.KIND_MASK
+        kinds_b = hitobjects_b[:, Hitobject.HDATA_TYPE].astype(np.int64) & BeatmapDiff.KIND_MASK
+
+        deleted  = deleted[np.argsort(hitobjects_a[deleted, Hitobject.HDATA_TSRT], kind='stable')]
+        inserted = inserted[np.argsort(hitobjects_b[inserted, Hitobject.HDATA_TSRT], kind='stable')]
+        times_b  = hitobjects_b[inserted, Hitobject.HDATA_TSRT]
+
+        lo = np.searchsorted(times_b, hitobjects_a[deleted, Hitobject.HDATA_TSRT] - max_shift_ms, side='left')
+        hi = np.searchsorted(times_b, hitobjects_a[deleted, Hitobject.HDATA_TSRT] + max_shift_ms, side='right')
+
+        used  = np.zeros(len(inserted), dtype=bool)
+        pairs = []
+
+        for i, start, end in zip(deleted.tolist(), lo.tolist(), hi.tolist()):
+            best = None
+            for k in range(start, end):
+                if used[k] or kinds_b[inserted[k]] != kinds_a[i]:
+                    continue
+
+                if best is None or abs(times_b[k] - hitobjects_a[i, Hitobject.HDATA_TSRT]) < abs(times_b[best] - hitobjects_a[i, Hitobject.HDATA_TSRT]):
+                    best = k
+
+            if best is not None:
+                used[best] = True
+                pairs.append((i, inserted[best]))
+
+        if len(pairs) == 0:
+            return matched, np.sort(deleted), np.sort(inserted)
+
+        pairs   = np.asarray(pairs, dtype=np.int64)
+        matched = np.concatenate((matched, pairs))
+        matched = matched[np.argsort(matched[:, 0], kind='stable')]
+
+        return matched, np.sort(np.setdiff1d(deleted, pairs[:, 0])), np.sort(inserted[~used])
+
+
+    @staticmethod
+    def __compare(matched: np.ndarray, data_a: np.ndarray, data_b: np.ndarray, fields: dict[str, int], compare_objects=None, objects_changed: np.ndarray | None = None) -> list[tuple[int, int, dict]]:
+        columns = list(fields.values())
+        rows_a  = data_a[matched[:, 0]][:, columns]
+        rows_b  = data_b[matched[:, 1]][:, columns]
+
+        changed = np.any(rows_a != rows_b, axis=1)
+        changes = { k : {} for k in np.flatnonzero(changed).tolist() }
+
+        for k, changes_k in changes.items():
+            for c, field in enumerate(fields):
+                if rows_a[k, c] != rows_b[k, c]:
+                    changes_k[field] = (rows_a[k, c].item(), rows_b[k, c].item())
+
+        # Per-object fields not in the arrays (e.g. slider paths), for the pairs flagged by ``objects_changed``
+        if compare_objects is not None:
+            candidates = np.arange(len(matched)) if objects_changed is None else np.flatnonzero(objects_changed)
+            for k in candidates.tolist():
+                object_changes = compare_objects(int(matched[k, 0]), int(matched[k, 1]))
+                if len(object_changes) > 0:
+                    changes.setdefault(k, {}).update(object_changes)
+
+        return [ (int(matched[k, 0]), int(matched[k, 1]), changes[k]) for k in sorted(changes) ]
+
+
+    @staticmethod
+    def __object_fields(beatmap: BeatmapBase) -> dict[str, np.ndarray]:
+        # The fields ``__compare_hitobjects`` looks at, as one array per field. Slider curve points are
+        # concatenated, with ``curve_offsets`` such that ``curve_points[curve_offsets[i]:curve_offsets[i + 1]]``
+        # are the points of hitobject i. Non-sliders have no curve fields set.
+        hitobjects = beatmap.hitobjects
+        is_slider  = np.asarray([ hitobject.is_htype(Hitobject.SLIDER) for hitobject in hitobjects ], dtype=bool)
+        sliders    = [ hitobject if slider else None for hitobject, slider in zip(hitobjects, is_slider) ]
+
+        curve_points = [ np.asarray(getattr(slider, 'curve_points', []) if slider is not None else [], dtype=np.float64).reshape(-1, 2) for slider in sliders ]
+        curve_offsets = np.zeros(len(hitobjects) + 1, dtype=np.int64)
+        curve_offsets[1:] = np.cumsum([ len(points) for points in curve_points ])
+
+        return {
+            'hitsound'      : np.asarray([ getattr(hitobject, 'hitsound', None) for hitobject in hitobjects ], dtype=object),
+            'is_slider'     : is_slider,
+            'curve_type'    : np.asarray([ getattr(slider, 'curve_type', None) for slider in sliders ], dtype=object),
+            'repeats'       : np.asarray([ getattr(slider, 'repeats', 0) if slider is not None else 0 for slider in sliders ], dtype=np.float64),
+            'px_len'        : np.asarray([ getattr(slider, 'px_len', 0) if slider is not None else 0 for slider in sliders ], dtype=np.float64),
+            'curve_points'  : np.concatenate(curve_points) if curve_offsets[-1] > 0 else np.zeros((0, 2)),
+            'curve_offsets' : curve_offsets,
+        }
+
+
+    @staticmethod
+    def __objects_changed(matched: np.ndarray, fields_a: dict[str, np.ndarray], fields_b: dict[str, np.ndarray]) -> np.ndarray:
+        # Which matched pairs ``__compare_hitobjects`` would report changes for
+        idx_a, idx_b = matched[:, 0], matched[:, 1]
+
+        changed = fields_a['hitsound'][idx_a] != fields_b['hitsound'][idx_b]
+
+        sliders = fields_a['is_slider'][idx_a] & fields_b['is_slider'][idx_b]
+        for field in [ 'curve_type', 'repeats', 'px_len' ]:
+            changed |= sliders & ( fields_a[field][idx_a] != fields_b[field][idx_b] )
+
+        # Curves with a different number of points differ; those with the same number are compared point by point
+        starts_a = fields_a['curve_offsets'][idx_a]
+        starts_b = fields_b['curve_offsets'][idx_b]
+        counts_a = fields_a['curve_offsets'][idx_a + 1] - starts_a
+        counts_b = fields_b['curve_offsets'][idx_b + 1] - starts_b
+
+        changed |= sliders & ( counts_a != counts_b )
+
+        counts = np.where(sliders & ( counts_a == counts_b ), counts_a, 0)
+        pairs  = np.repeat(np.arange(len(matched)), counts)
+        within = np.arange(len(pairs)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        points_a = fields_a['curve_points'][starts_a[pairs] + within]
+        points_b = fields_b['curve_points'][starts_b[pairs] + within]
+        differs  = np.any(points_a != points_b, axis=1)
+
+        changed |= np.bincount(pairs[differs], minlength=len(matched)) > 0
+        return changed
+
+
+    @staticmethod
+    def __compare_hitobjects(hitobject_a: Hitobject, hitobject_b: Hitobject) -> dict:
+        changes = {}
+
+        hitsound_a = getattr(hitobject_a, 'hitsound', None)
+        hitsound_b = getattr(hitobject_b, 'hitsound', None)
+        if hitsound_a != hitsound_b:
+            changes['hitsound'] = (hitsound_a, hitsound_b)
+
+        if not ( hitobject_a.is_htype(Hitobject.SLIDER) and hitobject_b.is_htype(Hitobject.SLIDER) ):
+            return changes
+
+        for field in BeatmapDiff.SLIDER_FIELDS:
+            value_a = getattr(hitobject_a, field)
+            value_b = getattr(hitobject_b, field)
+            if value_a != value_b:
+                changes[field] = (value_a, value_b)
+
+        return changes
+
+
+
+def diff_beatmaps(a: BeatmapBase, b: BeatmapBase, max_shift_ms: float = 0) -> BeatmapDiff:
+    """
+    Compares two versions of a beatmap, see ``BeatmapDiff``
+
+    Args:
+        a: (BeatmapBase) old version
+        b: (BeatmapBase) new version
+        max_shift_ms: (float) see ``BeatmapDiff``
+
+    Returns:
+        ``BeatmapDiff``
+    """
+    return BeatmapDiff(a, b, max_shift_ms)
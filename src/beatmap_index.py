@@ -0,0 +1,342 @@
+import os
+import sqlite3
+import operator
+
+from .beatmapIO import BeatmapIO
+from .beatmap_base import BeatmapBase
+from .gamemode import Gamemode
+from .fingerprint import Fingerprint, FingerprintIndex
+
+from .utils.parallel import imap_ordered
+
+
+
+class BeatmapIndex():
+    """
+    Persistent SQLite catalog of a directory of beatmaps
+
+    Only files whose size or modification time changed since the last
+    ``update`` are re-parsed, and files that no longer exist are dropped.
+    Files that fail to parse are remembered as well so they are not retried
+    until they change.
+
+    Usage:
+        with BeatmapIndex('songs.db') as index:
+            index.update('osu!/Songs', num_workers=8)
+            maps = index.find(gamemode=Gamemode.MANIA, cs=7, od=(8, None))
+    """
+
+    COLUMNS = {
+        'path'           : 'TEXT PRIMARY KEY',
+        'size'           : 'INTEGER NOT NULL',
+        'mtime_ns'       : 'INTEGER NOT NULL',
+        'md5'            : 'TEXT',
+        'beatmap_format' : 'INTEGER',
+        'artist'         : 'TEXT',
+        'title'          : 'TEXT',
+        'version'        : 'TEXT',
+        'creator'        : 'TEXT',
+        'name'           : 'TEXT',
+        'beatmap_id'     : 'TEXT',
+        'beatmapset_id'  : 'TEXT',
+        'hp'             : 'REAL',
+        'cs'             : 'REAL',
+        'od'             : 'REAL',
+        'ar'             : 'REAL',
+        'sm'             : 'REAL',
+        'st'             : 'REAL',
+        'bpm_min'        : 'REAL',
+        'bpm_max'        : 'REAL',
+        'gamemode'       : 'INTEGER',
+        'fingerprint'    : 'TEXT',      # ``Fingerprint.encode`` of the map's MinHash signature
+    }
+
+    INDICES = {
+        'idx_beatmaps_mode_cs_od' : [ 'gamemode', 'cs', 'od' ],
+        'idx_beatmaps_mode_ar'    : [ 'gamemode', 'ar' ],
+        'idx_beatmaps_mode_bpm'   : [ 'gamemode', 'bpm_max' ],
+        'idx_beatmaps_md5'        : [ 'md5' ],
+        'idx_beatmaps_set'        : [ 'beatmapset_id' ],
+    }
+
+    COMMIT_INTERVAL = 1000
+
+
+    class BeatmapIndexException(Exception):
+        pass
+
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: (string) filepath to the SQLite database. Created if it does not exist
+        """
+        self.db_path = db_path
+        self.__db = sqlite3.connect(db_path)
+        self.__db.row_factory = sqlite3.Row
+        self.__create_tables()
+
+        self.__fingerprints: FingerprintIndex | None = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def __len__(self) -> int:
+        return self.__db.execute('SELECT COUNT(*) FROM beatmaps').fetchone()[0]
+
+
+    def close(self):
+        self.__db.close()
+
+
+    @staticmethod
+    def beatmap_record(beatmap: BeatmapBase) -> dict:
+        """
+        Extracts the indexed fields of a loaded beatmap. Runs in the
+        parsing workers so only this small dict crosses process boundaries.
+        """
+        return {
+            'md5'            : beatmap.metadata.beatmap_md5,
+            'beatmap_format' : beatmap.metadata.beatmap_format,
+            'artist'         : beatmap.metadata.artist,
+            'title'          : beatmap.metadata.title,
+            'version'        : beatmap.metadata.version,
+            'creator'        : beatmap.metadata.creator,
+            'name'           : beatmap.metadata.name,
+            'beatmap_id'     : beatmap.metadata.beatmap_id,
+            'beatmapset_id'  : beatmap.metadata.beatmapset_id,
+            'hp'             : beatmap.difficulty.hp,
+            'cs'             : beatmap.difficulty.cs,
+            'od'             : beatmap.difficulty.od,
+            'ar'             : beatmap.difficulty.ar,
+            'sm'             : beatmap.difficulty.sm,
+            'st'             : beatmap.difficulty.st,
+            'bpm_min'        : beatmap.bpm_min,
+            'bpm_max'        : beatmap.bpm_max,
+            'gamemode'       : beatmap.gamemode.value,
+            'fingerprint'    : Fingerprint.encode(Fingerprint.minhash(beatmap)),
+        }
+
+
+    def update(self, dirpath: str, num_workers: int | None = None, progress=None) -> dict[str, int]:
+        """
+        Brings the index up to date with the *.osu files under a directory
+
+        Args:
+            dirpath: (string) directory to scan recursively, e.g. the osu! Songs folder
+            num_workers: (int) number of processes to parse changed beatmaps with. ``None`` parses serially
+            progress: (callable) called with (filepath, error or ``None``) after each changed file is parsed
+
+        Returns:
+            counts of 'added', 'updated', 'removed', 'unchanged' and 'failed' files
+        """
+        counts = { 'added' : 0, 'updated' : 0, 'removed' : 0, 'unchanged' : 0, 'failed' : 0 }
+        self.__fingerprints = None
+
+        known = {
+            row['path'] : (row['size'], row['mtime_ns'])
+                for row in self.__db.execute('SELECT path, size, mtime_ns FROM beatmaps UNION ALL SELECT path, size, mtime_ns FROM errors')
+        }
+
+        changed = []
+        seen    = set()
+
+        for path, size, mtime_ns in BeatmapIndex.__scan(dirpath):
+            seen.add(path)
+
+            if known.get(path) == (size, mtime_ns):
+                counts['unchanged'] += 1
+                continue
+
+            changed.append((path, size, mtime_ns))
+
+        # Other directories may be indexed in the same database; only drop entries under this one
+        root    = os.path.join(os.path.abspath(dirpath), '')
+        removed = [ path for path in known if path not in seen and path.startswith(root) ]
+        with self.__db:
+            self.__db.executemany('DELETE FROM beatmaps WHERE path = ?', [ (path,) for path in removed ])
+            self.__db.executemany('DELETE FROM errors WHERE path = ?', [ (path,) for path in removed ])
+        counts['removed'] = len(removed)
+
+        columns = list(BeatmapIndex.COLUMNS.keys())
+        insert  = f'INSERT OR REPLACE INTO beatmaps ({", ".join(columns)}) VALUES ({", ".join("?"*len(columns))})'
+
+        funcs = [ operator.itemgetter(0), BeatmapIO.open_beatmap, BeatmapIndex.beatmap_record ]
+        pending = 0
+
+        for (path, size, mtime_ns), record, error in imap_ordered(funcs, changed, num_workers):
+            self.__db.execute('DELETE FROM errors WHERE path = ?', (path,))
+
+            if error is not None:
+                self.__db.execute('DELETE FROM beatmaps WHERE path = ?', (path,))
+                self.__db.execute('INSERT INTO errors (path, size, mtime_ns, error) VALUES (?, ?, ?, ?)', (path, size, mtime_ns, str(error)))
+                counts['failed'] += 1
+            else:
+                counts['updated' if path in known else 'added'] += 1
+                record.update(path=path, size=size, mtime_ns=mtime_ns)
+                self.__db.execute(insert, [ record[column] for column in columns ])
+
+            if progress is not None:
+                progress(path, error)
+
+            pending += 1
+            if pending >= BeatmapIndex.COMMIT_INTERVAL:
+                self.__db.commit()
+                pending = 0
+
+        self.__db.commit()
+        return counts
+
+
+    def find(self, order_by: str | None = None, **conditions) -> list[dict]:
+        """
+        Looks up indexed beatmaps matching all the conditions given
+
+        Args:
+            order_by: (string) column to sort results by
+            conditions: column=value for equality, or column=(min, max) for an
+                inclusive range where either bound may be ``None``
+
+        Example:
+            index.find(gamemode=Gamemode.MANIA, cs=7, od=(8, None))
+        """
+        clauses = []
+        params  = []
+
+        for column, value in conditions.items():
+            BeatmapIndex.__validate_column(column)
+
+            if isinstance(value, Gamemode):
+                value = value.value
+
+            if isinstance(value, tuple):
+                if len(value) != 2:
+                    raise BeatmapIndex.BeatmapIndexException(f'Range for "{column}" must be (min, max)   value = {value}')
+
+                if value[0] is not None:
+                    clauses.append(f'{column} >= ?')
+                    params.append(value[0])
+
+                if value[1] is not None:
+                    clauses.append(f'{column} <= ?')
+                    params.append(value[1])
+                continue
+
+            clauses.append(f'{column} = ?')
+            params.append(value)
+
+        query = 'SELECT * FROM beatmaps'
+        if len(clauses) > 0:
+            query += ' WHERE ' + ' AND '.join(clauses)
+
+        if order_by is not None:
+            BeatmapIndex.__validate_column(order_by)
+            query += f' ORDER BY {order_by}'
+
+        return [ dict(row) for row in self.__db.execute(query, params) ]
+
+
+    def find_similar(self, target: str | BeatmapBase, threshold: float = 0.5, limit: int | None = None) -> list[dict]:
+        """
+        Looks up indexed beatmaps with similar rhythm and patterns, see ``Fingerprint``. Finds
+        re-uploads and edited copies whose md5 differs.
+
+        The LSH index over the stored fingerprints is built on the first call and kept until
+        the next ``update``.
+
+        Args:
+            target: (string | BeatmapBase) filepath of an indexed beatmap, or a loaded beatmap
+            threshold: (float) min estimated similarity, in [0, 1]
+            limit: (int) max number of results
+
+        Returns:
+            records as returned by ``find`` with a 'similarity' entry added, most similar first.
+            An indexed target is not included in its own results.
+        """
+        if isinstance(target, BeatmapBase):
+            path = None
+            signature = Fingerprint.minhash(target)
+        else:
+            path = os.path.abspath(target)
+            record = self.get(path)
+            if record is None or record['fingerprint'] is None:
+                raise BeatmapIndex.BeatmapIndexException(f'Beatmap is not indexed   path = {path}')
+
+            signature = Fingerprint.decode(record['fingerprint'])
+
+        if self.__fingerprints is None:
+            rows = self.__db.execute('SELECT path, fingerprint FROM beatmaps WHERE fingerprint IS NOT NULL').fetchall()
+
+            self.__fingerprints = FingerprintIndex()
+            self.__fingerprints.add_many([ row['path'] for row in rows ], [ Fingerprint.decode(row['fingerprint']) for row in rows ])
+
+        results = []
+        for result_path, similarity in self.__fingerprints.query(signature, threshold):
+            if result_path == path:
+                continue
+
+            record = self.get(result_path)
+            record['similarity'] = similarity
+            results.append(record)
+
+            if limit is not None and len(results) >= limit:
+                break
+
+        return results
+
+
+    def get(self, path: str) -> dict | None:
+        row = self.__db.execute('SELECT * FROM beatmaps WHERE path = ?', (os.path.abspath(path),)).fetchone()
+        return None if row is None else dict(row)
+
+
+    def errors(self) -> dict[str, str]:
+        """
+        Returns filepath -> error message for beatmaps that failed to parse
+        """
+        return { row['path'] : row['error'] for row in self.__db.execute('SELECT path, error FROM errors') }
+
+
+    def __create_tables(self):
+        columns = ', '.join(f'{name} {decl}' for name, decl in BeatmapIndex.COLUMNS.items())
+
+        with self.__db:
+            self.__db.execute(f'CREATE TABLE IF NOT EXISTS beatmaps ({columns})')
+
+            # Databases made by older versions get the columns added since; their rows fill in as files change
+            existing = { row['name'] for row in self.__db.execute('PRAGMA table_info(beatmaps)') }
+            for name, decl in BeatmapIndex.COLUMNS.items():
+                if name not in existing:
+                    self.__db.execute(f'ALTER TABLE beatmaps ADD COLUMN {name} {decl}')
+            self.__db.execute('CREATE TABLE IF NOT EXISTS errors (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, error TEXT)')
+
+            for name, index_columns in BeatmapIndex.INDICES.items():
+                self.__db.execute(f'CREATE INDEX IF NOT EXISTS {name} ON beatmaps ({", ".join(index_columns)})')
+
+
+    @staticmethod
+    def __validate_column(column: str):
+        if column not in BeatmapIndex.COLUMNS:
+            raise BeatmapIndex.BeatmapIndexException(f'Unknown column   column = {column}')
+
+
+    @staticmethod
+    def __scan(dirpath: str):
+        for root, _, filenames in os.walk(os.path.abspath(dirpath)):
+            for filename in filenames:
+                if not filename.lower().endswith('.osu'):
+                    continue
+
+                path = os.path.join(root, filename)
+
+                try: stat = os.stat(path)
+                except OSError:
+                    continue
+
+                yield path, stat.st_size, stat.st_mtime_ns
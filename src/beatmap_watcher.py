@@ -0,0 +1,423 @@
+import io
+import os
+import sys
+import select
+import hashlib
+import threading
+
+from .beatmapIO import BeatmapIO, BeatmapLoader
+from .beatmap_base import BeatmapBase
+
+
+
+class BeatmapWatcher():
+    """
+    Keeps the beatmaps under a set of files and directories loaded while they are edited
+
+    Each ``poll`` stats the watched *.osu files and reloads the ones whose size
+    or modification time changed. The new file is split into sections and
+    compared with the last loaded version:
+        - only [HitObjects] changed: the beatmap is updated in place; the
+          unchanged lines at the start and end of the section keep their
+          hitobjects, and only the lines between them are parsed and get curves
+          and ticks generated, see ``BeatmapIO.replace_hitobjects``
+        - only sections the parser ignores changed: nothing is reparsed
+        - anything else changed: the file is reloaded through the loader
+
+    Every change is published to the subscribers as a ``BeatmapWatcher.Change``.
+    ``start`` polls on a background thread; on Linux it waits on inotify events
+    so saves are picked up right away, with ``poll_interval`` as a fallback
+    rescan. Subscribers are called on that thread.
+
+    Usage:
+        watcher = BeatmapWatcher()
+        watcher.subscribe(lambda change: print(change.kind, change.path, change.hitobjects))
+        watcher.watch('osu!/Songs/123 Artist - Title')
+        watcher.start()
+    """
+
+    POLL_INTERVAL = 1.0
+
+    IGNORED_SECTIONS = ( '[Events]', '[Colours]' )   # Not read by the parser
+
+    class Change():
+
+        ADDED    = 'added'
+        MODIFIED = 'modified'
+        REMOVED  = 'removed'
+        FAILED   = 'failed'
+
+        def __init__(self, path: str, kind: str, beatmap: BeatmapBase | None = None, sections: list[str] | None = None, hitobjects: tuple[int, int, int] | None = None, error: Exception | None = None):
+            self.path       = path
+            self.kind       = kind
+            self.beatmap    = beatmap      # Current beatmap; the last one loaded if the file failed to load
+            self.sections   = sections     # Sections that changed, e.g. [ '[HitObjects]' ]; None if not compared
+            self.hitobjects = hitobjects   # (start, old stop, new stop) hitobjects replaced in place; None if rebuilt
+            self.error      = error
+
+
+    class __File():
+
+        def __init__(self):
+            self.stat     = None   # (size, mtime_ns)
+            self.md5      = None
+            self.sections = None   # section name -> lines of the last loaded version; None forces a full reload
+            self.beatmap  = None
+
+
+    def __init__(self, loader: BeatmapLoader | None = None, poll_interval: float = POLL_INTERVAL, use_inotify: bool = True):
+        """
+        Args:
+            loader: (BeatmapLoader) loads changed files. Defaults to ``BeatmapIO.default_loader``.
+                Its ``time_range`` is ignored; the watcher needs every hitobject
+            poll_interval: (float) seconds between polls of the background thread
+            use_inotify: (bool) wait on inotify events between polls where available
+        """
+        loader = BeatmapIO.default_loader if loader is None else loader
+        self.__loader = loader.with_options(time_range=None)
+
+        self.poll_interval = poll_interval
+        self.use_inotify   = use_inotify
+
+        self.__lock    = threading.RLock()
+        self.__roots:  set[str] = set()
+        self.__files:  dict[str, BeatmapWatcher.__File] = {}
+        self.__subscribers = []
+
+        self.__thread = None
+        self.__stop   = threading.Event()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return sum(1 for file in self.__files.values() if file.beatmap is not None)
+
+
+    def __contains__(self, path: str) -> bool:
+        return self.get(path) is not None
+
+
+    def get(self, path: str) -> BeatmapBase | None:
+        """
+        Returns the current beatmap of a watched file, or None if it is not loaded
+        """
+        with self.__lock:
+            file = self.__files.get(os.path.abspath(path))
+            return None if file is None else file.beatmap
+
+
+    def beatmaps(self) -> dict[str, BeatmapBase]:
+        """
+        Returns filepath -> current beatmap of every loaded file
+        """
+        with self.__lock:
+            return { path : file.beatmap for path, file in self.__files.items() if file.beatmap is not None }
+
+
+    def subscribe(self, callback):
+        """
+        Args:
+            callback: (callable) called with a ``BeatmapWatcher.Change`` for every change found
+        """
+        with self.__lock:
+            self.__subscribers.append(callback)
+
+
+    def unsubscribe(self, callback):
+        with self.__lock:
+            self.__subscribers.remove(callback)
+
+
+    def watch(self, path: str) -> list["BeatmapWatcher.Change"]:
+        """
+        Starts watching a *.osu file or a directory, recursively, and loads the beatmaps in it
+
+        Returns:
+            the changes of the poll that loaded them
+        """
+        with self.__lock:
+            self.__roots.add(os.path.abspath(path))
+
+        return self.poll()
+
+
+    def unwatch(self, path: str):
+        """
+        Stops watching a file or directory given to ``watch`` and drops its beatmaps
+        """
+        root = os.path.abspath(path)
+
+        with self.__lock:
+            self.__roots.discard(root)
+
+            # Files still under another watched root stay
+            watched = { filepath for filepath, _ in self.__scan() }
+            for filepath in list(self.__files):
+                if filepath not in watched:
+                    del self.__files[filepath]
+
+
+    def poll(self) -> list["BeatmapWatcher.Change"]:
+        """
+        Checks the watched files once, reloads the changed ones and notifies the subscribers
+
+        Returns:
+            the changes found
+        """
+        changes = []
+
+        with self.__lock:
+            seen = set()
+
+            for filepath, stat in self.__scan():
+                seen.add(filepath)
+
+                file = self.__files.get(filepath)
+                if file is not None and file.stat == stat:
+                    continue
+
+                if file is None:
+                    file = BeatmapWatcher.__File()
+                    self.__files[filepath] = file
+
+                change = self.__reload(filepath, file, stat)
+                if change is not None:
+                    changes.append(change)
+
+            for filepath in [ filepath for filepath in self.__files if filepath not in seen ]:
+                file = self.__files.pop(filepath)
+                changes.append(BeatmapWatcher.Change(filepath, BeatmapWatcher.Change.REMOVED, file.beatmap))
+
+            subscribers = list(self.__subscribers)
+
+        for change in changes:
+            for callback in subscribers:
+                try: callback(change)
+                except Exception as e:
+                    print(f'WARN[beatmap_reader]: watcher subscriber failed on "{change.path}": {e}')
+
+        return changes
+
+
+    def start(self):
+        """
+        Starts polling on a background thread
+        """
+        if self.__thread is not None:
+            return
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, name='BeatmapWatcher', daemon=True)
+        self.__thread.start()
+
+
+    def stop(self):
+        """
+        Stops the background thread, waiting for a poll in progress to finish
+        """
+        if self.__thread is None:
+            return
+
+        self.__stop.set()
+        self.__thread.join()
+        self.__thread = None
+
+
+    def __run(self):
+        inotify = None
+        if self.use_inotify and BeatmapWatcher.__Inotify.available():
+            try: inotify = BeatmapWatcher.__Inotify()
+            except OSError as e:
+                print(f'WARN[beatmap_reader]: inotify unavailable, polling only: {e}')
+
+        try:
+            while not self.__stop.is_set():
+                self.poll()
+
+                if inotify is None:
+                    self.__stop.wait(self.poll_interval)
+                    continue
+
+                with self.__lock:
+                    dirpaths = { os.path.dirname(filepath) for filepath in self.__files } | { root for root in self.__roots if os.path.isdir(root) }
+
+                inotify.watch_dirs(dirpaths)
+                inotify.wait(self.poll_interval)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+
+    def __reload(self, filepath: str, file: "BeatmapWatcher.__File", stat: tuple[int, int]) -> "BeatmapWatcher.Change | None":
+        file.stat = stat
+
+        try:
+            with open(filepath, 'rb') as beatmap_file:
+                beatmap_data = beatmap_file.read()
+        except OSError as e:
+            return BeatmapWatcher.Change(filepath, BeatmapWatcher.Change.FAILED, file.beatmap, error=e)
+
+        # Touched but not changed
+        md5 = hashlib.md5(beatmap_data).hexdigest()
+        if md5 == file.md5:
+            return None
+
+        file.md5 = md5
+        kind = BeatmapWatcher.Change.ADDED if file.beatmap is None else BeatmapWatcher.Change.MODIFIED
+
+        try:
+            sections = BeatmapWatcher.__split_sections(io.StringIO(beatmap_data.decode('utf-8'), newline=None).readlines())
+        except UnicodeDecodeError as e:
+            file.sections = None
+            return BeatmapWatcher.Change(filepath, BeatmapWatcher.Change.FAILED, file.beatmap, error=e)
+
+        changed = None
+        if file.sections is not None and file.beatmap is not None:
+            changed = sorted(name for name in set(file.sections) | set(sections) if file.sections.get(name) != sections.get(name))
+
+        try:
+            if changed is not None and all(name in BeatmapWatcher.IGNORED_SECTIONS or name == '[HitObjects]' for name in changed):
+                hitobjects = (0, 0, 0)
+                if '[HitObjects]' in changed:
+                    hitobjects = self.__replace_hitobjects(file.beatmap, file.sections.get('[HitObjects]', []), sections.get('[HitObjects]', []))
+
+                file.beatmap.metadata.beatmap_md5 = md5
+                file.sections = sections
+                return BeatmapWatcher.Change(filepath, kind, file.beatmap, changed, hitobjects)
+
+            file.beatmap  = self.__loader.load_beatmap(beatmap_data)
+            file.sections = sections
+            return BeatmapWatcher.Change(filepath, kind, file.beatmap, changed)
+        except Exception as e:
+            # The last good beatmap is kept; the next change reloads the whole file
+            file.sections = None
+            return BeatmapWatcher.Change(filepath, BeatmapWatcher.Change.FAILED, file.beatmap, changed, error=e)
+
+
+    def __replace_hitobjects(self, beatmap: BeatmapBase, old_lines: list[str], new_lines: list[str]) -> tuple[int, int, int]:
+        # Lines without a comma are skipped by the parser and have no hitobject
+        old_lines = [ line for line in old_lines if ',' in line ]
+        new_lines = [ line for line in new_lines if ',' in line ]
+
+        num_same = min(len(old_lines), len(new_lines))
+
+        start = 0
+        while start < num_same and old_lines[start] == new_lines[start]:
+            start += 1
+
+        end = 0
+        while end < num_same - start and old_lines[-1 - end] == new_lines[-1 - end]:
+            end += 1
+
+        old_stop = len(old_lines) - end
+        new_stop = len(new_lines) - end
+
+        BeatmapIO.replace_hitobjects(beatmap, start, old_stop, new_lines[start:new_stop], self.__loader.fidelity)
+        return start, old_stop, new_stop
+
+
+    @staticmethod
+    def __split_sections(lines: list[str]) -> dict[str, list[str]]:
+        # Lines before the first section (the format line) go under ''
+        sections = { '' : [] }
+        section  = sections['']
+
+        for line in lines:
+            name = line.strip()
+            if name.startswith('[') and name.endswith(']'):
+                section = sections.setdefault(name, [])
+                continue
+
+            section.append(line)
+
+        return sections
+
+
+    def __scan(self):
+        for root in sorted(self.__roots):
+            if not os.path.isdir(root):
+                try: stat = os.stat(root)
+                except OSError:
+                    continue
+
+                yield root, (stat.st_size, stat.st_mtime_ns)
+                continue
+
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    if not filename.lower().endswith('.osu'):
+                        continue
+
+                    filepath = os.path.join(dirpath, filename)
+
+                    try: stat = os.stat(filepath)
+                    except OSError:
+                        continue
+
+                    yield filepath, (stat.st_size, stat.st_mtime_ns)
+
+
+
+    class __Inotify():
+        """
+        Minimal inotify binding over libc, only used to wake the poll loop early
+        """
+
+        IN_MODIFY      = 0x002
+        IN_CLOSE_WRITE = 0x008
+        IN_MOVED_FROM  = 0x040
+        IN_MOVED_TO    = 0x080
+        IN_CREATE      = 0x100
+        IN_DELETE      = 0x200
+
+        MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+        def __init__(self):
+            import ctypes
+            import ctypes.util
+
+            self.__libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+
+            self.fd = self.__libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if self.fd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno))
+
+            self.__dirpaths = set()
+
+
+        @staticmethod
+        def available() -> bool:
+            return sys.platform.startswith('linux')
+
+
+        def watch_dirs(self, dirpaths: set[str]):
+            # Watches stay until the directory is deleted; new ones are added as directories appear
+            for dirpath in dirpaths - self.__dirpaths:
+                if self.__libc.inotify_add_watch(self.fd, os.fsencode(dirpath), self.MASK) >= 0:
+                    self.__dirpaths.add(dirpath)
+
+
+        def wait(self, timeout: float):
+            readable, _, _ = select.select([ self.fd ], [], [], timeout)
+            if len(readable) == 0:
+                return
+
+            # Events only wake the poll; which files changed is found by stat
+            try:
+                while len(os.read(self.fd, 1 << 16)) > 0:
+                    pass
+            except BlockingIOError:
+                pass
+
+
+        def close(self):
+            os.close(self.fd)
@@ -0,0 +1,287 @@
+"""
+``beatmap-reader`` command line tool
+
+Subcommands:
+    load     - bulk load *.osu files and report throughput and failures
+    dump     - write metadata, and optionally hitobjects and ticks, to JSON lines or NPZ files
+    index    - build or refresh a ``BeatmapIndex`` catalog of a directory
+    profile  - time a single map per parse phase, with cProfile and tracemalloc output
+
+Directories are walked lazily and results are written as each beatmap
+finishes, so memory stays flat and partial output is usable on directories
+of any size. Progress goes to stderr.
+
+Usage:
+    beatmap-reader load "osu!/Songs" -j 8
+    beatmap-reader dump "osu!/Songs" -o maps.jsonl --ticks -j 8
+    beatmap-reader index "osu!/Songs" songs.db -j 8
+    beatmap-reader profile map.osu --repeat 10
+"""
+import io
+import os
+import sys
+import json
+import time
+import pstats
+import argparse
+import cProfile
+import functools
+import tracemalloc
+
+import numpy as np
+
+from .beatmapIO import BeatmapIO
+from .beatmap_base import BeatmapBase
+from .beatmap_index import BeatmapIndex
+from .beatmap_corpus import BeatmapCorpus
+from .hitobject.hitobject import Hitobject
+
+from .utils.parallel import imap_ordered
+
+
+# Parse phases reported by ``profile``; name -> ``BeatmapIO`` function
+PROFILE_PHASES = {
+    'sections'    : '__parse_beatmap_content',
+    'timing'      : '__process_timing_points',
+    'hitobjects'  : '__postprocess_hitobjects',
+    'postprocess' : '__postprocess_map',
+}
+
+PROGRESS_INTERVAL = 100
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point of the ``beatmap-reader`` console script
+
+    Returns:
+        exit code
+    """
+    parser = argparse.ArgumentParser(prog='beatmap-reader', description='Batch tools for *.osu files')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    load = subparsers.add_parser('load', help='bulk load beatmaps and report throughput and failures')
+    load.add_argument('paths', nargs='+', help='*.osu files or directories to scan recursively')
+    load.add_argument('-j', '--workers', type=int, default=None, help='worker processes; -1 for one per CPU')
+    load.add_argument('--fidelity', choices=[ Hitobject.FIDELITY_NONE, Hitobject.FIDELITY_ENDPOINTS, Hitobject.FIDELITY_FULL ], default=Hitobject.FIDELITY_FULL)
+    load.add_argument('--errors', default=None, help='write failed filepaths and their errors to this JSON lines file')
+    load.set_defaults(func=_cmd_load)
+
+    dump = subparsers.add_parser('dump', help='dump metadata, hitobjects and ticks')
+    dump.add_argument('paths', nargs='+', help='*.osu files or directories to scan recursively')
+    dump.add_argument('-o', '--output', required=True, help='JSON lines file, or directory for --format npz')
+    dump.add_argument('--format', choices=[ 'json', 'npz' ], default='json')
+    dump.add_argument('--ticks', action='store_true', help='include hitobject, tick and timing point arrays')
+    dump.add_argument('-j', '--workers', type=int, default=None, help='worker processes; -1 for one per CPU')
+    dump.set_defaults(func=_cmd_dump)
+
+    index = subparsers.add_parser('index', help='build or refresh a BeatmapIndex database')
+    index.add_argument('dirpath', help='directory to scan recursively, e.g. the osu! Songs folder')
+    index.add_argument('db_path', help='SQLite database; created if it does not exist')
+    index.add_argument('-j', '--workers', type=int, default=None, help='worker processes; -1 for one per CPU')
+    index.set_defaults(func=_cmd_index)
+
+    profile = subparsers.add_parser('profile', help='time and profile loading a single beatmap')
+    profile.add_argument('filepath', help='*.osu file')
+    profile.add_argument('--repeat', type=int, default=5, help='unprofiled loads to take the best time of')
+    profile.add_argument('--top', type=int, default=15, help='number of cProfile and tracemalloc entries to list')
+    profile.add_argument('--fidelity', choices=[ Hitobject.FIDELITY_NONE, Hitobject.FIDELITY_ENDPOINTS, Hitobject.FIDELITY_FULL ], default=Hitobject.FIDELITY_FULL)
+    profile.add_argument('--pstats', default=None, help='also save the cProfile stats to this file, e.g. for snakeviz')
+    profile.set_defaults(func=_cmd_profile)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+def scan_paths(paths: list[str]):
+    """
+    Yields the *.osu files given directly and under the given directories, without listing them up front
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for root, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.lower().endswith('.osu'):
+                    yield os.path.join(root, filename)
+
+
+def hitobject_count(beatmap: BeatmapBase) -> int:
+    return len(beatmap.hitobjects)
+
+
+def dump_record(beatmap: BeatmapBase, ticks: bool = False) -> dict:
+    """
+    Metadata record of a beatmap, plus its arrays with ``ticks``. Runs in the workers.
+    """
+    if not ticks:
+        return BeatmapIndex.beatmap_record(beatmap)
+
+    return BeatmapCorpus.beatmap_arrays(beatmap)
+
+
+def _cmd_load(args) -> int:
+    funcs = [ functools.partial(BeatmapIO.open_beatmap, fidelity=args.fidelity), hitobject_count ]
+    progress = _Progress('loaded')
+
+    errors_file = open(args.errors, 'wt', encoding='utf-8') if args.errors is not None else None
+    num_hitobjects = 0
+
+    try:
+        for filepath, count, error in imap_ordered(funcs, scan_paths(args.paths), args.workers):
+            progress.update(filepath, error)
+
+            if error is not None:
+                if errors_file is not None:
+                    errors_file.write(json.dumps({ 'path' : filepath, 'error' : str(error) }) + '\n')
+                    errors_file.flush()
+                continue
+
+            num_hitobjects += count
+    finally:
+        if errors_file is not None:
+            errors_file.close()
+
+    progress.finish()
+    print(f'{progress.done - progress.failed} loaded, {progress.failed} failed, {num_hitobjects} hitobjects in {progress.elapsed():.2f} s ({progress.rate():.1f} maps/s)')
+    return 0
+
+
+def _cmd_dump(args) -> int:
+    # Without arrays, curves and ticks are never needed
+    fidelity = Hitobject.FIDELITY_FULL if args.ticks else Hitobject.FIDELITY_NONE
+    funcs    = [ functools.partial(BeatmapIO.open_beatmap, fidelity=fidelity), functools.partial(dump_record, ticks=args.ticks) ]
+    progress = _Progress('dumped')
+
+    if args.format == 'npz':
+        os.makedirs(args.output, exist_ok=True)
+        output = open(os.path.join(args.output, 'metadata.jsonl'), 'wt', encoding='utf-8')
+    else:
+        output = open(args.output, 'wt', encoding='utf-8')
+
+    with output:
+        for filepath, result, error in imap_ordered(funcs, scan_paths(args.paths), args.workers):
+            progress.update(filepath, error)
+            if error is not None:
+                continue
+
+            record = dict(result['record'] if args.ticks else result, path=filepath)
+
+            if args.ticks:
+                arrays = { key : value for key, value in result.items() if key != 'record' }
+
+                if args.format == 'npz':
+                    # Named by content, so the same map found twice is written once
+                    record['npz'] = f'{record["md5"]}.npz'
+                    np.savez(os.path.join(args.output, record['npz']), **arrays)
+                else:
+                    record.update({ key : value.tolist() for key, value in arrays.items() })
+
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+
+    progress.finish()
+    print(f'{progress.done - progress.failed} dumped, {progress.failed} failed to "{args.output}"')
+    return 0
+
+
+def _cmd_index(args) -> int:
+    progress = _Progress('parsed')
+
+    with BeatmapIndex(args.db_path) as index:
+        counts = index.update(args.dirpath, args.workers, progress=progress.update)
+
+    progress.finish()
+    print(', '.join(f'{count} {name}' for name, count in counts.items()))
+    return 0
+
+
+def _cmd_profile(args) -> int:
+    with open(args.filepath, 'rb') as beatmap_file:
+        beatmap_data = beatmap_file.read()
+
+    # Wall time without any profiler attached
+    times = []
+    for _ in range(max(args.repeat, 1)):
+        start = time.perf_counter()
+        beatmap = BeatmapIO.parse_beatmap(io.StringIO(beatmap_data.decode('utf-8'), newline=None), fidelity=args.fidelity)
+        times.append(time.perf_counter() - start)
+
+    print(beatmap.metadata.name)
+    print(f'{len(beatmap.hitobjects)} hitobjects, {len(beatmap.timing_points)} timing points, fidelity {args.fidelity}')
+    print(f'load: best {min(times)*1000:.2f} ms, median {np.median(times)*1000:.2f} ms over {len(times)} runs')
+
+    # Per phase times, as measured under cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    BeatmapIO.parse_beatmap(io.StringIO(beatmap_data.decode('utf-8'), newline=None), fidelity=args.fidelity)
+    profiler.disable()
+
+    stats = pstats.Stats(profiler, stream=sys.stdout)
+    print('\nphases (cProfile):')
+    for phase, funcname in PROFILE_PHASES.items():
+        cumulative = sum(
+            stat[3] for (filename, _, name), stat in stats.stats.items()
+                if name == funcname and os.path.basename(filename) == 'beatmapIO.py'
+        )
+        print(f'  {phase:<12} {cumulative*1000:10.2f} ms')
+
+    print()
+    stats.sort_stats('cumulative').print_stats(args.top)
+
+    if args.pstats is not None:
+        stats.dump_stats(args.pstats)
+
+    # Allocations
+    tracemalloc.start()
+    BeatmapIO.parse_beatmap(io.StringIO(beatmap_data.decode('utf-8'), newline=None), fidelity=args.fidelity)
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'tracemalloc: peak {peak / (1 << 20):.2f} MiB')
+    for stat in snapshot.statistics('lineno')[:args.top]:
+        print(f'  {stat}')
+
+    return 0
+
+
+
+class _Progress():
+    """
+    Prints a progress line to stderr every ``PROGRESS_INTERVAL`` files and warns about failures
+    """
+
+    def __init__(self, verb: str):
+        self.verb   = verb
+        self.done   = 0
+        self.failed = 0
+        self.start  = time.perf_counter()
+
+
+    def update(self, filepath: str, error: Exception | None = None):
+        self.done += 1
+
+        if error is not None:
+            self.failed += 1
+            print(f'WARN[beatmap_reader]: failed to load "{filepath}": {error}', file=sys.stderr)
+
+        if self.done % PROGRESS_INTERVAL == 0:
+            print(f'{self.done} {self.verb}, {self.failed} failed ({self.rate():.1f} maps/s)', file=sys.stderr, flush=True)
+
+
+    def finish(self):
+        sys.stderr.flush()
+
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+
+    def rate(self) -> float:
+        elapsed = self.elapsed()
+        return self.done / elapsed if elapsed > 0 else 0.0
+
@@ -0,0 +1,187 @@
+import numpy as np
+
+from .beatmap_base import BeatmapBase
+from .gamemode import Gamemode
+from .hitobject.hitobject import Hitobject
+
+
+
+class Features():
+    """
+    Vectorized per-hitobject map features
+
+    Every feature is an array with one entry per hitobject, in hitobject order,
+    computed from ``BeatmapBase.hitobject_array`` and ``BeatmapBase.tick_array``
+    without looping over hitobjects in Python. Entries that are undefined (e.g.
+    the time delta of the first hitobject) are NaN.
+
+    ``Features.extract`` is picklable, so it can be passed as ``process`` to
+    ``BeatmapIO.open_beatmaps`` to build a library-wide feature table in
+    parallel; ``Features.summary`` reduces the result to one row per map.
+    """
+
+    DENSITY_WINDOW_MS = 1000
+
+
+    @staticmethod
+    def extract(beatmap: BeatmapBase) -> dict[str, np.ndarray]:
+        if beatmap.gamemode == Gamemode.MANIA:
+            return Features.mania(beatmap)
+
+        return Features.std(beatmap)
+
+
+    @staticmethod
+    def std(beatmap: BeatmapBase, window_ms: float = DENSITY_WINDOW_MS) -> dict[str, np.ndarray]:
+        """
+        Returns:
+            start_times    - hitobject start times
+            time_deltas    - ms since the previous hitobject started
+            distances      - osu!px from where the previous hitobject ended to where this one starts
+            angles         - radians between the previous and next hitobject, at this one, in [0, pi]
+            velocities     - distances / time_deltas
+            density        - number of hitobjects that started within the past ``window_ms``, inclusive
+            slider_travel  - osu!px travelled between this hitobject's ticks (0 for circles and spinners).
+                             Follows the ticks as loaded, so it is coarser for lower fidelity loads
+            slider_velocities - osu!px/ms of sliders; NaN for circles and spinners
+        """
+        hitobject_data = beatmap.hitobject_array()
+        # Slider ends are needed; ``FIDELITY_NONE`` sliders only have their head
+        ticks, tick_offsets = beatmap.tick_array(Hitobject.FIDELITY_ENDPOINTS)
+
+        start_times = hitobject_data[:, Hitobject.HDATA_TSRT]
+        start_pos   = hitobject_data[:, [ Hitobject.HDATA_POSX, Hitobject.HDATA_POSY ]]
+        num = len(hitobject_data)
+
+        # Where each hitobject ends is its last tick. Circles and spinners have their position as ticks.
+        tick_counts = np.diff(tick_offsets)
+        has_ticks = tick_counts > 0
+
+        end_pos = start_pos.copy()
+        end_pos[has_ticks] = ticks[tick_offsets[1:][has_ticks] - 1][:, [ Hitobject.TDATA_X, Hitobject.TDATA_Y ]]
+
+        time_deltas = np.full(num, np.nan)
+        time_deltas[1:] = np.diff(start_times)
+
+        distances = np.full(num, np.nan)
+        distances[1:] = np.linalg.norm(start_pos[1:] - end_pos[:-1], axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            velocities = distances / time_deltas
+
+        # Angle at hitobject i between the directions to i - 1 and i + 1
+        angles = np.full(num, np.nan)
+        if num >= 3:
+            a = start_pos[:-2] - start_pos[1:-1]
+            b = start_pos[2:]  - start_pos[1:-1]
+            cross = a[:, 0]*b[:, 1] - a[:, 1]*b[:, 0]
+            dot   = np.einsum('ij,ij->i', a, b)
+
+            valid = ( np.einsum('ij,ij->i', a, a) > 0 ) & ( np.einsum('ij,ij->i', b, b) > 0 )
+            angles[1:-1][valid] = np.arctan2(np.abs(cross[valid]), dot[valid])
+
+        # Distance between consecutive ticks, summed per hitobject
+        slider_travel = np.zeros(num)
+        if len(ticks) > 1:
+            tick_owner = np.repeat(np.arange(num), tick_counts)
+            same_owner = tick_owner[1:] == tick_owner[:-1]
+            tick_dists = np.linalg.norm(np.diff(ticks[:, [ Hitobject.TDATA_X, Hitobject.TDATA_Y ]], axis=0), axis=1)
+            slider_travel = np.bincount(tick_owner[1:][same_owner], weights=tick_dists[same_owner], minlength=num)
+
+        is_slider = ( hitobject_data[:, Hitobject.HDATA_TYPE].astype(np.int64) & Hitobject.SLIDER ) > 0
+        slider_travel[~is_slider] = 0
+
+        return {
+            'start_times'       : start_times,
+            'time_deltas'       : time_deltas,
+            'distances'         : distances,
+            'angles'            : angles,
+            'velocities'        : velocities,
+            'density'           : Features.density(start_times, window_ms),
+            'slider_travel'     : slider_travel,
+            'slider_velocities' : beatmap.derived.velocities,
+        }
+
+
+    @staticmethod
+    def mania(beatmap: BeatmapBase, window_ms: float = DENSITY_WINDOW_MS) -> dict[str, np.ndarray]:
+        """
+        Returns:
+            start_times    - note start times
+            columns        - note columns
+            time_deltas    - ms since the previous note started, in any column
+            column_deltas  - ms since the previous note started in the same column
+            density        - number of notes that started within the past ``window_ms``, inclusive
+            column_density - same as density, counting only notes in the same column
+            chord_sizes    - number of notes starting at the same time as this one
+            hold_durations - ms a hold note lasts; 0 for single notes
+        """
+        hitobject_data = beatmap.hitobject_array()
+        num = len(hitobject_data)
+
+        start_times = hitobject_data[:, Hitobject.HDATA_TSRT]
+        end_times   = hitobject_data[:, Hitobject.HDATA_TEND]
+        columns     = hitobject_data[:, Hitobject.HDATA_POSX].astype(np.int64)
+
+        time_deltas = np.full(num, np.nan)
+        time_deltas[1:] = np.diff(start_times)
+
+        # Sort by column, then by time, to get per-column neighbours
+        order = np.lexsort((start_times, columns))
+        sorted_times   = start_times[order]
+        sorted_columns = columns[order]
+
+        column_deltas = np.full(num, np.nan)
+        same_column = sorted_columns[1:] == sorted_columns[:-1]
+        column_deltas[order[1:][same_column]] = np.diff(sorted_times)[same_column]
+
+        # Shift each column's times apart so one searchsorted over all columns can't cross column boundaries
+        column_density = np.zeros(num, dtype=np.int64)
+        if num > 0:
+            spacing = (sorted_times.max() - sorted_times.min()) + window_ms + 1
+            shifted = sorted_times + sorted_columns*spacing
+            column_density[order] = np.arange(num) - np.searchsorted(shifted, shifted - window_ms, side='left') + 1
+
+        _, chord_idx, chord_counts = np.unique(start_times, return_inverse=True, return_counts=True)
+
+        is_hold = ( hitobject_data[:, Hitobject.HDATA_TYPE].astype(np.int64) & Hitobject.MANIALONG ) > 0
+        hold_durations = np.where(is_hold, end_times - start_times, 0)
+
+        return {
+            'start_times'    : start_times,
+            'columns'        : columns,
+            'time_deltas'    : time_deltas,
+            'column_deltas'  : column_deltas,
+            'density'        : Features.density(start_times, window_ms),
+            'column_density' : column_density,
+            'chord_sizes'    : chord_counts[chord_idx],
+            'hold_durations' : hold_durations,
+        }
+
+
+    @staticmethod
+    def density(times: np.ndarray, window_ms: float = DENSITY_WINDOW_MS) -> np.ndarray:
+        """
+        Number of times within the past ``window_ms`` of each time, inclusive. ``times`` must be sorted.
+        """
+        times = np.asarray(times)
+        return np.arange(len(times)) - np.searchsorted(times, times - window_ms, side='left') + 1
+
+
+    @staticmethod
+    def summary(features: dict[str, np.ndarray]) -> dict[str, float]:
+        """
+        Reduces per-hitobject features to one row of mean/max values, ignoring NaNs
+        """
+        row = {}
+        for name, values in features.items():
+            if name in [ 'start_times', 'columns' ]:
+                continue
+
+            values = np.asarray(values, dtype=np.float64)
+            values = values[~np.isnan(values)]
+
+            row[f'{name}_mean'] = float(np.mean(values)) if len(values) > 0 else float('nan')
+            row[f'{name}_max']  = float(np.max(values))  if len(values) > 0 else float('nan')
+
+        return row
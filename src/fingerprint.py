@@ -0,0 +1,253 @@
+import base64
+
+import numpy as np
+
+from .beatmap_base import BeatmapBase
+from .gamemode import Gamemode
+from .hitobject.hitobject import Hitobject
+
+
+
+class Fingerprint():
+    """
+    MinHash fingerprints of a beatmap's rhythm and patterns, for finding
+    re-uploads and lightly edited copies that the md5 doesn't match
+
+    Each hitobject becomes a token of its quantized time since the previous
+    hitobject, quantized position (column for osu!mania), quantized duration
+    and kind. Runs of ``SHINGLE_SIZE`` consecutive tokens are hashed into
+    shingles, and the signature keeps the minimum of ``NUM_PERMUTATIONS``
+    independent hashes over the shingles. The fraction of equal signature
+    entries between two maps estimates the Jaccard similarity of their
+    shingle sets.
+
+    Time deltas make the fingerprint independent of the map's offset; nothing
+    else about the map (metadata, timing points, difficulty) is part of it.
+    Everything is vectorized over the hitobjects.
+    """
+
+    NUM_PERMUTATIONS = 64
+    SHINGLE_SIZE     = 4
+
+    DELTA_QUANTUM_MS = 5    # Time deltas and durations are rounded to this
+    POS_QUANTUM_PX   = 32   # Positions are rounded to a grid of this size
+
+    NUM_BANDS = 16
+    """
+    LSH bands for ``FingerprintIndex``. With ``NUM_PERMUTATIONS // NUM_BANDS``
+    rows per band, maps become candidates of each other at about
+    (1/bands)^(1/rows) = 0.5 similarity.
+    """
+
+    KIND_MASK = Hitobject.CIRCLE | Hitobject.SLIDER | Hitobject.SPINNER | Hitobject.MANIALONG
+
+    __SEEDS = np.random.default_rng(0).integers(0, 2**63, NUM_PERMUTATIONS, dtype=np.uint64)
+
+    __CHUNK_SIZE = 4096
+
+    @staticmethod
+    def minhash(beatmap: BeatmapBase) -> np.ndarray:
+        """
+        Returns the ``(NUM_PERMUTATIONS,)`` uint32 signature of a beatmap
+        """
+        hitobject_data = beatmap.hitobject_array()
+        return Fingerprint.minhash_array(hitobject_data, beatmap.gamemode == Gamemode.MANIA)
+
+
+    @staticmethod
+    def minhash_array(hitobject_data: np.ndarray, is_mania: bool = False) -> np.ndarray:
+        """
+        Same as ``minhash``, from a ``BeatmapBase.hitobject_array`` (e.g. of a ``BeatmapCorpus`` entry)
+        """
+        shingles = Fingerprint.__shingles(Fingerprint.__tokens(hitobject_data, is_mania))
+        signature = np.full(Fingerprint.NUM_PERMUTATIONS, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+        # (permutations, shingles) at a time; chunked to bound memory on very long maps
+        for start in range(0, len(shingles), Fingerprint.__CHUNK_SIZE):
+            chunk  = shingles[start:start + Fingerprint.__CHUNK_SIZE]
+            hashes = Fingerprint.__mix(chunk[None, :] ^ Fingerprint.__SEEDS[:, None]) >> np.uint64(32)
+            signature = np.minimum(signature, hashes.min(axis=1).astype(np.uint32))
+
+        return signature
+
+
+    @staticmethod
+    def similarity(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+        """
+        Estimated Jaccard similarity of the shingle sets of two maps, in [0, 1]
+        """
+        return float(np.mean(signature_a == signature_b))
+
+
+    @staticmethod
+    def encode(signature: np.ndarray) -> str:
+        """
+        Signature as a short ASCII string, for SQLite and JSON records
+        """
+        return base64.b64encode(signature.astype('<u4').tobytes()).decode('ascii')
+
+
+    @staticmethod
+    def decode(text: str) -> np.ndarray:
+        return np.frombuffer(base64.b64decode(text), dtype='<u4').astype(np.uint32)
+
+
+    @staticmethod
+    def band_hashes(signatures: np.ndarray) -> np.ndarray:
+        """
+        Returns the (N, NUM_BANDS) uint64 LSH band hashes of (N, NUM_PERMUTATIONS) signatures
+        """
+        signatures = np.asarray(signatures, dtype=np.uint32).reshape(-1, Fingerprint.NUM_PERMUTATIONS)
+        bands = signatures.reshape(len(signatures), Fingerprint.NUM_BANDS, Fingerprint.NUM_PERMUTATIONS // Fingerprint.NUM_BANDS).astype(np.uint64)
+
+        hashes = np.zeros(bands.shape[:2], dtype=np.uint64)
+        for row in range(bands.shape[2]):
+            hashes = Fingerprint.__mix(hashes ^ bands[:, :, row])
+
+        # Same rows in different bands must not collide
+        return Fingerprint.__mix(hashes ^ np.arange(Fingerprint.NUM_BANDS, dtype=np.uint64))
+
+
+    @staticmethod
+    def __tokens(hitobject_data: np.ndarray, is_mania: bool) -> np.ndarray:
+        start_times = hitobject_data[:, Hitobject.HDATA_TSRT]
+        durations   = hitobject_data[:, Hitobject.HDATA_TEND] - start_times
+
+        deltas = np.diff(start_times, prepend=start_times[:1] if len(start_times) > 0 else start_times)
+        deltas = np.rint(deltas / Fingerprint.DELTA_QUANTUM_MS).clip(0, 2**20 - 1).astype(np.uint64)
+        durations = np.rint(durations / Fingerprint.DELTA_QUANTUM_MS).clip(0, 2**20 - 1).astype(np.uint64)
+
+        if is_mania:
+            pos_x = hitobject_data[:, Hitobject.HDATA_POSX].clip(0, 255).astype(np.uint64)
+            pos_y = np.zeros(len(hitobject_data), dtype=np.uint64)
+        else:
+            pos_x = np.floor(hitobject_data[:, Hitobject.HDATA_POSX] / Fingerprint.POS_QUANTUM_PX).clip(0, 255).astype(np.uint64)
+            pos_y = np.floor(hitobject_data[:, Hitobject.HDATA_POSY] / Fingerprint.POS_QUANTUM_PX).clip(0, 255).astype(np.uint64)
+
+        kinds = hitobject_data[:, Hitobject.HDATA_TYPE].astype(np.uint64) & np.uint64(Fingerprint.KIND_MASK)
+
+        # Fields packed into disjoint bits; kind 8 bits, y and x 8 bits each, duration and delta 20 bits each
+        return (
+            kinds | ( pos_y << np.uint64(8) ) | ( pos_x << np.uint64(16) ) |
+            ( durations << np.uint64(24) ) | ( deltas << np.uint64(44) )
+        )
+
+
+    @staticmethod
+    def __shingles(tokens: np.ndarray) -> np.ndarray:
+        size = min(Fingerprint.SHINGLE_SIZE, len(tokens))
+        if size == 0:
+            return np.zeros(0, dtype=np.uint64)
+
+        shingles = np.zeros(len(tokens) - size + 1, dtype=np.uint64)
+        for offset in range(size):
+            shingles = Fingerprint.__mix(shingles ^ tokens[offset:offset + len(shingles)])
+
+        return shingles
+
+
+    @staticmethod
+    def __mix(x: np.ndarray) -> np.ndarray:
+        # splitmix64 finalizer; uint64 array arithmetic wraps around
+        x = ( x ^ ( x >> np.uint64(30) ) ) * np.uint64(0xbf58476d1ce4e5b9)
+        x = ( x ^ ( x >> np.uint64(27) ) ) * np.uint64(0x94d049bb133111eb)
+        return x ^ ( x >> np.uint64(31) )
+
+
+
+class FingerprintIndex():
+    """
+    Locality-sensitive hashing index over ``Fingerprint`` signatures
+
+    Signatures are split into ``Fingerprint.NUM_BANDS`` bands; maps sharing
+    any band hash are candidates, and only candidates are compared in full.
+    Each band is kept as a sorted array of hashes, so a query is
+    ``NUM_BANDS`` binary searches plus the candidate comparisons instead of a
+    scan over every map.
+
+    Usage:
+        index = FingerprintIndex()
+        index.add_many(paths, signatures)
+        index.query(Fingerprint.minhash(beatmap), threshold=0.7)
+    """
+
+    def __init__(self):
+        self.__keys: list = []
+        self.__pending: list[np.ndarray] = []
+
+        self.__signatures = np.zeros((0, Fingerprint.NUM_PERMUTATIONS), dtype=np.uint32)
+        self.__band_hashes = None   # Per band, sorted hashes
+        self.__band_order  = None   # Per band, entry index of each sorted hash
+
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+
+    def add(self, key, signature: np.ndarray):
+        """
+        Args:
+            key: anything identifying the map, e.g. its filepath
+            signature: ``Fingerprint.minhash`` of the map
+        """
+        self.__keys.append(key)
+        self.__pending.append(np.asarray(signature, dtype=np.uint32).reshape(1, -1))
+        self.__band_hashes = None
+
+
+    def add_many(self, keys, signatures):
+        keys = list(keys)
+        signatures = np.asarray(signatures, dtype=np.uint32).reshape(len(keys), Fingerprint.NUM_PERMUTATIONS)
+
+        self.__keys.extend(keys)
+        self.__pending.append(signatures)
+        self.__band_hashes = None
+
+
+    def query(self, signature: np.ndarray, threshold: float = 0.5, limit: int | None = None) -> list[tuple[object, float]]:
+        """
+        Finds maps similar to the one with the given signature
+
+        Args:
+            signature: ``Fingerprint.minhash`` of the map to look up
+            threshold: (float) min estimated similarity of the results
+            limit: (int) max number of results
+
+        Returns:
+            (key, similarity) pairs, most similar first
+        """
+        if len(self) == 0:
+            return []
+
+        self.__build()
+
+        query_hashes = Fingerprint.band_hashes(signature)[0]
+        candidates   = []
+
+        for band, band_hash in enumerate(query_hashes):
+            lo = np.searchsorted(self.__band_hashes[band], band_hash, side='left')
+            hi = np.searchsorted(self.__band_hashes[band], band_hash, side='right')
+            candidates.append(self.__band_order[band][lo:hi])
+
+        candidates = np.unique(np.concatenate(candidates))
+        similarity = np.mean(self.__signatures[candidates] == np.asarray(signature, dtype=np.uint32)[None, :], axis=1)
+
+        keep  = similarity >= threshold
+        order = np.argsort(-similarity[keep], kind='stable')
+        if limit is not None:
+            order = order[:limit]
+
+        return [ (self.__keys[i], float(s)) for i, s in zip(candidates[keep][order].tolist(), similarity[keep][order].tolist()) ]
+
+
+    def __build(self):
+        if len(self.__pending) > 0:
+            self.__signatures = np.concatenate([ self.__signatures ] + self.__pending)
+            self.__pending = []
+
+        if self.__band_hashes is not None:
+            return
+
+        hashes = Fingerprint.band_hashes(self.__signatures)
+        self.__band_order  = [ np.argsort(hashes[:, band], kind='stable') for band in range(Fingerprint.NUM_BANDS) ]
+        self.__band_hashes = [ hashes[order, band] for band, order in enumerate(self.__band_order) ]
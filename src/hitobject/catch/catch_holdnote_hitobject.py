@@ -0,0 +1,83 @@
+import numpy as np
+
+from ..hitobject import Hitobject
+from ..std.std_holdnote_hitobject_base import StdHoldNoteHitobjectBase
+
+
+
+class CatchHoldNoteHitobject(StdHoldNoteHitobjectBase):
+    """
+    osu!catch juice stream
+
+    The path and ticks are generated by the osu!std slider code. Ticks then
+    become the juice stream's nested objects: fruits at the head, repeats and
+    tail, droplets at slider ticks, and tiny droplets filling the gaps between
+    them. ``tick_types`` holds the kind of each tick.
+    """
+
+    FRUIT        = 0
+    DROPLET      = 1
+    TINY_DROPLET = 2
+
+    TINY_DROPLET_MIN_GAP_MS  = 80    # Gaps this short or shorter get no tiny droplets
+    TINY_DROPLET_INTERVAL_MS = 100   # Gaps are halved until tiny droplets are at most this far apart
+
+    def __init__(self, **kargs):
+        StdHoldNoteHitobjectBase.__init__(self, **kargs)
+        self.hitsound   = kargs['hitsound']
+        self.tick_types = np.zeros(0, dtype=np.int8)
+
+
+    def make_tick_data(self, **kargs) -> dict:
+        generated = StdHoldNoteHitobjectBase.make_tick_data(self, **kargs)
+        gen_points, length_sums = generated['gen_points'], generated['length_sums']
+
+        if self.end_time() == self.start_time() or len(gen_points) == 0 or generated['fidelity'] != Hitobject.FIDELITY_FULL:
+            tdata = np.asarray(generated['tdata'], dtype=np.float64).reshape(-1, 3)
+            return dict(generated, tdata=tdata, tick_types=np.full(len(tdata), CatchHoldNoteHitobject.FRUIT, dtype=np.int8))
+
+        # Head, ticks, repeats, then the osu!std sliderend judgement tick. That last one is not
+        # a nested object in osu!catch, but the game still spaces tiny droplets using it.
+        events = np.asarray(generated['tdata'], dtype=np.float64)
+        events = np.concatenate((events, np.column_stack((self.__times_to_pos(gen_points, length_sums, np.asarray([ self.end_time() ])), [ self.end_time() ]))))
+        times  = events[:, Hitobject.TDATA_T]
+
+        span = (self.end_time() - self.start_time()) / self.repeats
+        spans = (times - self.start_time()) / span
+
+        types = np.full(len(events), CatchHoldNoteHitobject.DROPLET, dtype=np.int8)
+        types[np.abs(spans - np.round(spans)) < 1e-9] = CatchHoldNoteHitobject.FRUIT
+        types[-1] = CatchHoldNoteHitobject.FRUIT
+
+        # Tiny droplets; every gap longer than the minimum is halved until its pieces are short enough
+        gaps = np.diff(np.floor(times))
+        halvings = np.ceil(np.log2(np.maximum(gaps / CatchHoldNoteHitobject.TINY_DROPLET_INTERVAL_MS, 1)))
+        counts = np.where(gaps > CatchHoldNoteHitobject.TINY_DROPLET_MIN_GAP_MS, 2**halvings - 1, 0).astype(np.int64)
+
+        gap_idx = np.repeat(np.arange(len(gaps)), counts)
+        piece   = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+        tiny_times = times[gap_idx] + piece * gaps[gap_idx] / (counts[gap_idx] + 1)
+
+        tiny = np.column_stack((self.__times_to_pos(gen_points, length_sums, tiny_times), tiny_times))
+
+        # Drop the sliderend judgement tick and merge everything in time order
+        keep = np.ones(len(events), dtype=bool)
+        keep[-2] = False
+
+        ticks = np.concatenate((events[keep], tiny))
+        types = np.concatenate((types[keep], np.full(len(tiny), CatchHoldNoteHitobject.TINY_DROPLET, dtype=np.int8)))
+
+        order = np.argsort(ticks[:, Hitobject.TDATA_T], kind='stable')
+        return dict(generated, tdata=ticks[order], tick_types=types[order])
+
+
+    def __times_to_pos(self, gen_points, length_sums, times: np.ndarray) -> np.ndarray:
+        # Vectorized time_to_pos; linear interpolation along the generated path
+        percent  = (times - self.start_time()) / (self.end_time() - self.start_time())
+        distance = self.px_len * np.abs(np.fmod(self.repeats * percent + 1, 2) - 1)
+
+        gen_points = np.asarray(gen_points, dtype=np.float64)
+        return np.column_stack((
+            np.interp(distance, length_sums, gen_points[:, 0]),
+            np.interp(distance, length_sums, gen_points[:, 1]),
+        ))
@@ -0,0 +1,12 @@
+from ..std.std_singlenote_hitobject_base import StdSingleNoteHitobjectBase
+
+
+
+class CatchSingleNoteHitobject(StdSingleNoteHitobjectBase):
+    """
+    osu!catch fruit
+    """
+
+    def __init__(self, **kargs):
+        StdSingleNoteHitobjectBase.__init__(self, **kargs)
+        self.hitsound = kargs['hitsound']
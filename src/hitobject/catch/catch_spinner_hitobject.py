@@ -0,0 +1,39 @@
+import numpy as np
+
+from ..std.std_spinner_hitobject_base import StdSpinnerHitobjectBase
+
+
+
+class CatchSpinnerHitobject(StdSpinnerHitobjectBase):
+    """
+    osu!catch banana shower. Ticks are the bananas.
+
+    The game scatters bananas horizontally with a seeded random generator
+    while processing the whole beatmap; here they all keep the spinner's position.
+    """
+
+    BANANA_INTERVAL_MS = 100   # The duration is halved until bananas are at most this far apart
+
+    def __init__(self, **kargs):
+        StdSpinnerHitobjectBase.__init__(self, **kargs)
+        self.hitsound = kargs['hitsound']
+
+
+    def generate_tick_data(self, **kargs):
+        duration = self.end_time() - self.start_time()
+
+        spacing = duration
+        while spacing > CatchSpinnerHitobject.BANANA_INTERVAL_MS:
+            spacing /= 2
+
+        # Zero length banana showers have no bananas, same as the game
+        if spacing <= 0:
+            banana_times = np.zeros(0, dtype=np.float64)
+        else:
+            banana_times = self.start_time() + np.arange(int(duration // spacing) + 1) * spacing
+
+        self.tdata = np.column_stack((
+            np.full(len(banana_times), self.pos_x(), dtype=np.float64),
+            np.full(len(banana_times), self.pos_y(), dtype=np.float64),
+            banana_times
+        ))
@@ -21,6 +21,12 @@ class Hitobject(IHitobject):
     TDATA_Y = 1      # Tick y positon
     TDATA_T = 2      # Tick time
 
+    FIDELITY_NONE      = 'none'        # No curve; only the end time is computed. Ticks are just the head
+    FIDELITY_ENDPOINTS = 'endpoints'   # Curve, but ticks are just the head, repeats and end (see ``StdHoldNoteHitobjectBase.END_TICK_OFFSET_MS``)
+    FIDELITY_FULL      = 'full'        # Curve and all ticks
+
+    FIDELITIES = [ FIDELITY_NONE, FIDELITY_ENDPOINTS, FIDELITY_FULL ]   # Lowest to highest
+
     def __init__(self, **kargs):
         # Basic details every hitobject has, indexed by HDATA
         self.hdata: list[int | None] = [ None, None, None, None, None ]
@@ -54,7 +60,7 @@ class Hitobject(IHitobject):
 
 
     def __repr__(self) -> str:
-        return str(self.tick_data())
+        return str(self.tick_data(Hitobject.FIDELITY_NONE))
 
 
     def pos_x(self) -> int:
@@ -89,7 +95,8 @@ class Hitobject(IHitobject):
         return ret
 
 
-    def tick_data(self) -> np.ndarray:
+    def tick_data(self, fidelity: str | None = None) -> np.ndarray:
+        # Only sliders are ever generated at a lower fidelity
         return np.asarray(self.tdata)
 
 
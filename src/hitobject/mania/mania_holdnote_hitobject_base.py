@@ -1,7 +1,4 @@
-import math
-
 from ..hitobject import Hitobject
-from ...beatmap_base import BeatmapBase
 
 
 class ManiaHoldNoteHitobjectBase(Hitobject):
@@ -11,9 +8,6 @@ class ManiaHoldNoteHitobjectBase(Hitobject):
 
         slider_data = kargs['sdata'].split(':')
         self.hdata[Hitobject.HDATA_TEND] = int(slider_data[0])
-        
-        ratio = kargs['keys'] / BeatmapBase.PLAYFIELD_WIDTH   # columns per osu!px
-        self.hdata[Hitobject.HDATA_POSX] = min(math.floor(ratio*self.pos_x()), kargs['keys'] - 1)
 
 
     def generate_tick_data(self, **kargs):
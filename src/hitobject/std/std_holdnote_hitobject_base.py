@@ -1,4 +1,6 @@
 import math
+import threading
+
 import numpy as np
 
 from ...utils.bezier import Bezier
@@ -30,6 +32,10 @@ class StdHoldNoteHitobjectBase(Hitobject):
     The tick for sliderend judgement is offset backwards in time by this amount
     unless the slider is particularly short.
 
+    Only ``FIDELITY_FULL`` ticks end with this judgement tick. ``FIDELITY_ENDPOINTS``
+    ticks end with where the slider is at its end time instead, which is what
+    stacking and features need, so the last tick of a slider differs between the two.
+
     Value: https://github.com/ppy/osu/blob/ed992eed64b30209381f040586b0e8392d1c168e/osu.Game/Rulesets/Objects/Legacy/ConvertSlider.cs#L52
     Usage: https://github.com/ppy/osu/blob/ed992eed64b30209381f040586b0e8392d1c168e/osu.Game/Rulesets/Objects/SliderEventGenerator.cs#L79
     """
@@ -50,57 +56,279 @@ class StdHoldNoteHitobjectBase(Hitobject):
         self.repeats      = kargs['repeats']
         self.curve_type   = curve_type
         self.curve_points = curve_points  # Points that define slider in editor
-        
+
+        # How much of the curve and ticks were generated, and with what, so they can be completed later
+        self.fidelity  = Hitobject.FIDELITY_FULL
+        self.tick_args = None
+
+        # (slider, rate, flip height) this slider is a modded copy of, see ``BeatmapBase.apply_mods``.
+        # A copy upgrades by transforming its source's data instead of generating its own.
+        self.tick_source = None
+
+        self.__lock = threading.Lock()
+
+
+    def __getstate__(self):
+        # Locks can't be pickled or shared with copies; each gets its own
+        state = self.__dict__.copy()
+        del state['_StdHoldNoteHitobjectBase__lock']
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
 
     def generate_tick_data(self, **kargs):
+        """
+        Args:
+            end_time: (float) slider end time
+            velocity: (float) osu!px/ms
+            beat_length: (float) ms per beat
+            tick_rate: (float) ticks per beat
+            fidelity: (str) one of ``Hitobject.FIDELITY_*``. Defaults to full. The rest can be
+                generated later with ``upgrade``
+        """
         self.hdata[Hitobject.HDATA_TEND] = kargs['end_time']
-        if self.end_time() == self.start_time():
-            pos = self.hdata[Hitobject.HDATA_POSX], self.hdata[Hitobject.HDATA_POSY]
-            self.tdata.append([ *pos, self.start_time() ])
-            return
+        self.tick_args = kargs
+        self.__set_generated(self.make_tick_data(**kargs))
+
+
+    def make_tick_data(self, **kargs) -> dict:
+        """
+        Generates the curve and ticks without modifying the slider. Its end time must already be set.
+
+        Args:
+            see ``generate_tick_data``
+
+        Returns:
+            attribute name -> value to set, 'gen_points', 'length_sums', 'tdata' and 'fidelity'
+        """
+        fidelity = kargs.get('fidelity', Hitobject.FIDELITY_FULL)
+        start_time, end_time = self.start_time(), self.end_time()
+        head = [ self.hdata[Hitobject.HDATA_POSX], self.hdata[Hitobject.HDATA_POSY], start_time ]
+
+        if end_time == start_time:
+            return dict(gen_points=[], length_sums=[], tdata=[ head ], fidelity=Hitobject.FIDELITY_FULL)
+
+        if fidelity == Hitobject.FIDELITY_NONE:
+            return dict(gen_points=[], length_sums=[], tdata=[ head ], fidelity=fidelity)
 
         # The rough generated slider curve
-        self.gen_points = StdHoldNoteHitobjectBase.__process_curve_points(self.curve_type, self.curve_points, self.px_len)
-        self.length_sums = StdHoldNoteHitobjectBase.__get_length_sums(self.gen_points)
-        self.__process_curve_length()
+        gen_points  = StdHoldNoteHitobjectBase.__process_curve_points(self.curve_type, self.curve_points, self.px_len)
+        length_sums = StdHoldNoteHitobjectBase.__get_length_sums(gen_points)
+        gen_points, length_sums = StdHoldNoteHitobjectBase.__process_curve_length(gen_points, length_sums, self.curve_points, self.px_len)
+
+        def time_to_pos(time):
+            return StdHoldNoteHitobjectBase.__dist_to_pos(gen_points, length_sums, self.__time_to_dist(time))
+
+        tdata = []
 
         velocity = kargs['velocity']
         ms_per_beat = kargs['beat_length'] / kargs['tick_rate']
         ms_per_repeat = self.px_len / velocity
 
-        tick_times = list(frange(self.start_time() + ms_per_beat, self.start_time() + ms_per_repeat, ms_per_beat))
+        if fidelity == Hitobject.FIDELITY_ENDPOINTS:
+            for repeat in range(self.repeats):
+                x_pos, y_pos = gen_points[-1] if repeat % 2 == 1 else gen_points[0]
+                tdata.append([ x_pos, y_pos, start_time + repeat * ms_per_repeat ])
+
+            x_pos, y_pos = time_to_pos(end_time)
+            tdata.append([ x_pos, y_pos, end_time ])
+            return dict(gen_points=gen_points, length_sums=length_sums, tdata=tdata, fidelity=fidelity)
+
+        tick_times = list(frange(start_time + ms_per_beat, start_time + ms_per_repeat, ms_per_beat))
         cutoff_dist = self.px_len - StdHoldNoteHitobjectBase.TICK_CUTOFF_MS * velocity
 
         while len(tick_times) > 0 and self.__time_to_dist(tick_times[-1]) > cutoff_dist:
             tick_times.pop()
 
-        ticks = [ (self.time_to_pos(tick_time), tick_time - self.start_time()) for tick_time in tick_times ]
+        ticks = [ (time_to_pos(tick_time), tick_time - start_time) for tick_time in tick_times ]
 
         # https://github.com/ppy/osu/blob/ed992eed64b30209381f040586b0e8392d1c168e/osu.Game/Rulesets/Objects/SliderEventGenerator.cs#L118-L137
         for repeat in range(self.repeats):
             is_reverse = repeat % 2 == 1
 
-            repeat_start_time = self.start_time() + repeat * ms_per_repeat
-            x_pos, y_pos = self.gen_points[-1] if is_reverse else self.gen_points[0]
-            self.tdata.append([ x_pos, y_pos, repeat_start_time ])
+            repeat_start_time = start_time + repeat * ms_per_repeat
+            x_pos, y_pos = gen_points[-1] if is_reverse else gen_points[0]
+            tdata.append([ x_pos, y_pos, repeat_start_time ])
 
             if is_reverse:
-                self.tdata.extend([ *pos, repeat_start_time + (ms_per_repeat - time) ] for pos, time in reversed(ticks))
+                tdata.extend([ *pos, repeat_start_time + (ms_per_repeat - time) ] for pos, time in reversed(ticks))
             else:
-                self.tdata.extend([ *pos, repeat_start_time + time ] for pos, time in ticks)
+                tdata.extend([ *pos, repeat_start_time + time ] for pos, time in ticks)
 
-        midpoint_time = (self.start_time() + self.end_time()) / 2
+        midpoint_time = (start_time + end_time) / 2
         end_tick_time = max(
-            self.end_time() - StdHoldNoteHitobjectBase.END_TICK_OFFSET_MS,
+            end_time - StdHoldNoteHitobjectBase.END_TICK_OFFSET_MS,
             midpoint_time
         )
 
-        x_pos, y_pos = self.time_to_pos(end_tick_time)
-        self.tdata.append([ x_pos, y_pos, end_tick_time ])
+        x_pos, y_pos = time_to_pos(end_tick_time)
+        tdata.append([ x_pos, y_pos, end_tick_time ])
+        return dict(gen_points=gen_points, length_sums=length_sums, tdata=tdata, fidelity=fidelity)
+
+
+    def tick_data(self, fidelity: str | None = None) -> np.ndarray:
+        """
+        Args:
+            fidelity: (str) lowest ``Hitobject.FIDELITY_*`` needed; the slider is upgraded to it first
+                if it was loaded at a lower one. Defaults to full. ``FIDELITY_NONE`` returns the ticks
+                as they were loaded.
+        """
+        self.upgrade(Hitobject.FIDELITY_FULL if fidelity is None else fidelity)
+
+        return np.asarray(self.tdata)
 
 
     def time_to_pos(self, time):
-        return self.__dist_to_pos(self.__time_to_dist(time))
+        if self.fidelity == Hitobject.FIDELITY_NONE:
+            self.upgrade(Hitobject.FIDELITY_ENDPOINTS)
+
+        return StdHoldNoteHitobjectBase.__dist_to_pos(self.gen_points, self.length_sums, self.__time_to_dist(time))
+
+
+    def upgrade(self, fidelity: str = Hitobject.FIDELITY_FULL):
+        """
+        Generates the curve and ticks up to ``fidelity`` if they were generated at a lower one
+
+        Safe to call from several threads and on sliders shared between beatmap copies: the
+        new data is generated aside and swapped in under the slider's lock, fidelity last, so
+        readers see either the old or the new data, never a mix.
+        """
+        if not self.__below(fidelity):
+            return
+
+        with self.__lock:
+            if not self.__below(fidelity):
+                return
+
+            if self.tick_source is not None:
+                self.__set_generated(self.__transform_source(fidelity))
+            else:
+                self.__set_generated(self.make_tick_data(**dict(self.tick_args, fidelity=fidelity)))
+
+
+    def __below(self, fidelity: str) -> bool:
+        if self.tick_args is None and self.tick_source is None:
+            return False
+
+        return Hitobject.FIDELITIES.index(self.fidelity) < Hitobject.FIDELITIES.index(fidelity)
+
+
+    def __set_generated(self, generated: dict):
+        generated = dict(generated)
+        fidelity  = generated.pop('fidelity')
+
+        for attr, value in generated.items():
+            setattr(self, attr, value)
+
+        self.fidelity = fidelity
+
+
+    def __transform_source(self, fidelity: str) -> dict:
+        # Same transform ``BeatmapBase.apply_mods`` applies to already generated data
+        source, rate, flip_height = self.tick_source
+        source.upgrade(fidelity)
+
+        tdata = np.array(source.tick_data(fidelity), dtype=np.float64).reshape(-1, 3)
+        gen_points = np.array(source.gen_points, dtype=np.float64).reshape(-1, 2)
+
+        tdata[:, Hitobject.TDATA_T] /= rate
+
+        if flip_height is not None:
+            tdata[:, Hitobject.TDATA_Y] = flip_height - tdata[:, Hitobject.TDATA_Y]
+            gen_points[:, 1] = flip_height - gen_points[:, 1]
+
+        generated = dict(gen_points=gen_points, length_sums=source.length_sums, tdata=tdata, fidelity=source.fidelity)
+        if hasattr(source, 'tick_types'):
+            generated['tick_types'] = source.tick_types
+
+        return generated
+
+
+    def resample_path(self, spacing_px: float | None = None, num_points: int | None = None) -> np.ndarray:
+        """
+        Returns the slider path as points evenly spaced along its length. Unlike ``gen_points``,
+        the spacing doesn't depend on the curve type.
+
+        Args:
+            spacing_px: (float) distance along the path between consecutive points. The last
+                point is the end of the path, so the last spacing may be shorter
+            num_points: (int) number of points including both ends, >= 2. Give this or ``spacing_px``
+
+        Returns:
+            (N, 2) array of positions
+        """
+        points, _ = StdHoldNoteHitobjectBase.resample_paths([ self ], spacing_px, num_points)
+        return points
+
+
+    @staticmethod
+    def resample_paths(sliders: list["StdHoldNoteHitobjectBase"], spacing_px: float | None = None, num_points: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        ``resample_path`` of many sliders at once. The paths are laid end to end along one
+        distance axis, so a single ``np.interp`` per axis over their ``length_sums`` resamples all of them.
+
+        Returns:
+            (points, offsets) - (N, 2) points of all the sliders concatenated, and offsets such
+            that ``points[offsets[i]:offsets[i + 1]]`` are the points of slider i
+        """
+        if ( spacing_px is None ) == ( num_points is None ):
+            raise ValueError('Either spacing_px or num_points must be given')
+
+        if spacing_px is not None and spacing_px <= 0:
+            raise ValueError(f'Invalid spacing   spacing_px = {spacing_px}')
+
+        if num_points is not None and num_points < 2:
+            raise ValueError(f'Invalid number of points   num_points = {num_points}')
+
+        length_sums = []
+        gen_points  = []
+
+        for slider in sliders:
+            slider.upgrade(Hitobject.FIDELITY_ENDPOINTS)
+
+            # Zero length sliders have no curve; their path is just their position
+            if len(slider.length_sums) == 0:
+                length_sums.append(np.zeros(1))
+                gen_points.append(np.asarray([ [ slider.hdata[Hitobject.HDATA_POSX], slider.hdata[Hitobject.HDATA_POSY] ] ], dtype=np.float64))
+                continue
+
+            length_sums.append(np.asarray(slider.length_sums, dtype=np.float64))
+            gen_points.append(np.asarray(slider.gen_points, dtype=np.float64).reshape(-1, 2))
+
+        offsets = np.zeros(len(sliders) + 1, dtype=np.int64)
+        if len(sliders) == 0:
+            return np.zeros((0, 2)), offsets
+
+        lengths = np.asarray([ sums[-1] for sums in length_sums ])
+
+        if spacing_px is not None:
+            # A last spacing shorter than the precision threshold would just repeat the end point
+            counts = np.ceil(np.maximum(lengths - StdHoldNoteHitobjectBase.PRECISION_THRESHOLD_PX, 0) / spacing_px).astype(np.int64) + 1
+            steps  = np.full(len(sliders), float(spacing_px))
+        else:
+            counts = np.full(len(sliders), num_points, dtype=np.int64)
+            steps  = lengths / (num_points - 1)
+
+        offsets[1:] = np.cumsum(counts)
+        slider_idx  = np.repeat(np.arange(len(sliders)), counts)
+
+        distances = ( np.arange(offsets[-1]) - offsets[slider_idx] ) * steps[slider_idx]
+        distances[offsets[1:] - 1] = lengths
+
+        # Each path starts 1 px after the previous one ends, so no interpolation crosses paths
+        bases = np.zeros(len(sliders))
+        bases[1:] = np.cumsum(lengths[:-1] + 1)
+
+        xp = np.concatenate([ sums + base for sums, base in zip(length_sums, bases) ])
+        fp = np.concatenate(gen_points)
+        x  = distances + bases[slider_idx]
+
+        points = np.stack((np.interp(x, xp, fp[:, 0]), np.interp(x, xp, fp[:, 1])), axis=1)
+        return points, offsets
 
 
     def __time_to_dist(self, time):
@@ -109,21 +337,22 @@ class StdHoldNoteHitobjectBase(Hitobject):
         return self.px_len * abs(math.fmod(self.repeats * percent + 1, 2) - 1)
 
 
-    def __dist_to_pos(self, distance):
-        idx = binary_search(self.length_sums, distance)
+    @staticmethod
+    def __dist_to_pos(gen_points, length_sums, distance):
+        idx = binary_search(length_sums, distance)
 
         if idx == 0:
-            return self.gen_points[0]
+            return gen_points[0]
             
-        if idx == len(self.gen_points):
-            return self.gen_points[-1]
+        if idx == len(gen_points):
+            return gen_points[-1]
 
         # avoid division by zero
-        if abs(self.length_sums[idx] - self.length_sums[idx - 1]) < StdHoldNoteHitobjectBase.PRECISION_THRESHOLD_PX:
-            return self.gen_points[idx]
+        if abs(length_sums[idx] - length_sums[idx - 1]) < StdHoldNoteHitobjectBase.PRECISION_THRESHOLD_PX:
+            return gen_points[idx]
 
-        portion = value_to_percent(self.length_sums[idx - 1], self.length_sums[idx], distance)
-        return list(map(lerp, self.gen_points[idx - 1], self.gen_points[idx], [ portion, portion ]))
+        portion = value_to_percent(length_sums[idx - 1], length_sums[idx], distance)
+        return list(map(lerp, gen_points[idx - 1], gen_points[idx], [ portion, portion ]))
 
 
     def __process_slider_data(self, sdata):
@@ -167,34 +396,37 @@ class StdHoldNoteHitobjectBase(Hitobject):
         return np.concatenate(([ 0 ], length_sums))
 
 
-    def __process_curve_length(self):
+    @staticmethod
+    def __process_curve_length(gen_points, length_sums, curve_points, px_len):
         """
         Truncates and extends the curve to match the given length, and updates
         the length sums correspondingly.
         """
         # https://github.com/ppy/osu/blob/ed992eed64b30209381f040586b0e8392d1c168e/osu.Game/Rulesets/Objects/SliderPath.cs#L295-L303
-        while self.length_sums[-1] > self.px_len:
-            self.length_sums = self.length_sums[:-1]
-            self.gen_points = self.gen_points[:-1]
+        while length_sums[-1] > px_len:
+            length_sums = length_sums[:-1]
+            gen_points = gen_points[:-1]
 
         # https://github.com/ppy/osu/blob/ed992eed64b30209381f040586b0e8392d1c168e/osu.Game/Rulesets/Objects/SliderPath.cs#L284
-        extend = len(self.curve_points) >= 2 and self.curve_points[-1] != self.curve_points[-2]
+        extend = len(curve_points) >= 2 and curve_points[-1] != curve_points[-2]
         
         # https://github.com/ppy/osu/blob/ed992eed64b30209381f040586b0e8392d1c168e/osu.Game/Rulesets/Objects/SliderPath.cs#L314-L317
-        if extend and len(self.gen_points) >= 2 and self.length_sums[-1] < self.px_len:
+        if extend and len(gen_points) >= 2 and length_sums[-1] < px_len:
             i = 2
             
             # our curve generation can output repeated points, skip them
-            while self.length_sums[-1] - self.length_sums[-i] < StdHoldNoteHitobjectBase.PRECISION_THRESHOLD_PX:
-                if i == len(self.gen_points):
+            while length_sums[-1] - length_sums[-i] < StdHoldNoteHitobjectBase.PRECISION_THRESHOLD_PX:
+                if i == len(gen_points):
                     print('WARN[beatmap_reader]: slider extension failed (too short)')
-                    return
+                    return gen_points, length_sums
 
                 i += 1
             
-            ratio = (self.px_len - self.length_sums[-i]) / (self.length_sums[-1] - self.length_sums[-i])
-            self.gen_points[-1] = list(map(lerp, self.gen_points[-i], self.gen_points[-1], [ ratio, ratio ]))
-            self.length_sums[-1] = self.px_len
+            ratio = (px_len - length_sums[-i]) / (length_sums[-1] - length_sums[-i])
+            gen_points[-1] = list(map(lerp, gen_points[-i], gen_points[-1], [ ratio, ratio ]))
+            length_sums[-1] = px_len
+
+        return gen_points, length_sums
 
 
     @staticmethod
@@ -0,0 +1,47 @@
+import numpy as np
+
+from ..hitobject import Hitobject
+from ..std.std_holdnote_hitobject_base import StdHoldNoteHitobjectBase
+from .taiko_singlenote_hitobject import TaikoSingleNoteHitobject
+
+
+
+class TaikoHoldNoteHitobject(StdHoldNoteHitobjectBase):
+    """
+    osu!taiko drumroll
+
+    Lasts as long as the slider it is read from would, but has no path; no
+    curve is generated. Ticks are the drumroll's hits.
+    """
+
+    TICK_RATE = 4
+    """
+    Drumroll hits per beat; 3 if the map's slider tick rate is 3, same as the game.
+    """
+
+    def __init__(self, **kargs):
+        StdHoldNoteHitobjectBase.__init__(self, **kargs)
+        self.hitsound = kargs['hitsound']
+
+
+    def is_big(self) -> bool:
+        return ( self.hitsound & TaikoSingleNoteHitobject.FINISH ) > 0
+
+
+    def generate_tick_data(self, **kargs):
+        self.hdata[Hitobject.HDATA_TEND] = kargs['end_time']
+
+        # Spaced by the uninherited beat length; slider velocity changes don't affect it
+        tick_rate = 3 if kargs['tick_rate'] == 3 else TaikoHoldNoteHitobject.TICK_RATE
+        spacing   = kargs['beat_length'] / tick_rate
+
+        if spacing <= 0 or self.end_time() == self.start_time():
+            tick_times = np.asarray([ self.start_time() ], dtype=np.float64)
+        else:
+            tick_times = np.arange(self.start_time(), self.end_time() + spacing/2, spacing)
+
+        self.tdata = np.column_stack((
+            np.full(len(tick_times), self.pos_x(), dtype=np.float64),
+            np.full(len(tick_times), self.pos_y(), dtype=np.float64),
+            tick_times
+        ))
@@ -0,0 +1,29 @@
+from ..std.std_singlenote_hitobject_base import StdSingleNoteHitobjectBase
+
+
+
+class TaikoSingleNoteHitobject(StdSingleNoteHitobjectBase):
+    """
+    osu!taiko hit. Whether it is a don or a kat, and whether it is big, is
+    encoded in its hitsound.
+    """
+
+    WHISTLE = 1 << 1
+    FINISH  = 1 << 2
+    CLAP    = 1 << 3
+
+    def __init__(self, **kargs):
+        StdSingleNoteHitobjectBase.__init__(self, **kargs)
+        self.hitsound = kargs['hitsound']
+
+
+    def is_kat(self) -> bool:
+        return ( self.hitsound & (TaikoSingleNoteHitobject.WHISTLE | TaikoSingleNoteHitobject.CLAP) ) > 0
+
+
+    def is_don(self) -> bool:
+        return not self.is_kat()
+
+
+    def is_big(self) -> bool:
+        return ( self.hitsound & TaikoSingleNoteHitobject.FINISH ) > 0
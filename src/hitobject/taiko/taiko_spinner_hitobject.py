@@ -0,0 +1,12 @@
+from ..std.std_spinner_hitobject_base import StdSpinnerHitobjectBase
+
+
+
+class TaikoSpinnerHitobject(StdSpinnerHitobjectBase):
+    """
+    osu!taiko swell
+    """
+
+    def __init__(self, **kargs):
+        StdSpinnerHitobjectBase.__init__(self, **kargs)
+        self.hitsound = kargs['hitsound']
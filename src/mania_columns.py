@@ -0,0 +1,155 @@
+import numpy as np
+
+from .hitobject.hitobject import Hitobject
+
+
+
+class ManiaColumns():
+    """
+    Column-partitioned arrays of an osu!mania beatmap's notes
+
+    Notes are sorted by column, then by start time, into flat arrays; the
+    notes of column k are ``[offsets[k]:offsets[k + 1]]``. Every per-column
+    query is a ``np.searchsorted`` over one column's slice, so lookups are
+    O(log n) and the vectorized variants take whole arrays of times at once.
+
+    Indices returned by the queries are hitobject indices into
+    ``beatmap.hitobjects`` (and rows of ``beatmap.hitobject_array()``), or -1
+    where there is no such note.
+    """
+
+    PLAYFIELD_WIDTH = 512   # osu!px, same as ``BeatmapBase.PLAYFIELD_WIDTH``
+
+    def __init__(self, beatmap: "BeatmapBase"):
+        hitobject_data = beatmap.hitobject_array()
+
+        columns = hitobject_data[:, Hitobject.HDATA_POSX].astype(np.int64)
+        starts  = hitobject_data[:, Hitobject.HDATA_TSRT]
+        is_hold = ( hitobject_data[:, Hitobject.HDATA_TYPE].astype(np.int64) & Hitobject.MANIALONG ) > 0
+
+        # Single notes are stored ending 1 ms after they start; here they end where they start
+        ends = np.where(is_hold, hitobject_data[:, Hitobject.HDATA_TEND], starts)
+
+        self.keys = max(int(beatmap.difficulty.cs), int(columns.max()) + 1 if len(columns) > 0 else 0)
+
+        order = np.lexsort((starts, columns))
+
+        self.order       = order              # Hitobject index of each sorted note
+        self.columns     = columns[order]
+        self.start_times = starts[order]
+        self.end_times   = ends[order]
+        self.is_hold     = is_hold[order]
+        self.offsets     = np.searchsorted(self.columns, np.arange(self.keys + 1), side='left')
+
+        # Chords; notes starting at the same time, in any column. Indexed in hitobject order.
+        self.chord_times, self.chord_idx, self.chord_sizes = np.unique(starts, return_inverse=True, return_counts=True)
+        self.chord_notes   = np.argsort(self.chord_idx, kind='stable')
+        self.chord_offsets = np.concatenate(([ 0 ], np.cumsum(self.chord_sizes)))
+
+
+    @staticmethod
+    def columns_from_x(x: np.ndarray, keys: float) -> np.ndarray:
+        """
+        Converts the x positions notes have in the *.osu file to their columns, for all notes at once.
+        The parser stores the columns in place of x.
+
+        Args:
+            x: (N,) osu!px
+            keys: (float) number of columns; the beatmap's CS
+
+        Returns:
+            (N,) int array
+        """
+        columns = np.floor(np.asarray(x, dtype=np.float64) * keys / ManiaColumns.PLAYFIELD_WIDTH)
+        return np.minimum(columns, keys - 1).astype(np.int64)
+
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+
+    def column(self, k: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns:
+            (start times, end times, hold flags) of the notes in column k, sorted by start time
+        """
+        lo, hi = self.offsets[k], self.offsets[k + 1]
+        return self.start_times[lo:hi], self.end_times[lo:hi], self.is_hold[lo:hi]
+
+
+    def notes(self, k: int) -> np.ndarray:
+        """
+        Returns the hitobject indices of the notes in column k, sorted by start time
+        """
+        return self.order[self.offsets[k]:self.offsets[k + 1]]
+
+
+    def holds(self, k: int) -> np.ndarray:
+        """
+        Returns the hold notes of column k as an (H, 2) array of (start time, end time) intervals
+        """
+        starts, ends, is_hold = self.column(k)
+        return np.stack([ starts[is_hold], ends[is_hold] ], axis=1)
+
+
+    def next_note(self, k: int, time: float, inclusive: bool = False) -> int:
+        """
+        Returns the hitobject index of the first note in column k starting after ``time``
+        (or at it, if ``inclusive``); -1 if there is none
+        """
+        return int(self.next_notes(k, np.asarray([ time ]), inclusive)[0])
+
+
+    def prev_note(self, k: int, time: float, inclusive: bool = False) -> int:
+        """
+        Returns the hitobject index of the last note in column k starting before ``time``
+        (or at it, if ``inclusive``); -1 if there is none
+        """
+        return int(self.prev_notes(k, np.asarray([ time ]), inclusive)[0])
+
+
+    def next_notes(self, k: int, times: np.ndarray, inclusive: bool = False) -> np.ndarray:
+        """
+        Vectorized ``next_note`` over an array of times
+        """
+        lo, hi = self.offsets[k], self.offsets[k + 1]
+        idx = lo + np.searchsorted(self.start_times[lo:hi], times, side='left' if inclusive else 'right')
+
+        result = np.full(len(idx), -1, dtype=np.int64)
+        found  = idx < hi
+        result[found] = self.order[idx[found]]
+        return result
+
+
+    def prev_notes(self, k: int, times: np.ndarray, inclusive: bool = False) -> np.ndarray:
+        """
+        Vectorized ``prev_note`` over an array of times
+        """
+        lo, hi = self.offsets[k], self.offsets[k + 1]
+        idx = lo + np.searchsorted(self.start_times[lo:hi], times, side='right' if inclusive else 'left') - 1
+
+        result = np.full(len(idx), -1, dtype=np.int64)
+        found  = idx >= lo
+        result[found] = self.order[idx[found]]
+        return result
+
+
+    def held_at(self, time: float) -> np.ndarray:
+        """
+        Returns a (keys,) boolean array of which columns have a hold note in progress at ``time``
+        """
+        held = np.zeros(self.keys, dtype=bool)
+        for k in range(self.keys):
+            lo, hi = self.offsets[k], self.offsets[k + 1]
+            idx = lo + np.searchsorted(self.start_times[lo:hi], time, side='right') - 1
+            held[k] = idx >= lo and self.is_hold[idx] and time <= self.end_times[idx]
+
+        return held
+
+
+    def chord(self, idx: int) -> np.ndarray:
+        """
+        Returns the hitobject indices of every note starting at the same time as hitobject ``idx``, including it
+        """
+        chord = self.chord_idx[idx]
+        return self.chord_notes[self.chord_offsets[chord]:self.chord_offsets[chord + 1]]
@@ -0,0 +1,168 @@
+import io
+import hashlib
+
+from .gamemode import Gamemode
+
+
+
+class MetadataIO():
+    """
+    Reads only the [General], [Metadata] and [Difficulty] sections of beatmaps
+
+    Doesn't import NumPy, ``osu_interfaces`` or any hitobject code, and stops
+    reading once it is past the header sections, so it suits short-lived tools
+    that list or filter beatmaps. The result mirrors the layout of
+    ``BeatmapBase``; ``info.metadata.title``, ``info.difficulty.ar``,
+    ``info.gamemode`` and ``info.stack_leniency`` read the same as on a fully
+    loaded beatmap.
+
+    Usage:
+        from beatmap_reader import MetadataIO
+        info = MetadataIO.open_metadata('map.osu')
+    """
+
+    DEFAULT_STACK_LENIENCY = 0.7   # Same as ``Stacking.DEFAULT_LENIENCY``; not imported from there since it pulls in NumPy
+
+    class Metadata():
+
+        def __init__(self):
+            self.beatmap_format = -1    # *.osu format
+            self.artist         = ''
+            self.title          = ''
+            self.version        = ''    # difficulty name
+            self.creator        = ''
+            self.name           = ''    # Artist - Title (Creator) [Difficulty]
+
+            self.beatmap_id     = ''
+            self.beatmapset_id  = ''
+            self.beatmap_md5    = ''
+
+
+    class Difficulty():
+
+        def __init__(self):
+            self.hp = None
+            self.cs = None
+            self.od = None
+            self.ar = None
+            self.sm = None
+            self.st = None
+
+
+    class BeatmapInfo():
+
+        def __init__(self):
+            self.metadata       = MetadataIO.Metadata()
+            self.difficulty     = MetadataIO.Difficulty()
+            self.gamemode       = Gamemode(Gamemode.OSU)
+            self.stack_leniency = MetadataIO.DEFAULT_STACK_LENIENCY
+
+
+    __HEADER_SECTIONS = ( '[General]', '[Metadata]', '[Difficulty]' )
+
+    __METADATA_KEYS = {
+        'Title'        : 'title',
+        'Artist'       : 'artist',
+        'Creator'      : 'creator',
+        'Version'      : 'version',
+        'BeatmapID'    : 'beatmap_id',
+        'BeatmapSetID' : 'beatmapset_id',
+    }
+
+    __DIFFICULTY_KEYS = {
+        'HPDrainRate'       : 'hp',
+        'CircleSize'        : 'cs',
+        'OverallDifficulty' : 'od',
+        'ApproachRate'      : 'ar',
+        'SliderMultiplier'  : 'sm',
+        'SliderTickRate'    : 'st',
+    }
+
+    @staticmethod
+    def open_metadata(filepath: str) -> "MetadataIO.BeatmapInfo":
+        """
+        Opens a beatmap file and reads its metadata
+
+        Args:
+            filepath: (string) filepath to the beatmap file to read
+        """
+        with open(filepath, 'rb') as beatmap_file:
+            beatmap_data = beatmap_file.read()
+
+        return MetadataIO.load_metadata(beatmap_data)
+
+
+    @staticmethod
+    def load_metadata(beatmap_data: str | bytes | io.TextIOBase) -> "MetadataIO.BeatmapInfo":
+        """
+        Reads metadata from beatmap data
+
+        Args:
+            beatmap_data: (string | bytes | text stream) contents of the beatmap file. The md5
+                is filled in for bytes, the same as ``BeatmapIO.load_beatmap`` does
+
+        Returns:
+            ``MetadataIO.BeatmapInfo``
+        """
+        if isinstance(beatmap_data, bytes):
+            info = MetadataIO.__parse(io.StringIO(beatmap_data.decode('utf-8'), newline=None))
+            info.metadata.beatmap_md5 = hashlib.md5(beatmap_data).hexdigest()
+            return info
+
+        if isinstance(beatmap_data, str):
+            return MetadataIO.__parse(io.StringIO(beatmap_data))
+
+        return MetadataIO.__parse(beatmap_data)
+
+
+    @staticmethod
+    def __parse(beatmap_data: io.TextIOBase) -> "MetadataIO.BeatmapInfo":
+        info = MetadataIO.BeatmapInfo()
+
+        data = beatmap_data.readline().split('osu file format v')
+        try: info.metadata.beatmap_format = int(data[1])
+        except: return info
+
+        section = None
+        seen    = set()
+
+        for line in beatmap_data:
+            stripped = line.strip()
+
+            if stripped.startswith('[') and stripped.endswith(']'):
+                # Everything needed is read once past the header sections
+                if stripped == '[HitObjects]' or seen.issuperset(MetadataIO.__HEADER_SECTIONS):
+                    break
+
+                section = stripped
+                seen.add(section)
+                continue
+
+            data = line.split(':', 1)
+            if len(data) < 2:
+                continue
+
+            key, value = data[0].strip(), data[1].strip()
+
+            if section == '[General]':
+                if key == 'Mode':          info.gamemode = Gamemode(int(value))
+                if key == 'StackLeniency': info.stack_leniency = float(value)
+                continue
+
+            if section == '[Metadata]':
+                if key in MetadataIO.__METADATA_KEYS:
+                    setattr(info.metadata, MetadataIO.__METADATA_KEYS[key], value)
+                continue
+
+            if section == '[Difficulty]':
+                if key in MetadataIO.__DIFFICULTY_KEYS:
+                    setattr(info.difficulty, MetadataIO.__DIFFICULTY_KEYS[key], float(value))
+                continue
+
+        # Old maps dont have explicit ar and hp - they take on od value
+        if info.difficulty.ar is None: info.difficulty.ar = info.difficulty.od
+        if info.difficulty.hp is None: info.difficulty.hp = info.difficulty.od
+
+        metadata = info.metadata
+        metadata.name = metadata.artist + ' - ' + metadata.title + ' (' + metadata.creator + ') ' + '[' + metadata.version + ']'
+        return info
@@ -0,0 +1,68 @@
+class Mods():
+    """
+    Mod bit flags, using the same values as osu! replays and the osu! API
+    """
+
+    NONE       = 0
+    EASY       = 1 << 1
+    HARDROCK   = 1 << 4
+    DOUBLETIME = 1 << 6
+    HALFTIME   = 1 << 8
+    NIGHTCORE  = 1 << 9   # Always set together with DOUBLETIME
+
+    EZ = EASY
+    HR = HARDROCK
+    DT = DOUBLETIME
+    HT = HALFTIME
+    NC = NIGHTCORE
+
+    SUPPORTED = EASY | HARDROCK | DOUBLETIME | HALFTIME | NIGHTCORE
+
+    RATE_DT = 1.5
+    RATE_HT = 0.75
+
+    EZ_MULTIPLIER    = 0.5
+    HR_MULTIPLIER    = 1.4
+    HR_CS_MULTIPLIER = 1.3
+
+
+    @staticmethod
+    def validate(mods: int):
+        if mods & ~Mods.SUPPORTED:
+            raise ValueError(f'Unsupported mods   mods = {mods}')
+
+        if ( mods & (Mods.DOUBLETIME | Mods.NIGHTCORE) ) and ( mods & Mods.HALFTIME ):
+            raise ValueError(f'DT/NC and HT cannot be combined   mods = {mods}')
+
+        if ( mods & Mods.EASY ) and ( mods & Mods.HARDROCK ):
+            raise ValueError(f'EZ and HR cannot be combined   mods = {mods}')
+
+
+    @staticmethod
+    def rate(mods: int) -> float:
+        """
+        Returns the playback rate the mods apply
+        """
+        if mods & (Mods.DOUBLETIME | Mods.NIGHTCORE):
+            return Mods.RATE_DT
+
+        if mods & Mods.HALFTIME:
+            return Mods.RATE_HT
+
+        return 1.0
+
+
+    @staticmethod
+    def to_str(mods: int) -> str:
+        names = {
+            Mods.EASY       : 'EZ',
+            Mods.HALFTIME   : 'HT',
+            Mods.HARDROCK   : 'HR',
+            Mods.DOUBLETIME : 'DT',
+            Mods.NIGHTCORE  : 'NC',
+        }
+
+        if mods & Mods.NIGHTCORE:
+            mods &= ~Mods.DOUBLETIME
+
+        return ''.join(name for flag, name in names.items() if mods & flag) or 'NM'
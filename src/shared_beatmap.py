@@ -0,0 +1,376 @@
+import sys
+import copy
+import threading
+import collections.abc
+
+import numpy as np
+
+from multiprocessing import shared_memory
+
+from .beatmap_base import BeatmapBase
+from .gamemode import Gamemode
+from .hitobject.hitobject import Hitobject
+
+
+
+class SharedBeatmap():
+    """
+    Owner side of a beatmap exported to shared memory
+
+    The hitobject, tick and timing arrays of the beatmap are packed into one
+    shared memory segment. ``descriptor`` is a small picklable dict that
+    consumers pass to ``SharedBeatmapView`` to map the same segment without
+    copying or unpickling any hitobjects.
+
+    The segment is reference counted on the owner side. ``export`` starts
+    with one reference; hand out one ``acquire`` per consumer task and
+    ``release`` it when the task is done. The segment is unlinked when the
+    last reference is released. Consumers only ever detach, so a crashing or
+    long-running worker can never leak or prematurely destroy a segment.
+
+    Usage:
+        shared = SharedBeatmap.export(beatmap)
+        pool.submit(analyze, shared.acquire()).add_done_callback(lambda _: shared.release())
+        shared.release()  # the reference taken by export
+
+        # In the worker
+        with SharedBeatmapView(descriptor) as beatmap:
+            beatmap.hitobjects[0].start_time()
+    """
+
+    ALIGNMENT = 64
+
+    ARRAYS = [ 'hitobjects', 'ticks', 'tick_offsets', 'timing_points' ]
+
+    __lock = threading.Lock()
+    __live: dict[str, "SharedBeatmap"] = {}
+
+
+    def __init__(self, beatmap: BeatmapBase):
+        ticks, tick_offsets = beatmap.tick_array()
+
+        arrays = {
+            'hitobjects'    : beatmap.hitobject_array(),
+            'ticks'         : ticks,
+            'tick_offsets'  : tick_offsets,
+            'timing_points' : beatmap.timing_array(),
+        }
+
+        layout = {}
+        size   = 0
+        for name in SharedBeatmap.ARRAYS:
+            array  = np.ascontiguousarray(arrays[name])
+            size   = -(-size // SharedBeatmap.ALIGNMENT) * SharedBeatmap.ALIGNMENT
+            layout[name] = (size, array.shape, array.dtype.str)
+            size  += array.nbytes
+
+        self.__shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.__refs = 1
+
+        for name in SharedBeatmap.ARRAYS:
+            offset, shape, dtype = layout[name]
+            np.ndarray(shape, dtype=dtype, buffer=self.__shm.buf, offset=offset)[...] = arrays[name]
+
+        self.descriptor = {
+            'name'       : self.__shm.name,
+            'layout'     : layout,
+            'gamemode'   : beatmap.gamemode.value,
+            'bpm_min'    : beatmap.bpm_min,
+            'bpm_max'    : beatmap.bpm_max,
+            'mods'       : beatmap.mods,
+            'rate'       : beatmap.rate,
+            'stack_leniency' : beatmap.stack_leniency,
+            'metadata'   : dict(vars(beatmap.metadata)),
+            'difficulty' : dict(vars(beatmap.difficulty)),
+        }
+
+        with SharedBeatmap.__lock:
+            SharedBeatmap.__live[self.__shm.name] = self
+
+
+    @staticmethod
+    def export(beatmap: BeatmapBase) -> "SharedBeatmap":
+        return SharedBeatmap(beatmap)
+
+
+    @property
+    def name(self) -> str:
+        return self.descriptor['name']
+
+
+    @property
+    def refs(self) -> int:
+        return self.__refs
+
+
+    def acquire(self) -> dict:
+        """
+        Adds a reference and returns the descriptor to hand to the consumer
+        """
+        with SharedBeatmap.__lock:
+            if self.__refs <= 0:
+                raise ValueError(f'Shared beatmap was already released   name = {self.name}')
+
+            self.__refs += 1
+
+        return self.descriptor
+
+
+    def release(self):
+        """
+        Drops a reference. The segment is unlinked once no references remain.
+        Views already attached keep working until they are closed.
+        """
+        with SharedBeatmap.__lock:
+            if self.__refs <= 0:
+                return
+
+            self.__refs -= 1
+            if self.__refs > 0:
+                return
+
+            SharedBeatmap.__live.pop(self.name, None)
+
+        self.__shm.close()
+        self.__shm.unlink()
+
+
+    @staticmethod
+    def live() -> list[str]:
+        """
+        Returns the names of segments exported by this process that are not yet unlinked
+        """
+        with SharedBeatmap.__lock:
+            return list(SharedBeatmap.__live.keys())
+
+
+    @staticmethod
+    def release_all():
+        """
+        Unlinks every segment exported by this process regardless of reference count
+        """
+        with SharedBeatmap.__lock:
+            shared = list(SharedBeatmap.__live.values())
+
+        for beatmap in shared:
+            beatmap.__refs = 1
+            beatmap.release()
+
+
+
+class SharedBeatmapView(BeatmapBase):
+    """
+    Read-only, zero-copy beatmap attached to a segment exported by ``SharedBeatmap``
+
+    Hitobjects are created on access as thin views over rows of the shared
+    hitobject and tick arrays. Nothing may be modified; the arrays are marked
+    read-only. The view must be closed (or used as a context manager) and no
+    array obtained from it may be used afterwards.
+    """
+
+    __attach_lock = threading.Lock()
+
+    def __init__(self, descriptor: dict):
+        BeatmapBase.__init__(self)
+
+        self.__shm = SharedBeatmapView.__attach(descriptor['name'])
+        self.__mod_cache: dict[int, BeatmapBase] = {}
+
+        arrays = {}
+        for name, (offset, shape, dtype) in descriptor['layout'].items():
+            array = np.ndarray(shape, dtype=dtype, buffer=self.__shm.buf, offset=offset)
+            array.flags.writeable = False
+            arrays[name] = array
+
+        self.hitobject_data = arrays['hitobjects']
+        self.tick_data      = arrays['ticks']
+        self.tick_offsets   = arrays['tick_offsets']
+        self.timing_data    = arrays['timing_points']
+
+        self.gamemode = Gamemode(descriptor['gamemode'])
+        self.bpm_min  = descriptor['bpm_min']
+        self.bpm_max  = descriptor['bpm_max']
+        self.mods     = descriptor['mods']
+        self.rate     = descriptor['rate']
+        self.stack_leniency = descriptor['stack_leniency']
+        vars(self.metadata).update(descriptor['metadata'])
+        vars(self.difficulty).update(descriptor['difficulty'])
+
+        for row in self.timing_data:
+            timing_point = BeatmapBase.TimingPoint()
+            timing_point.offset            = row[BeatmapBase.TPDATA_OFFS]
+            timing_point.beat_interval     = row[BeatmapBase.TPDATA_BINT]
+            timing_point.meter             = int(row[BeatmapBase.TPDATA_METR])
+            timing_point.inherited         = bool(row[BeatmapBase.TPDATA_INHR])
+            timing_point.beat_length       = row[BeatmapBase.TPDATA_BLEN]
+            timing_point.bpm               = row[BeatmapBase.TPDATA_BPM]
+            timing_point.slider_multiplier = row[BeatmapBase.TPDATA_SMUL]
+            self.timing_points.append(timing_point)
+
+        self.hitobjects = SharedBeatmapView.HitobjectSequence(self.hitobject_data, self.tick_data, self.tick_offsets)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def close(self):
+        """
+        Detaches from the segment. Does not unlink it; that is up to the owner.
+        """
+        if self.__shm is None:
+            return
+
+        self.hitobjects     = []
+        self.hitobject_data = None
+        self.tick_data      = None
+        self.tick_offsets   = None
+        self.timing_data    = None
+
+        self.__shm.close()
+        self.__shm = None
+
+
+    def hitobject_array(self) -> np.ndarray:
+        return self.hitobject_data
+
+
+    def tick_array(self, fidelity: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+        # The ticks were exported as they were; there is nothing to upgrade
+        return self.tick_data, self.tick_offsets
+
+
+    def timing_array(self) -> np.ndarray:
+        return self.timing_data
+
+
+    def to_beatmap(self) -> BeatmapBase:
+        """
+        Returns a regular, writable ``BeatmapBase`` with a copy of the view's data. It does not
+        reference the segment, so it stays valid after the view is closed. Its hitobjects are
+        ``HitobjectView`` rows of the copied arrays; sliders have ticks but no curves.
+        """
+        beatmap = BeatmapBase()
+        beatmap.metadata   = copy.copy(self.metadata)
+        beatmap.difficulty = copy.copy(self.difficulty)
+        beatmap.gamemode   = self.gamemode
+        beatmap.bpm_min    = self.bpm_min
+        beatmap.bpm_max    = self.bpm_max
+        beatmap.mods       = self.mods
+        beatmap.rate       = self.rate
+        beatmap.stack_leniency = self.stack_leniency
+        beatmap.timing_points  = [ copy.copy(timing_point) for timing_point in self.timing_points ]
+
+        hitobjects = SharedBeatmapView.HitobjectSequence(np.array(self.hitobject_data), np.array(self.tick_data), np.array(self.tick_offsets))
+        beatmap.hitobjects = list(hitobjects)
+        return beatmap
+
+
+    def apply_mods(self, mods: int, cache: bool = False) -> BeatmapBase:
+        """
+        Same as ``BeatmapBase.apply_mods``, applied to ``to_beatmap``. The view itself can't be modified.
+        """
+        if cache and mods in self.__mod_cache:
+            return self.__mod_cache[mods]
+
+        beatmap = self.to_beatmap().apply_mods(mods)
+
+        if cache:
+            self.__mod_cache[mods] = beatmap
+
+        return beatmap
+
+
+    def set_cs(self, cs: float): raise TypeError('Shared beatmap views are read-only')
+    def set_ar(self, ar: float): raise TypeError('Shared beatmap views are read-only')
+    def set_od(self, od: float): raise TypeError('Shared beatmap views are read-only')
+    def set_hp(self, hp: float): raise TypeError('Shared beatmap views are read-only')
+    def set_sm(self, sm: float): raise TypeError('Shared beatmap views are read-only')
+    def set_st(self, st: float): raise TypeError('Shared beatmap views are read-only')
+
+
+    @staticmethod
+    def __attach(name: str) -> shared_memory.SharedMemory:
+        # Consumers must not register the segment with their resource tracker,
+        # otherwise it gets unlinked from under the owner when the consumer exits
+        if sys.version_info >= (3, 13):
+            return shared_memory.SharedMemory(name=name, track=False)
+
+        if sys.platform == 'win32':
+            return shared_memory.SharedMemory(name=name)
+
+        # Backport of ``track=False``: skip the registration instead of undoing it afterwards.
+        # Workers started by ``multiprocessing`` share the owner's tracker, so unregistering
+        # would drop the owner's registration and with it the cleanup if the owner crashes.
+        from multiprocessing import resource_tracker
+
+        with SharedBeatmapView.__attach_lock:
+            register = resource_tracker.register
+
+            def register_others(rname, rtype):
+                if rtype != 'shared_memory' or rname.lstrip('/') != name.lstrip('/'):
+                    register(rname, rtype)
+
+            resource_tracker.register = register_others
+            try:
+                return shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+
+
+    class HitobjectSequence(collections.abc.Sequence):
+        """
+        Lazily creates ``HitobjectView`` instances over the shared arrays
+        """
+
+        def __init__(self, hitobject_data: np.ndarray, tick_data: np.ndarray, tick_offsets: np.ndarray):
+            self.__hitobject_data = hitobject_data
+            self.__tick_data      = tick_data
+            self.__tick_offsets   = tick_offsets
+
+
+        def __len__(self) -> int:
+            return len(self.__hitobject_data)
+
+
+        def __getitem__(self, idx):
+            if isinstance(idx, slice):
+                return [ self[i] for i in range(*idx.indices(len(self))) ]
+
+            if idx < 0:
+                idx += len(self)
+
+            if not 0 <= idx < len(self):
+                raise IndexError('Hitobject index out of range')
+
+            ticks = self.__tick_data[self.__tick_offsets[idx]:self.__tick_offsets[idx + 1]]
+            return SharedBeatmapView.HitobjectView(self.__hitobject_data[idx], ticks)
+
+
+
+    class HitobjectView(Hitobject):
+        """
+        Read-only hitobject backed by a row of the shared hitobject array
+        """
+
+        def __init__(self, hdata: np.ndarray, tdata: np.ndarray):
+            self.hdata   = hdata
+            self.tdata   = tdata
+            self.repeats = 0
+            self.px_len  = 0
+
+
+        def tick_data(self, fidelity: str | None = None) -> np.ndarray:
+            return self.tdata
+
+
+        def is_htype(self, hitobject_type: int) -> bool:
+            return ( int(self.hdata[Hitobject.HDATA_TYPE]) & hitobject_type ) > 0
+
+
+        def generate_tick_data(self, **kargs):
+            raise TypeError('Shared beatmap views are read-only')
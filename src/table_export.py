@@ -0,0 +1,371 @@
+import os
+import importlib
+
+import numpy as np
+
+from .beatmapIO import BeatmapIO
+from .beatmap_base import BeatmapBase
+from .gamemode import Gamemode
+
+
+
+class TableExport():
+    """
+    Columnar export of hitobject, tick and timing point data to Arrow record batches and pandas DataFrames
+
+    Tables are built from the ``BeatmapBase.*_array`` data of one beatmap or a
+    batch of them, with no per-row Python work. A table's float columns are
+    contiguous rows of a single buffer, so ``pyarrow`` wraps them without
+    copying, and ``to_pandas`` hands the same buffer to pandas as one block.
+    ``INT_COLUMNS`` (the hitobject 'type' bit flags) are kept out of the buffer
+    and exported as int64, like the 'beatmap' and 'hitobject' index columns.
+
+    ``pyarrow`` and ``pandas`` are optional; each is only imported by the
+    function that needs it.
+
+    Tables:
+        hitobjects    - ``HITOBJECT_COLUMNS``
+        ticks         - 'hitobject' (index within its beatmap) and ``TICK_COLUMNS``
+        timing_points - ``TIMING_COLUMNS``
+
+    Batches (lists) get a leading 'beatmap' column with the index of each row's beatmap.
+
+    Usage:
+        df = TableExport.to_pandas(beatmap, 'ticks')
+        batch = TableExport.to_arrow(beatmaps, 'hitobjects')
+    """
+
+    HITOBJECT_COLUMNS = ( 'x', 'y', 'start_time', 'end_time', 'type' )   # ``Hitobject.HDATA_*`` order
+    TICK_COLUMNS      = ( 'x', 'y', 'time' )                             # ``Hitobject.TDATA_*`` order; osu!mania ticks have their column as x and NaN as y
+    TIMING_COLUMNS    = ( 'offset', 'beat_interval', 'meter', 'inherited', 'beat_length', 'bpm', 'slider_multiplier' )   # ``BeatmapBase.TPDATA_*`` order
+
+    INT_COLUMNS = ( 'type', )   # Exported as int64 instead of as part of the float buffer
+
+    TABLES = {
+        'hitobjects'    : HITOBJECT_COLUMNS,
+        'ticks'         : TICK_COLUMNS,
+        'timing_points' : TIMING_COLUMNS,
+    }
+
+    class TableExportException(Exception):
+        pass
+
+
+    @staticmethod
+    def beatmap_arrays(beatmap: BeatmapBase) -> dict:
+        """
+        Extracts the arrays the tables are built from. Runs in the parsing workers
+        when exporting from files in parallel, so only arrays cross process boundaries.
+        """
+        ticks, tick_offsets = beatmap.tick_array()
+
+        # (column, time) osu!mania ticks are laid out like the others
+        if beatmap.gamemode == Gamemode.MANIA:
+            padded = np.full((len(ticks), len(TableExport.TICK_COLUMNS)), np.nan)
+            padded[:, 0]  = ticks[:, 0]
+            padded[:, -1] = ticks[:, -1]
+            ticks = padded
+
+        return {
+            'hitobjects'    : beatmap.hitobject_array(),
+            'ticks'         : ticks,
+            'tick_offsets'  : tick_offsets,
+            'timing_points' : beatmap.timing_array(),
+            'md5'           : beatmap.metadata.beatmap_md5,
+            'gamemode'      : beatmap.gamemode.value,
+        }
+
+
+    @staticmethod
+    def columns(beatmaps: BeatmapBase | dict | list, table: str, first_id: int = 0) -> dict[str, np.ndarray]:
+        """
+        Returns the columns of a table as NumPy arrays. The float columns are views into one
+        (columns, rows) buffer, so each is contiguous. ``INT_COLUMNS`` are separate int64 arrays.
+
+        Args:
+            beatmaps: (BeatmapBase | dict | list) a beatmap, ``beatmap_arrays`` of one, or a list of either
+            table: (str) one of ``TABLES``
+            first_id: (int) 'beatmap' value of the first beatmap of a batch
+
+        Returns:
+            column name -> (rows,) array
+        """
+        index_columns, float_names, buffer, int_columns = TableExport.__table(beatmaps, table, first_id)
+        return dict(index_columns, **dict(zip(float_names, buffer)), **int_columns)
+
+
+    @staticmethod
+    def to_arrow(beatmaps: BeatmapBase | dict | list, table: str, first_id: int = 0):
+        """
+        Returns a table as a ``pyarrow.RecordBatch`` sharing the buffers of ``columns``
+
+        Args:
+            see ``columns``
+        """
+        pa = _require('pyarrow')
+
+        columns = TableExport.columns(beatmaps, table, first_id)
+        return pa.RecordBatch.from_arrays([ pa.array(column) for column in columns.values() ], names=list(columns))
+
+
+    @staticmethod
+    def to_pandas(beatmaps: BeatmapBase | dict | list, table: str, first_id: int = 0):
+        """
+        Returns a table as a ``pandas.DataFrame``. The float columns are backed by the
+        ``columns`` buffer as a single block, without a copy. Columns are in ``columns`` order.
+
+        Args:
+            see ``columns``
+        """
+        pd = _require('pandas')
+
+        index_columns, float_names, buffer, int_columns = TableExport.__table(beatmaps, table, first_id)
+
+        # (rows, columns) transposed view of the buffer; pandas keeps blocks as (columns, rows)
+        frame = pd.DataFrame(buffer.T, columns=float_names, copy=False)
+        for i, (name, column) in enumerate(index_columns.items()):
+            frame.insert(i, name, column)
+
+        for name, column in int_columns.items():
+            frame.insert(len(frame.columns), name, column)
+
+        return frame
+
+
+    @staticmethod
+    def __table(beatmaps: BeatmapBase | dict | list, table: str, first_id: int) -> tuple[dict[str, np.ndarray], list[str], np.ndarray, dict[str, np.ndarray]]:
+        # Returns (index columns, float column names, (float columns, rows) buffer, int columns)
+        if table not in TableExport.TABLES:
+            raise TableExport.TableExportException(f'Unknown table   table = {table}')
+
+        is_batch = isinstance(beatmaps, (list, tuple))
+        arrays   = [ TableExport.__arrays(beatmap) for beatmap in ( beatmaps if is_batch else [ beatmaps ] ) ]
+        names    = TableExport.TABLES[table]
+
+        float_idxs  = [ i for i, name in enumerate(names) if name not in TableExport.INT_COLUMNS ]
+        float_names = [ names[i] for i in float_idxs ]
+
+        data = [ array[table].reshape(-1, len(names)) for array in arrays ]
+        lengths = np.asarray([ len(d) for d in data ], dtype=np.int64)
+
+        # One copy into (columns, rows) order; every column is then a contiguous row of it
+        buffer = np.empty((len(float_names), lengths.sum()), dtype=np.float64)
+        if len(data) > 0:
+            np.concatenate(data if len(float_idxs) == len(names) else [ d[:, float_idxs] for d in data ], axis=0, out=buffer.T)
+
+        int_columns = {
+            name : np.concatenate([ np.zeros(0, dtype=np.int64) ] + [ d[:, i].astype(np.int64) for d in data ])
+                for i, name in enumerate(names) if name in TableExport.INT_COLUMNS
+        }
+
+        index_columns = {}
+        if is_batch:
+            index_columns['beatmap'] = np.repeat(np.arange(first_id, first_id + len(arrays), dtype=np.int64), lengths)
+
+        if table == 'ticks':
+            index_columns['hitobject'] = np.concatenate([ np.zeros(0, dtype=np.int64) ] + [
+                np.repeat(np.arange(len(array['tick_offsets']) - 1, dtype=np.int64), np.diff(array['tick_offsets']))
+                    for array in arrays
+            ])
+
+        return index_columns, float_names, buffer, int_columns
+
+
+    @staticmethod
+    def __arrays(beatmap: BeatmapBase | dict) -> dict:
+        if isinstance(beatmap, BeatmapBase):
+            return TableExport.beatmap_arrays(beatmap)
+
+        return beatmap
+
+
+
+class TableShardWriter():
+    """
+    Writes the tables of many beatmaps to Arrow IPC or Parquet shards as they are loaded
+
+    Each table goes to its own sequence of files, ``<table>-00000.<ext>``,
+    ``<table>-00001.<ext>``, ...; a new shard is started once one holds
+    ``max_rows_per_shard`` rows, splitting batches that don't fit. Rows are buffered up to ``batch_rows`` per
+    table and written as one record batch (a row group for Parquet). Besides
+    ``TableExport.TABLES`` there is a 'beatmaps' table of 'beatmap', 'path',
+    'md5' and 'gamemode' to join the others on.
+
+    Usage:
+        with TableShardWriter('tables', format='parquet') as writer:
+            writer.add_files(filepaths, num_workers=8)
+    """
+
+    FORMATS = {
+        'parquet' : '.parquet',
+        'ipc'     : '.arrow',
+    }
+
+    def __init__(self, dirpath: str, format: str = 'parquet', max_rows_per_shard: int = 1 << 24, batch_rows: int = 1 << 16):
+        """
+        Args:
+            dirpath: (string) directory for the shards. Created if it does not exist
+            format: (str) 'parquet' or 'ipc'
+            max_rows_per_shard: (int) rows per file before starting the next shard
+            batch_rows: (int) rows buffered per table before they are written
+        """
+        if format not in TableShardWriter.FORMATS:
+            raise TableExport.TableExportException(f'Unknown format   format = {format}')
+
+        self.__pa = _require('pyarrow')
+        self.__pq = _require('pyarrow.parquet') if format == 'parquet' else None
+
+        self.dirpath = dirpath
+        self.format  = format
+        self.max_rows_per_shard = max_rows_per_shard
+        self.batch_rows = batch_rows
+
+        os.makedirs(dirpath, exist_ok=True)
+
+        tables = list(TableExport.TABLES) + [ 'beatmaps' ]
+        self.__pending      = { table : [] for table in tables }   # Column dicts not written yet
+        self.__pending_rows = { table : 0  for table in tables }
+        self.__writers      = { table : None for table in tables }
+        self.__shard        = { table : -1 for table in tables }
+        self.__shard_rows   = { table : 0  for table in tables }
+
+        self.__num_beatmaps = 0
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def __len__(self) -> int:
+        return self.__num_beatmaps
+
+
+    def add(self, beatmap: BeatmapBase | dict, source: str | None = None) -> int:
+        """
+        Appends a beatmap
+
+        Args:
+            beatmap: (BeatmapBase | dict) loaded beatmap or its ``TableExport.beatmap_arrays``
+            source: (string) optional filepath recorded in the 'beatmaps' table
+
+        Returns:
+            'beatmap' id of the beatmap in the tables
+        """
+        arrays = TableExport.beatmap_arrays(beatmap) if isinstance(beatmap, BeatmapBase) else beatmap
+        beatmap_id = self.__num_beatmaps
+
+        for table in TableExport.TABLES:
+            self.__append(table, TableExport.columns([ arrays ], table, beatmap_id))
+
+        self.__append('beatmaps', {
+            'beatmap'  : np.asarray([ beatmap_id ], dtype=np.int64),
+            'path'     : np.asarray([ source ], dtype=object),
+            'md5'      : np.asarray([ arrays['md5'] ], dtype=object),
+            'gamemode' : np.asarray([ arrays['gamemode'] ], dtype=np.int8),
+        })
+
+        self.__num_beatmaps += 1
+        return beatmap_id
+
+
+    def add_files(self, filepaths, num_workers: int | None = None, skip_errors: bool = False) -> int:
+        """
+        Loads and appends beatmap files. Parsing and array extraction run in the
+        workers; only writing happens in this process, in input order.
+
+        Returns:
+            number of beatmaps appended
+        """
+        count = 0
+        for filepath, arrays in BeatmapIO.open_beatmaps(filepaths, num_workers, process=TableExport.beatmap_arrays, skip_errors=skip_errors):
+            self.add(arrays, filepath)
+            count += 1
+
+        return count
+
+
+    def flush(self):
+        """
+        Writes out all buffered rows
+        """
+        for table in self.__pending:
+            self.__write(table)
+
+
+    def close(self):
+        self.flush()
+
+        for table, writer in self.__writers.items():
+            if writer is not None:
+                writer.close()
+                self.__writers[table] = None
+
+
+    def __append(self, table: str, columns: dict[str, np.ndarray]):
+        self.__pending[table].append(columns)
+        self.__pending_rows[table] += len(next(iter(columns.values())))
+
+        if self.__pending_rows[table] >= self.batch_rows:
+            self.__write(table)
+
+
+    def __write(self, table: str):
+        if self.__pending_rows[table] == 0:
+            return
+
+        pending = self.__pending[table]
+        columns = { name : np.concatenate([ p[name] for p in pending ]) for name in pending[0] }
+        arrays  = [
+            # Object columns are strings; typed explicitly so a batch of only None is not a null column
+            self.__pa.array(column, type=self.__pa.string()) if column.dtype == object else self.__pa.array(column)
+                for column in columns.values()
+        ]
+        batch = self.__pa.RecordBatch.from_arrays(arrays, names=list(columns))
+
+        self.__pending[table] = []
+        self.__pending_rows[table] = 0
+
+        # Split across shards so none goes over ``max_rows_per_shard``; slices don't copy
+        offset = 0
+        while offset < batch.num_rows:
+            writer = self.__writers[table]
+            if writer is None or self.__shard_rows[table] >= self.max_rows_per_shard:
+                writer = self.__next_shard(table, batch.schema)
+
+            part = batch.slice(offset, self.max_rows_per_shard - self.__shard_rows[table])
+
+            if self.format == 'parquet':
+                writer.write_table(self.__pa.Table.from_batches([ part ]))
+            else:
+                writer.write_batch(part)
+
+            self.__shard_rows[table] += part.num_rows
+            offset += part.num_rows
+
+
+    def __next_shard(self, table: str, schema):
+        if self.__writers[table] is not None:
+            self.__writers[table].close()
+
+        self.__shard[table] += 1
+        self.__shard_rows[table] = 0
+
+        path = os.path.join(self.dirpath, f'{table}-{self.__shard[table]:05d}{TableShardWriter.FORMATS[self.format]}')
+        if self.format == 'parquet':
+            writer = self.__pq.ParquetWriter(path, schema)
+        else:
+            writer = self.__pa.ipc.new_file(path, schema)
+
+        self.__writers[table] = writer
+        return writer
+
+
+
+def _require(module: str):
+    try: return importlib.import_module(module)
+    except ImportError as e:
+        raise TableExport.TableExportException(f'{module} is needed for this export; install it with `pip install {module.split(".")[0]}`') from e
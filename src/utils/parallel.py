@@ -0,0 +1,83 @@
+import os
+import functools
+import collections
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+
+def apply_chain(funcs, item):
+    for func in funcs:
+        item = func(item)
+    return item
+
+
+def apply_starred(func, args):
+    return func(*args)
+
+
+def starred(func):
+    """
+    Wraps a function so it takes its arguments as a single tuple, keeping it picklable
+    """
+    return functools.partial(apply_starred, func)
+
+
+def imap_ordered(funcs, items, num_workers=None, max_pending=None, threads=False):
+    """
+    Applies a chain of functions to each item, optionally on a process pool,
+    and yields results in input order
+
+    The functions must be picklable (module level functions or static methods
+    of module level classes) when ``num_workers`` is greater than 1, unless
+    ``threads`` is set.
+
+    Args:
+        funcs: (list) functions applied one after another to each item
+        items: (iterable) inputs
+        num_workers: (int) number of worker processes. ``None``, 0 or 1 runs serially
+        max_pending: (int) max number of items in flight. Defaults to 4 per worker
+        threads: (bool) use a thread pool instead of a process pool. Only worth it when
+            the functions spend their time in code that releases the GIL, e.g. NumPy
+
+    Yields:
+        (item, result, error) - ``error`` is the raised exception or ``None``
+    """
+    func = functools.partial(apply_chain, tuple(funcs))
+
+    if num_workers is not None and num_workers < 0:
+        num_workers = os.cpu_count()
+
+    if num_workers is None or num_workers <= 1:
+        for item in items:
+            try: yield item, func(item), None
+            except Exception as e:
+                yield item, None, e
+        return
+
+    if max_pending is None:
+        max_pending = 4*num_workers
+
+    pending = collections.deque()
+
+    executor = ThreadPoolExecutor if threads else ProcessPoolExecutor
+
+    with executor(max_workers=num_workers) as pool:
+        for item in items:
+            pending.append((item, pool.submit(func, item)))
+
+            # Bound the number of futures in flight so results of very
+            # large batches do not pile up in memory
+            while len(pending) >= max_pending:
+                yield _future_result(*pending.popleft())
+
+        while len(pending) > 0:
+            yield _future_result(*pending.popleft())
+
+
+def _future_result(item, future):
+    error = future.exception()
+    if error is not None:
+        return item, None, error
+
+    return item, future.result(), None
@@ -0,0 +1,71 @@
+"""
+Times diff_beatmaps on generated maps of increasing size, to check it scales near-linearly
+
+Each map is diffed against a revision with 1% of its hitobjects moved, 1% deleted,
+1% inserted and a few timing points changed.
+
+Usage:
+    python test/benchmarks/bench_diff.py [max num hitobjects]
+"""
+import sys
+import time
+
+import numpy as np
+
+from beatmap_reader import BeatmapIO, diff_beatmaps
+
+def generate_map(num_hitobjects: int, seed: int, revise: bool = False) -> str:
+    lines = [
+        'osu file format v14',
+        '[General]',
+        'Mode: 0',
+        '[Difficulty]',
+        'HPDrainRate:5',
+        'CircleSize:4',
+        'OverallDifficulty:8',
+        'ApproachRate:9',
+        'SliderMultiplier:1.8',
+        'SliderTickRate:2',
+        '[TimingPoints]',
+    ]
+
+    rng = np.random.default_rng(seed)
+    rev = np.random.default_rng(seed + 1)   # Separate stream so revisions don't shift the positions
+    for i in range(num_hitobjects // 100):
+        lines.append(f'{i*10000},{-50 if (revise and i % 10 == 0) else -100},4,2,0,100,0,0')
+    lines.insert(11, '0,300,4,2,0,100,1,0')
+
+    lines.append('[HitObjects]')
+    for i in range(num_hitobjects):
+        x, y = rng.integers(50, 450, 2)
+        t    = i*100
+
+        if revise:
+            roll = rev.random()
+            if roll < 0.01: continue
+            if roll < 0.02: x += 10
+            if roll < 0.03: lines.append(f'{x},{y},{t + 50},1,0,0:0:0:0:')
+
+        if i % 4 == 0:
+            lines.append(f'{x},{y},{t},2,0,L|{x + 50}:{y},1,50')
+        else:
+            lines.append(f'{x},{y},{t},1,0,0:0:0:0:')
+
+    return '\n'.join(lines) + '\n'
+
+if __name__ == '__main__':
+    max_hitobjects = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+
+    print(f'{"hitobjects":>10} {"diff":>9} {"us/obj":>8}  changes')
+
+    num_hitobjects = max_hitobjects // 8
+    while num_hitobjects <= max_hitobjects:
+        a = BeatmapIO.load_beatmap(generate_map(num_hitobjects, 0))
+        b = BeatmapIO.load_beatmap(generate_map(num_hitobjects, 0, revise=True))
+
+        start = time.perf_counter()
+        diff  = diff_beatmaps(a, b)
+        elapsed = time.perf_counter() - start
+
+        print(f'{num_hitobjects:>10} {elapsed*1000:7.1f}ms {elapsed*1e6/num_hitobjects:8.2f}  {diff.summary()}')
+        num_hitobjects *= 2
@@ -0,0 +1,71 @@
+"""
+Measures package import time with ``python -X importtime`` and checks it against a budget
+
+Each scenario runs in a fresh interpreter a few times and the fastest run is
+kept. Exits with status 1 if any scenario goes over its budget or imports a
+module it must not.
+
+Usage:
+    python test/benchmarks/bench_import_time.py [num runs]
+"""
+import re
+import sys
+import subprocess
+
+
+# (label, code, budget in ms, modules that must not be imported)
+SCENARIOS = [
+    ( 'import',   'import beatmap_reader',                 10,  [ 'numpy', 'osu_interfaces' ] ),
+    ( 'metadata', 'from beatmap_reader import MetadataIO', 20,  [ 'numpy', 'osu_interfaces' ] ),
+    ( 'loader',   'from beatmap_reader import BeatmapIO',  500, [] ),
+    ( 'export',   'from beatmap_reader import TableExport', 500, [ 'pandas', 'pyarrow' ] ),
+]
+
+IMPORTTIME_LINE = re.compile(r'import time:\s*(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)')
+
+def importtime(code: str) -> list[tuple[str, int, int]]:
+    """
+    Returns:
+        (module, cumulative us, nesting depth) of every import made while running ``code``
+    """
+    result = subprocess.run([ sys.executable, '-X', 'importtime', '-c', code ], capture_output=True, text=True, check=True)
+
+    matches = [ IMPORTTIME_LINE.match(line) for line in result.stderr.splitlines() ]
+    return [ (match.group(4), int(match.group(2)), (len(match.group(3)) - 1) // 2) for match in matches if match is not None ]
+
+def measure(code: str, startup: set[str]) -> tuple[float, dict[str, int], set[str]]:
+    """
+    Returns:
+        (total ms, top level module -> cumulative us, every module imported) for ``code``,
+        leaving out the modules imported by interpreter startup
+    """
+    imports = [ (name, us, depth) for name, us, depth in importtime(code) if name not in startup ]
+
+    # Nested imports are already counted in their parent's cumulative time
+    top_level = { name : us for name, us, depth in imports if depth == 0 }
+    return sum(top_level.values()) / 1000, top_level, { name for name, _, _ in imports }
+
+if __name__ == '__main__':
+    num_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    startup  = { name for name, _, _ in importtime('pass') }
+
+    failed = False
+    print(f'{"scenario":<10} {"time":>9} {"budget":>9}  {"status":<11} slowest imports')
+
+    for label, code, budget_ms, forbidden in SCENARIOS:
+        total_ms, top_level, imported = min(( measure(code, startup) for _ in range(num_runs) ), key=lambda run: run[0])
+
+        slowest = sorted(top_level.items(), key=lambda item: -item[1])[:3]
+        slowest = ', '.join(f'{name} {us/1000:.1f}ms' for name, us in slowest)
+
+        over   = total_ms > budget_ms
+        leaked = [ name for name in forbidden if name in imported ]
+        failed = failed or over or len(leaked) > 0
+
+        status = 'OVER BUDGET' if over else 'ok'
+        print(f'{label:<10} {total_ms:7.1f}ms {budget_ms:7d}ms  {status:<11} {slowest}')
+
+        if len(leaked) > 0:
+            print(f'{"":<10} imported {", ".join(leaked)}')
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,51 @@
+"""
+Measures how beatmap loading throughput scales with threads sharing one BeatmapLoader
+
+Each beatmap is slider heavy, so most of the time goes to the NumPy curve and
+tick generation. On a GIL build the stages only overlap where NumPy releases
+the GIL; on a free-threaded build (python3.13t and later) they run in parallel.
+
+Usage:
+    python test/benchmarks/bench_loader_threads.py [num beatmaps] [num sliders]
+"""
+import os
+import sys
+import time
+import concurrent.futures
+
+import numpy as np
+
+from beatmap_reader import BeatmapLoader
+from bench_parallel_ticks import generate_map
+
+def bench(loader: BeatmapLoader, data: list[str], num_threads: int) -> float:
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(num_threads) as pool:
+        beatmaps = list(pool.map(loader.load_beatmap, data))
+
+    elapsed = time.perf_counter() - start
+
+    # Every thread must produce the same beatmaps
+    ticks = [ beatmap.tick_array()[0] for beatmap in beatmaps ]
+    assert all(np.array_equal(ticks[0], t) for t in ticks)
+    return elapsed
+
+if __name__ == '__main__':
+    num_beatmaps = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    num_sliders  = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    gil_enabled = sys._is_gil_enabled() if hasattr(sys, '_is_gil_enabled') else True
+    print(f'{num_beatmaps} beatmaps x {num_sliders} sliders, {os.cpu_count()} cpus, GIL {"enabled" if gil_enabled else "disabled"}')
+
+    # No cache; every beatmap is parsed
+    loader = BeatmapLoader()
+    data   = [ generate_map(num_sliders) ]*num_beatmaps
+
+    serial = bench(loader, data, 1)
+    print(f'{"threads":>8} {"time":>8} {"maps/s":>8} {"speedup":>8}')
+
+    num_threads = 1
+    while num_threads <= max(1, os.cpu_count()):
+        elapsed = serial if num_threads == 1 else bench(loader, data, num_threads)
+        print(f'{num_threads:>8} {elapsed:>7.2f}s {num_beatmaps/elapsed:>8.1f} {serial/elapsed:>7.2f}x')
+        num_threads *= 2
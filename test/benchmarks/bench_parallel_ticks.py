@@ -0,0 +1,66 @@
+"""
+Compares serial and parallel slider tick generation on a generated map with 50k sliders
+
+Usage:
+    python test/benchmarks/bench_parallel_ticks.py [num sliders] [num workers]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+
+from beatmap_reader import BeatmapIO
+
+def generate_map(num_sliders: int) -> str:
+    lines = [
+        'osu file format v14',
+        '[General]',
+        'Mode: 0',
+        '[Difficulty]',
+        'HPDrainRate:5',
+        'CircleSize:4',
+        'OverallDifficulty:8',
+        'ApproachRate:9',
+        'SliderMultiplier:1.8',
+        'SliderTickRate:2',
+        '[TimingPoints]',
+        '0,300,4,2,0,100,1,0',
+        '[HitObjects]',
+    ]
+
+    # Alternate bezier, perfect circle and linear sliders
+    paths = [
+        'B|200:100|300:250|400:100,2,250',
+        'P|150:300|300:350,1,200',
+        'L|450:200,1,300',
+    ]
+
+    rng = np.random.default_rng(0)
+    for i in range(num_sliders):
+        x, y = rng.integers(50, 350, 2)
+        lines.append(f'{x},{y},{i*400},2,0,{paths[i % len(paths)]}')
+
+    return '\n'.join(lines) + '\n'
+
+def bench(label: str, data: str, **kargs):
+    start   = time.perf_counter()
+    beatmap = BeatmapIO.load_beatmap(data, **kargs)
+    print(f'{label:<20} {time.perf_counter() - start:7.2f} s')
+    return beatmap
+
+if __name__ == '__main__':
+    num_sliders = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    num_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    data = generate_map(num_sliders)
+    print(f'{num_sliders} sliders, {num_workers} workers')
+
+    serial    = bench('serial', data)
+    processes = bench('processes', data, tick_workers=num_workers)
+    threads   = bench('threads', data, tick_workers=num_workers, tick_threads=True)
+
+    ticks, _ = serial.tick_array()
+    for beatmap in [ processes, threads ]:
+        assert np.array_equal(ticks, beatmap.tick_array()[0])
@@ -0,0 +1,427 @@
+"""
+Differential equivalence harness between the reference implementation and alternative engines
+
+The reference is the plain serial load (``BeatmapIO.load_beatmap`` at full
+fidelity); its per-object ``StdHoldNoteHitobjectBase.generate_tick_data``,
+``Bezier`` and timing point pass are the oracle. Every engine loads the same
+inputs and its beatmaps are compared stage by stage:
+
+    timing     - timing point arrays and bpm range
+    hitobjects - hitobject arrays (positions, start/end times, types)
+    curves     - generated slider paths
+    ticks      - tick arrays and per-hitobject tick counts
+    stacking   - stack heights
+
+Curve evaluators can also be compared on their own against ``Bezier`` with
+``run_bezier``. Inputs are a generated corpus of whole maps of every gamemode
+plus fuzzed single-slider maps covering every curve type and degenerate cases
+(repeated and collinear points, zero and very long lengths, extreme slider
+velocities). Both sides raising on an input counts as agreement; only one
+side raising is a mismatch.
+
+An engine is any callable taking *.osu file contents as a string and
+returning a ``BeatmapBase``; see ``ENGINES`` for the ones in this tree.
+
+Usage:
+    python test/equivalence.py [num maps] [num fuzzed sliders] [seed]
+"""
+import sys
+
+import numpy as np
+
+# Imported by the unit tests as part of the package; run directly, it needs the package installed
+if __package__:
+    from .. import BeatmapIO, BeatmapLoader, BeatmapCache, Gamemode, Hitobject
+    from ..src.utils.bezier import Bezier
+else:
+    from beatmap_reader import BeatmapIO, BeatmapLoader, BeatmapCache, Gamemode, Hitobject
+    from beatmap_reader.utils.bezier import Bezier
+
+
+POS_TOLERANCE_PX = 1e-6
+TIME_TOLERANCE_MS = 1e-6
+
+STAGES = ( 'timing', 'hitobjects', 'curves', 'ticks', 'stacking' )
+
+
+class StageReport():
+
+    def __init__(self):
+        self.compared   = 0
+        self.mismatches = 0        # Structural differences; counts, shapes, types, errors
+        self.max_pos    = 0.0      # osu!px
+        self.max_time   = 0.0      # ms
+        self.worst      = None     # Label of the input with the largest deviation or first mismatch
+
+
+    def add(self, label: str, pos: float = 0.0, time: float = 0.0, mismatch: bool = False):
+        self.compared += 1
+
+        if mismatch:
+            self.mismatches += 1
+            if self.worst is None or not self.worst.startswith('mismatch'):
+                self.worst = f'mismatch: {label}'
+            return
+
+        if pos > self.max_pos or time > self.max_time:
+            if self.worst is None or not self.worst.startswith('mismatch'):
+                self.worst = label
+
+        self.max_pos  = max(self.max_pos, pos)
+        self.max_time = max(self.max_time, time)
+
+
+    def passed(self, pos_tolerance: float = POS_TOLERANCE_PX, time_tolerance: float = TIME_TOLERANCE_MS) -> bool:
+        return self.mismatches == 0 and self.max_pos <= pos_tolerance and self.max_time <= time_tolerance
+
+
+
+# Engines
+
+def engine_lazy_upgrade(beatmap_data: str):
+    """
+    Loads without curves or ticks, then upgrades every slider
+    """
+    beatmap = BeatmapLoader(fidelity=Hitobject.FIDELITY_NONE).load_beatmap(beatmap_data)
+    beatmap.tick_array(Hitobject.FIDELITY_FULL)
+    return beatmap
+
+
+def engine_endpoints_upgrade(beatmap_data: str):
+    """
+    Loads with slider endpoints only, then upgrades every slider
+    """
+    beatmap = BeatmapLoader(fidelity=Hitobject.FIDELITY_ENDPOINTS).load_beatmap(beatmap_data)
+    beatmap.tick_array(Hitobject.FIDELITY_FULL)
+    return beatmap
+
+
+def engine_thread_ticks(beatmap_data: str):
+    """
+    Generates slider ticks on a thread pool, sending them back packed as the process workers do
+    """
+    threshold = BeatmapIO.PARALLEL_TICK_THRESHOLD
+    BeatmapIO.PARALLEL_TICK_THRESHOLD = 0
+
+    try: return BeatmapLoader(tick_workers=2, tick_threads=True).load_beatmap(beatmap_data)
+    finally:
+        BeatmapIO.PARALLEL_TICK_THRESHOLD = threshold
+
+
+def engine_process_ticks(beatmap_data: str):
+    """
+    Generates slider ticks on a process pool
+    """
+    threshold = BeatmapIO.PARALLEL_TICK_THRESHOLD
+    BeatmapIO.PARALLEL_TICK_THRESHOLD = 0
+
+    try: return BeatmapLoader(tick_workers=2).load_beatmap(beatmap_data)
+    finally:
+        BeatmapIO.PARALLEL_TICK_THRESHOLD = threshold
+
+
+_cache_loader = BeatmapLoader(cache=BeatmapCache(max_entries=1))
+
+def engine_cached_copy(beatmap_data: str):
+    """
+    Second load of the same data; a copy of the cached beatmap
+    """
+    _cache_loader.load_beatmap(beatmap_data)
+    return _cache_loader.load_beatmap(beatmap_data)
+
+
+ENGINES = {
+    'lazy_upgrade'      : engine_lazy_upgrade,
+    'endpoints_upgrade' : engine_endpoints_upgrade,
+    'thread_ticks'      : engine_thread_ticks,
+    'process_ticks'     : engine_process_ticks,
+    'cached_copy'       : engine_cached_copy,
+}
+
+
+def bezier_de_casteljau(curve_points, length_bound: float) -> np.ndarray:
+    """
+    Alternative ``Bezier`` evaluator using de Casteljau's algorithm, with the same subdivision count
+    """
+    curve_points = np.asarray(curve_points, dtype=np.float64)
+
+    diffs = np.diff(curve_points, axis=0)
+    approx_length = np.sum(np.sqrt(np.einsum('...i,...i', diffs, diffs)))
+    subdivisions  = int(min(approx_length, length_bound) / Bezier.APPROX_LEVEL) + 2
+
+    t = np.linspace(0, 1, subdivisions)[:, None, None]
+    points = np.broadcast_to(curve_points, (subdivisions, *curve_points.shape))
+    while points.shape[1] > 1:
+        points = (1 - t)*points[:, :-1] + t*points[:, 1:]
+
+    return points[:, 0]
+
+
+BEZIER_ENGINES = {
+    'de_casteljau' : bezier_de_casteljau,
+}
+
+
+
+# Inputs
+
+def map_header(gamemode: int, cs: float, sm: float, st: float, timing: list[str]) -> list[str]:
+    return [
+        'osu file format v14',
+        '[General]',
+        f'Mode: {gamemode}',
+        '[Difficulty]',
+        'HPDrainRate:5',
+        f'CircleSize:{cs}',
+        'OverallDifficulty:7',
+        'ApproachRate:9',
+        f'SliderMultiplier:{sm}',
+        f'SliderTickRate:{st}',
+        '[TimingPoints]',
+        *timing,
+        '[HitObjects]',
+    ]
+
+
+def random_timing(rng: np.random.Generator, length_ms: int) -> list[str]:
+    timing = [ f'0,{rng.uniform(150, 1000):.3f},4,0,0,100,1,0' ]
+
+    for offset in np.sort(rng.integers(1, max(length_ms, 2), rng.integers(0, 8))):
+        if rng.random() < 0.3:
+            timing.append(f'{offset},{rng.uniform(150, 1000):.3f},{rng.integers(3, 8)},0,0,100,1,0')
+        else:
+            timing.append(f'{offset},{-rng.uniform(10, 1000):.3f},4,0,0,100,0,0')
+
+    return timing
+
+
+def random_slider_path(rng: np.random.Generator, x: int, y: int) -> str:
+    curve_type = rng.choice([ 'L', 'P', 'B', 'C' ])
+    num_points = 2 if curve_type == 'P' and rng.random() < 0.8 else int(rng.integers(1, 9))
+
+    points = [ (x, y) ]
+    for _ in range(num_points):
+        roll = rng.random()
+
+        if roll < 0.1:    point = points[-1]                                                      # Repeated; splits beziers
+        elif roll < 0.2:  point = (2*points[-1][0] - x, 2*points[-1][1] - y)                      # Collinear
+        else:             point = tuple(int(v) for v in rng.integers(-50, [ 562, 434 ]))
+        points.append(point)
+
+    return f'{curve_type}|' + '|'.join(f'{px}:{py}' for px, py in points[1:])
+
+
+def generate_map(rng: np.random.Generator) -> str:
+    """
+    Random map of a random gamemode with circles, sliders and spinners (notes and holds for osu!mania)
+    """
+    gamemode = int(rng.choice([ Gamemode.OSU, Gamemode.OSU, Gamemode.TAIKO, Gamemode.CATCH, Gamemode.MANIA ]))
+    num_hitobjects = int(rng.integers(20, 300))
+    times = np.cumsum(rng.integers(1, 600, num_hitobjects))
+
+    lines = map_header(gamemode, 4 if gamemode != Gamemode.MANIA else int(rng.integers(4, 9)), rng.uniform(0.4, 3.6), rng.choice([ 0.5, 1, 2, 3, 4 ]), random_timing(rng, int(times[-1])))
+
+    for t in times.tolist():
+        x, y = ( int(v) for v in rng.integers(0, [ 512, 384 ]) )
+        roll = rng.random()
+
+        if gamemode == Gamemode.MANIA:
+            if roll < 0.3: lines.append(f'{x},192,{t},128,0,{t + int(rng.integers(1, 1000))}:0:0:0:0:')
+            else:          lines.append(f'{x},192,{t},1,0,0:0:0:0:')
+            continue
+
+        if roll < 0.5:    lines.append(f'{x},{y},{t},1,0,0:0:0:0:')
+        elif roll < 0.95: lines.append(f'{x},{y},{t},2,0,{random_slider_path(rng, x, y)},{rng.integers(1, 4)},{rng.uniform(1, 400):.2f}')
+        else:             lines.append(f'256,192,{t},12,0,{t + int(rng.integers(100, 3000))},0:0:0:0:')
+
+    return '\n'.join(lines) + '\n'
+
+
+def fuzz_slider(rng: np.random.Generator) -> str:
+    """
+    Map with one osu!std slider with extreme parameters
+    """
+    x, y    = ( int(v) for v in rng.integers(-20, [ 532, 404 ]) )
+    px_len  = float(rng.choice([ 0.0, 1e-3, rng.uniform(0, 20), rng.uniform(0, 600), rng.uniform(600, 5000) ]))
+    repeats = int(rng.choice([ 1, 2, 3, int(rng.integers(4, 20)) ]))
+
+    timing = [
+        f'0,{rng.choice([ 1.0, rng.uniform(20, 200), rng.uniform(200, 2000) ]):.3f},4,0,0,100,1,0',
+        f'0,{-rng.choice([ 10.0, rng.uniform(10, 100), rng.uniform(100, 1000) ]):.3f},4,0,0,100,0,0',
+    ]
+
+    lines = map_header(Gamemode.OSU, 4, rng.uniform(0.4, 3.6), rng.choice([ 0.5, 1, 2, 3, 4, 8 ]), timing)
+    lines.append(f'{x},{y},1000,2,0,{random_slider_path(rng, x, y)},{repeats},{px_len:.3f}')
+    return '\n'.join(lines) + '\n'
+
+
+def corpus(num_maps: int, num_fuzz: int, seed: int = 0):
+    """
+    Yields:
+        (label, *.osu file contents)
+    """
+    rng = np.random.default_rng(seed)
+
+    for i in range(num_maps):
+        yield f'map {i} (seed {seed})', generate_map(rng)
+
+    for i in range(num_fuzz):
+        yield f'fuzz {i} (seed {seed})', fuzz_slider(rng)
+
+
+
+# Comparison
+
+def max_abs(a: np.ndarray, b: np.ndarray) -> float:
+    if a.size == 0:
+        return 0.0
+
+    # NaN in the same places (e.g. velocities of non-sliders) is a match
+    diff = np.abs(np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64))
+    both_nan = np.isnan(a) & np.isnan(b)
+    diff[both_nan] = 0
+    return float(np.nanmax(np.where(np.isnan(diff), np.inf, diff)))
+
+
+def compare(label: str, reference, candidate, reports: dict[str, StageReport]):
+    """
+    Compares two loaded beatmaps stage by stage, adding the deviations to ``reports``
+    """
+    # Timing
+    ref_timing, cand_timing = reference.timing_array(), candidate.timing_array()
+    if ref_timing.shape != cand_timing.shape:
+        reports['timing'].add(label, mismatch=True)
+    else:
+        time_cols = [ reference.TPDATA_OFFS, reference.TPDATA_BLEN ]
+        other_dev = max_abs(np.delete(ref_timing, time_cols, axis=1), np.delete(cand_timing, time_cols, axis=1))
+        bpm_dev   = max_abs(np.asarray([ reference.bpm_min, reference.bpm_max ]), np.asarray([ candidate.bpm_min, candidate.bpm_max ]))
+        reports['timing'].add(label, time=max_abs(ref_timing[:, time_cols], cand_timing[:, time_cols]), mismatch=max(other_dev, bpm_dev) > 0)
+
+    # Hitobjects
+    ref_hobj, cand_hobj = reference.hitobject_array(), candidate.hitobject_array()
+    if ref_hobj.shape != cand_hobj.shape or not np.array_equal(ref_hobj[:, Hitobject.HDATA_TYPE], cand_hobj[:, Hitobject.HDATA_TYPE]):
+        reports['hitobjects'].add(label, mismatch=True)
+        return
+
+    reports['hitobjects'].add(label,
+        pos  = max_abs(ref_hobj[:, [ Hitobject.HDATA_POSX, Hitobject.HDATA_POSY ]], cand_hobj[:, [ Hitobject.HDATA_POSX, Hitobject.HDATA_POSY ]]),
+        time = max_abs(ref_hobj[:, [ Hitobject.HDATA_TSRT, Hitobject.HDATA_TEND ]], cand_hobj[:, [ Hitobject.HDATA_TSRT, Hitobject.HDATA_TEND ]]),
+    )
+
+    # Curves
+    for ref_slider, cand_slider in zip(reference.hitobjects, candidate.hitobjects):
+        if not ref_slider.is_htype(Hitobject.SLIDER) or not hasattr(ref_slider, 'gen_points'):
+            continue
+
+        ref_points  = np.asarray(ref_slider.gen_points, dtype=np.float64).reshape(-1, 2)
+        cand_points = np.asarray(getattr(cand_slider, 'gen_points', []), dtype=np.float64).reshape(-1, 2)
+
+        if ref_points.shape != cand_points.shape:
+            reports['curves'].add(label, mismatch=True)
+        else:
+            reports['curves'].add(label, pos=max_abs(ref_points, cand_points))
+
+    # Ticks
+    ref_ticks, ref_offsets   = reference.tick_array()
+    cand_ticks, cand_offsets = candidate.tick_array()
+
+    if not np.array_equal(ref_offsets, cand_offsets) or ref_ticks.shape != cand_ticks.shape:
+        reports['ticks'].add(label, mismatch=True)
+    else:
+        reports['ticks'].add(label, pos=max_abs(ref_ticks[:, :-1], cand_ticks[:, :-1]), time=max_abs(ref_ticks[:, -1], cand_ticks[:, -1]))
+
+    # Stacking
+    reports['stacking'].add(label, mismatch=not np.array_equal(reference.stack_heights, candidate.stack_heights))
+
+
+def run(engines: dict, inputs) -> dict[str, dict[str, StageReport]]:
+    """
+    Runs every engine over every input and compares it against the reference
+
+    Args:
+        engines: name -> callable(*.osu contents) -> BeatmapBase
+        inputs: iterable of (label, *.osu contents), e.g. ``corpus(...)``
+
+    Returns:
+        engine name -> stage -> ``StageReport``
+    """
+    reports = { name : { stage : StageReport() for stage in STAGES } for name in engines }
+
+    for label, beatmap_data in inputs:
+        try: reference = BeatmapIO.load_beatmap(beatmap_data)
+        except Exception:
+            reference = None
+
+        for name, engine in engines.items():
+            try: candidate = engine(beatmap_data)
+            except Exception:
+                candidate = None
+
+            if reference is None or candidate is None:
+                # Both raising is agreement; only one raising is a mismatch of every stage
+                if ( reference is None ) != ( candidate is None ):
+                    for stage in STAGES:
+                        reports[name][stage].add(label, mismatch=True)
+                continue
+
+            try: compare(label, reference, candidate, reports[name])
+            except Exception:
+                for stage in STAGES:
+                    reports[name][stage].add(label, mismatch=True)
+
+    return reports
+
+
+def run_bezier(engines: dict, num_curves: int, seed: int = 0) -> dict[str, StageReport]:
+    """
+    Compares curve evaluators against ``Bezier`` on random control points of degree 1 to 12
+
+    Args:
+        engines: name -> callable(control points, length bound) -> (N, 2) points
+    """
+    rng = np.random.default_rng(seed)
+    reports = { name : StageReport() for name in engines }
+
+    for i in range(num_curves):
+        points = rng.uniform(-100, 600, (int(rng.integers(2, 14)), 2)).round()
+        bound  = float(rng.uniform(0, 2000))
+        expected = np.asarray(Bezier(points.tolist(), length_bound=bound).curve_points)
+
+        for name, engine in engines.items():
+            result = np.asarray(engine(points.tolist(), bound))
+            if result.shape != expected.shape:
+                reports[name].add(f'curve {i} (seed {seed})', mismatch=True)
+            else:
+                reports[name].add(f'curve {i} (seed {seed})', pos=max_abs(expected, result))
+
+    return reports
+
+
+def print_report(reports: dict[str, dict[str, StageReport]]) -> bool:
+    """
+    Returns whether every engine passed every stage
+    """
+    passed = True
+    print(f'{"engine":<18} {"stage":<11} {"compared":>8} {"mismatch":>8} {"max px":>10} {"max ms":>10}  worst')
+
+    for name, stages in reports.items():
+        for stage, report in stages.items():
+            passed = passed and report.passed()
+            status = '' if report.passed() else '  FAIL'
+            print(f'{name:<18} {stage:<11} {report.compared:>8} {report.mismatches:>8} {report.max_pos:>10.2e} {report.max_time:>10.2e}  {report.worst or "-"}{status}')
+
+    return passed
+
+
+
+if __name__ == '__main__':
+    num_maps = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    num_fuzz = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    seed     = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    inputs  = list(corpus(num_maps, num_fuzz, seed))
+    reports = run(ENGINES, inputs)
+    for name, report in run_bezier(BEZIER_ENGINES, num_fuzz, seed).items():
+        reports[f'bezier:{name}'] = { 'curves' : report }
+
+    sys.exit(0 if print_report(reports) else 1)
@@ -0,0 +1,48 @@
+import os
+
+
+# Tests import the package relatively and find their data next to them, so they
+# run from any working directory without the package being installed
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(ROOT_DIR, 'test', 'data')
+MAPS_DIR = os.path.join(DATA_DIR, 'maps')
+
+
+def make_beatmap(hitobjects, timing_points, mode=0, general=None, metadata=None, **difficulty):
+    """
+    Builds the *.osu data of a small handmade beatmap, so tests only spell out what they vary.
+
+    Args:
+        hitobjects: (list[str]) [HitObjects] lines
+        timing_points: (list[str]) [TimingPoints] lines
+        mode: (int) gamemode
+        general: (dict) [General] entries besides the mode, e.g. { 'StackLeniency' : 0.5 }
+        metadata: (dict) [Metadata] entries; the section is left out when not given
+        **difficulty: [Difficulty] entries replacing the defaults, e.g. ApproachRate=5. None leaves the entry out
+
+    Returns:
+        (str) beatmap data
+    """
+    difficulty = {
+        'HPDrainRate'       : 5,
+        'CircleSize'        : 4,
+        'OverallDifficulty' : 5,
+        'ApproachRate'      : 8,
+        'SliderMultiplier'  : 1.4,
+        'SliderTickRate'    : 1,
+        **difficulty
+    }
+
+    lines = [ 'osu file format v14', '[General]' ]
+    lines += [ f'{key}: {value}' for key, value in (general or {}).items() ]
+    lines += [ f'Mode: {mode}' ]
+
+    if metadata is not None:
+        lines += [ '[Metadata]' ]
+        lines += [ f'{key}:{value}' for key, value in metadata.items() ]
+
+    lines += [ '[Difficulty]' ]
+    lines += [ f'{key}:{value}' for key, value in difficulty.items() if value is not None ]
+    lines += [ '[TimingPoints]', *timing_points ]
+    lines += [ '[HitObjects]', *hitobjects ]
+    return '\n'.join(lines)
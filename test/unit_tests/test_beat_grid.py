@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from ... import BeatmapIO, BeatGrid
+from . import make_beatmap
+
+
+class TestBeatGrid(unittest.TestCase):
+
+    TIMING_POINTS = [
+        '0,500,4,0,0,100,1,0',
+        '1000,-50,4,0,0,100,0,0',
+        '4000,300,3,0,0,100,1,0',
+    ]
+
+    HITOBJECTS = [
+        '256,192,0,1,0,0:0:0:0:',
+        '256,192,250,1,0,0:0:0:0:',
+        '256,192,1167,1,0,0:0:0:0:',
+        '256,192,1375,1,0,0:0:0:0:',
+        '256,192,1400,1,0,0:0:0:0:',
+        '256,192,4900,1,0,0:0:0:0:',
+        '256,192,5050,1,0,0:0:0:0:',
+    ]
+
+    def setUp(self):
+        self.beatmap = BeatmapIO.load_beatmap(make_beatmap(TestBeatGrid.HITOBJECTS, TestBeatGrid.TIMING_POINTS))
+
+
+    def test_lines(self):
+        times, is_measure = BeatGrid.lines(self.beatmap, end_time=5000)
+
+        self.assertTrue(np.allclose(times[:8], [ 0, 500, 1000, 1500, 2000, 2500, 3000, 3500 ]))
+        self.assertTrue(np.allclose(times[8:], [ 4000, 4300, 4600, 4900 ]))
+        self.assertEqual(is_measure.tolist(), [ True, False, False, False ]*2 + [ True, False, False, True ])
+
+
+    def test_snap(self):
+        start_snaps, end_snaps = BeatGrid.snap_hitobjects(self.beatmap)
+
+        self.assertEqual(start_snaps.tolist(), [ 1, 2, 3, 4, 0, 1, 2 ])
+        self.assertEqual(end_snaps.tolist(), [ 0 ]*7)
+
+
+    def test_locate(self):
+        measures, beats = BeatGrid.locate(self.beatmap, [ 0, 2500, 4000, 4899, 4900 ])
+
+        self.assertEqual(measures.tolist(), [ 0, 1, 2, 3, 3 ])
+        self.assertTrue(np.allclose(beats, [ 0, 1, 0, -1/300, 0 ]))
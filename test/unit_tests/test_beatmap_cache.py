@@ -0,0 +1,159 @@
+import unittest
+import threading
+
+import numpy as np
+
+from ... import BeatmapIO, BeatmapCache, Hitobject, Mods
+from . import make_beatmap
+
+
+class TestBeatmapCache(unittest.TestCase):
+
+    HITOBJECTS = [
+        '100,100,0,1,0,0:0:0:0:',
+        '100,100,1000,2,0,L|300:100,2,200',
+    ]
+
+    @staticmethod
+    def data(ar: float) -> str:
+        return make_beatmap(TestBeatmapCache.HITOBJECTS, [ '0,500,4,0,0,100,1,0' ], ApproachRate=ar)
+
+
+    def setUp(self):
+        self.cache = BeatmapIO.enable_cache(max_entries=2)
+
+
+    def tearDown(self):
+        BeatmapIO.disable_cache()
+
+
+    def test_hits(self):
+        data = TestBeatmapCache.data(8)
+
+        first  = BeatmapIO.load_beatmap(data)
+        second = BeatmapIO.load_beatmap(data)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+        # Copies; the difficulty can be changed without affecting the cached beatmap
+        self.assertIsNot(first, second)
+
+        second.set_ar(10)
+        self.assertEqual(BeatmapIO.load_beatmap(data).difficulty.ar, 8)
+        self.assertEqual(BeatmapIO.load_beatmap(data).apply_mods(Mods.HR).difficulty.ar, 10)
+
+        # Bytes and str with the same contents are separate entries, as is another fidelity
+        BeatmapIO.load_beatmap(data.encode('utf-8'))
+        BeatmapIO.load_beatmap(data, fidelity=Hitobject.FIDELITY_NONE)
+        self.assertEqual(self.cache.stats()['misses'], 3)
+
+
+    def test_bytes(self):
+        data = TestBeatmapCache.data(8).replace('\n', '\r\n').encode('utf-8')
+
+        BeatmapIO.disable_cache()
+        uncached = BeatmapIO.load_beatmap(data)
+        BeatmapIO.enable_cache()
+
+        BeatmapIO.load_beatmap(data)
+        cached = BeatmapIO.load_beatmap(data)
+
+        self.assertEqual(cached.metadata.beatmap_md5, uncached.metadata.beatmap_md5)
+        self.assertTrue(np.array_equal(cached.hitobject_array(), uncached.hitobject_array()))
+        self.assertTrue(np.array_equal(cached.tick_array()[0], uncached.tick_array()[0]))
+
+
+    def test_read_only(self):
+        data = TestBeatmapCache.data(8)
+        beatmap = BeatmapIO.load_beatmap(data)
+
+        # The shared hitobjects can't be changed in place, so the cached entry can't be corrupted
+        with self.assertRaises(AttributeError):
+            beatmap.hitobjects.pop()
+
+        with self.assertRaises(TypeError):
+            beatmap.hitobjects[0].hdata[Hitobject.HDATA_POSX] = -999
+
+        with self.assertRaises(ValueError):
+            beatmap.hitobjects[1].tdata[0, Hitobject.TDATA_X] = -999
+
+        with self.assertRaises(AttributeError):
+            beatmap.timing_points.append(None)
+
+        reloaded = BeatmapIO.load_beatmap(data)
+        self.assertEqual(len(reloaded.hitobjects), 2)
+        self.assertEqual(reloaded.hitobjects[0].pos_x(), 100)
+
+        # Replacing them is fine and leaves the cached entry alone
+        beatmap.hitobjects = beatmap.hitobjects[:1]
+        modded = beatmap.apply_mods(Mods.HR | Mods.DT)
+        self.assertEqual(len(BeatmapIO.load_beatmap(data).hitobjects), 2)
+        self.assertEqual(BeatmapIO.load_beatmap(data).hitobjects[0].pos_y(), 100)
+        self.assertEqual(modded.hitobjects[0].pos_y(), 284)
+
+
+    def test_upgrade(self):
+        data = TestBeatmapCache.data(8)
+
+        first = BeatmapIO.load_beatmap(data, fidelity=Hitobject.FIDELITY_NONE)
+        ticks = first.tick_array(Hitobject.FIDELITY_NONE)[0]
+        first.tick_array()
+        self.assertEqual(first.hitobjects[1].fidelity, Hitobject.FIDELITY_FULL)
+
+        # Upgrading a copy leaves the cached sliders and other copies at the loaded fidelity
+        second = BeatmapIO.load_beatmap(data, fidelity=Hitobject.FIDELITY_NONE)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(second.hitobjects[1].fidelity, Hitobject.FIDELITY_NONE)
+        self.assertTrue(np.array_equal(second.tick_array(Hitobject.FIDELITY_NONE)[0], ticks))
+
+        # Circles are still shared
+        self.assertIs(first.hitobjects[0], second.hitobjects[0])
+        self.assertIsNot(first.hitobjects[1], second.hitobjects[1])
+
+
+    def test_default_loader(self):
+        # Enabling the cache installs a new default loader instead of changing the one handed out
+        loader = BeatmapIO.default_loader
+        cache  = BeatmapIO.enable_cache()
+
+        self.assertIsNot(BeatmapIO.default_loader, loader)
+        self.assertIs(BeatmapIO.default_loader.cache, cache)
+        self.assertIs(loader.cache, self.cache)
+
+        BeatmapIO.disable_cache()
+        self.assertIsNone(BeatmapIO.default_loader.cache)
+        self.assertIs(loader.cache, self.cache)
+
+
+    def test_eviction(self):
+        for ar in [ 1, 2, 1, 3 ]:
+            BeatmapIO.load_beatmap(TestBeatmapCache.data(ar))
+
+        # AR 1 was used more recently than AR 2, so AR 2 is the one evicted
+        stats = self.cache.stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['evictions'], 1)
+
+        BeatmapIO.load_beatmap(TestBeatmapCache.data(1))
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+        # Byte capacity
+        cache = BeatmapCache(max_entries=None, max_bytes=1)
+        cache.put('key', BeatmapIO.load_beatmap(TestBeatmapCache.data(1)))
+        self.assertEqual(len(cache), 0)
+
+
+    def test_threads(self):
+        data    = [ TestBeatmapCache.data(ar) for ar in [ 1, 2 ] ]
+        results = []
+
+        def load():
+            for i in range(20):
+                results.append(BeatmapIO.load_beatmap(data[i % 2]).difficulty.ar)
+
+        threads = [ threading.Thread(target=load) for _ in range(4) ]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+
+        self.assertEqual(sorted(set(results)), [ 1, 2 ])
+        self.assertEqual(self.cache.stats()['hits'] + self.cache.stats()['misses'], 80)
@@ -0,0 +1,50 @@
+import unittest
+import os
+import tempfile
+
+import numpy as np
+
+from ... import BeatmapIO, BeatmapCorpus, BeatmapCorpusWriter
+from . import MAPS_DIR
+
+
+class TestBeatmapCorpus(unittest.TestCase):
+
+    MAPS = [
+        os.path.join(MAPS_DIR, 'osu', 'Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'),
+        os.path.join(MAPS_DIR, 'mania', 'Camellia - GHOST (qqqant) [Collab PHANTASM [MX]].osu'),
+        os.path.join(MAPS_DIR, 'osu', 'abraker - unknown (abraker) [slider_test].osu'),
+    ]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path   = os.path.join(self.tmpdir.name, 'maps.corpus')
+
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+
+    def test_build_and_append(self):
+        with BeatmapCorpusWriter(self.path) as writer:
+            self.assertEqual(writer.add_files(TestBeatmapCorpus.MAPS[:2]), 2)
+
+        with BeatmapCorpusWriter(self.path) as writer:
+            self.assertEqual(writer.add(BeatmapIO.open_beatmap(TestBeatmapCorpus.MAPS[2])), 2)
+
+        corpus = BeatmapCorpus(self.path)
+        self.assertEqual(len(corpus), 3)
+
+        for i, path in enumerate(TestBeatmapCorpus.MAPS):
+            beatmap = BeatmapIO.open_beatmap(path)
+            ticks, tick_offsets = beatmap.tick_array()
+
+            entry = corpus[i]
+            self.assertTrue(np.array_equal(entry.hitobjects, beatmap.hitobject_array()))
+            self.assertTrue(np.array_equal(entry.ticks, ticks))
+            self.assertTrue(np.array_equal(entry.tick_offsets, tick_offsets))
+            self.assertTrue(np.array_equal(entry.timing_points, beatmap.timing_array()))
+            self.assertEqual(corpus.metadata(i)['md5'], beatmap.metadata.beatmap_md5)
+
+        self.assertEqual(corpus.metadata(0)['source'], TestBeatmapCorpus.MAPS[0])
+        self.assertIsNone(corpus.metadata(2)['source'])
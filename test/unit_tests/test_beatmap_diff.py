@@ -0,0 +1,87 @@
+import unittest
+
+from ... import BeatmapIO, Mods, diff_beatmaps
+from . import make_beatmap
+
+
+class TestBeatmapDiff(unittest.TestCase):
+
+    HITOBJECTS = [
+        '100,100,0,1,0,0:0:0:0:',
+        '200,100,500,1,0,0:0:0:0:',
+        '300,100,500,1,0,0:0:0:0:',
+        '100,100,1000,2,0,L|300:100,1,200',
+        '256,192,3000,12,0,4000,0:0:0:0:',
+    ]
+
+    def load(self, hitobjects: list[str], timing: str = '1000,-50,4,0,0,100,0,0'):
+        return BeatmapIO.load_beatmap(make_beatmap(hitobjects, [ '0,500,4,0,0,100,1,0', timing ]))
+
+
+    def test_identical(self):
+        diff = diff_beatmaps(self.load(TestBeatmapDiff.HITOBJECTS), self.load(TestBeatmapDiff.HITOBJECTS))
+        self.assertTrue(diff.is_empty())
+        self.assertEqual(diff.matched.tolist(), [ [ i, i ] for i in range(5) ])
+
+
+    def test_changes(self):
+        hitobjects = list(TestBeatmapDiff.HITOBJECTS)
+        hitobjects[0] = '120,100,0,1,0,0:0:0:0:'                  # moved
+        hitobjects[3] = '100,100,1000,2,0,L|300:150,1,200'        # path changed
+        del hitobjects[1]                                         # deleted
+        hitobjects.insert(3, '400,300,2000,1,0,0:0:0:0:')         # inserted
+
+        a = self.load(TestBeatmapDiff.HITOBJECTS)
+        b = self.load(hitobjects, timing='1000,-100,4,0,0,100,0,0')
+        diff = diff_beatmaps(a, b)
+
+        # The remaining circle at 500 ms pairs up with the first one at that time
+        self.assertEqual(diff.deleted.tolist(), [ 2 ])
+        self.assertEqual(diff.inserted.tolist(), [ 3 ])
+
+        modified = { i : changes for i, _, changes in diff.modified }
+        self.assertEqual(modified[0], { 'x' : (100, 120) })
+        self.assertEqual(modified[1], { 'x' : (200, 300) })
+        self.assertEqual(modified[3]['curve_points'], ([ [ 100, 100 ], [ 300, 100 ] ], [ [ 100, 100 ], [ 300, 150 ] ]))
+
+        self.assertEqual(diff.timing_modified, [ (1, 1, { 'beat_interval' : (-50, -100) }) ])
+        self.assertEqual(diff.summary()['inserted'], 1)
+
+
+    def test_object_fields(self):
+        hitobjects = list(TestBeatmapDiff.HITOBJECTS)
+        hitobjects[3] = '100,100,1000,2,0,L|200:100|300:100,1,200'   # point added to the path
+
+        diff = diff_beatmaps(self.load(TestBeatmapDiff.HITOBJECTS), self.load(hitobjects))
+        self.assertEqual([ (i, list(changes)) for i, _, changes in diff.modified ], [ (3, [ 'curve_points' ]) ])
+
+        # Only the length changed
+        hitobjects[3] = '100,100,1000,2,0,L|300:100,1,150'
+        diff = diff_beatmaps(self.load(TestBeatmapDiff.HITOBJECTS), self.load(hitobjects))
+        self.assertEqual(diff.modified[-1][2]['px_len'], (200, 150))
+
+        # Nothing to align
+        self.assertTrue(diff_beatmaps(self.load([]), self.load([])).is_empty())
+
+
+    def test_shift(self):
+        hitobjects = list(TestBeatmapDiff.HITOBJECTS)
+        hitobjects[0] = '100,100,10,1,0,0:0:0:0:'
+
+        a = self.load(TestBeatmapDiff.HITOBJECTS)
+        b = self.load(hitobjects)
+
+        self.assertEqual(len(diff_beatmaps(a, b).deleted), 1)
+
+        diff = diff_beatmaps(a, b, max_shift_ms=20)
+        self.assertEqual(len(diff.deleted), 0)
+        self.assertEqual(diff.modified, [ (0, 0, { 'start_time' : (0, 10), 'end_time' : (1, 11) }) ])
+
+
+    def test_mods(self):
+        beatmap = self.load(TestBeatmapDiff.HITOBJECTS)
+        diff = diff_beatmaps(beatmap, beatmap.apply_mods(Mods.HR))
+
+        # Everything but the spinner in the middle of the playfield flips
+        self.assertEqual([ i for i, _, _ in diff.modified ], [ 0, 1, 2, 3 ])
+        self.assertIn('ar', diff.difficulty_changes)
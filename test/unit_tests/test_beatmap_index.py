@@ -0,0 +1,54 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from ... import BeatmapIndex, Gamemode
+from . import MAPS_DIR
+
+
+class TestBeatmapIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir    = tempfile.TemporaryDirectory()
+        self.songs_dir = os.path.join(self.tmpdir.name, 'Songs')
+
+        shutil.copytree(MAPS_DIR, self.songs_dir)
+        self.index = BeatmapIndex(os.path.join(self.tmpdir.name, 'index.db'))
+
+
+    def tearDown(self):
+        self.index.close()
+        self.tmpdir.cleanup()
+
+
+    def test_incremental_update(self):
+        counts = self.index.update(self.songs_dir)
+        self.assertEqual(counts['added'], 5)
+        self.assertEqual(len(self.index), 5)
+
+        counts = self.index.update(self.songs_dir)
+        self.assertEqual(counts['added'], 0)
+        self.assertEqual(counts['unchanged'], 5)
+
+        path = os.path.join(self.songs_dir, 'osu', 'stargazer.osu')
+        os.remove(path)
+        os.utime(os.path.join(self.songs_dir, 'osu', 'abraker - unknown (abraker) [250ms].osu'), ns=(0, 0))
+
+        counts = self.index.update(self.songs_dir)
+        self.assertEqual(counts['removed'], 1)
+        self.assertEqual(counts['updated'], 1)
+        self.assertIsNone(self.index.get(path))
+
+
+    def test_find(self):
+        self.index.update(self.songs_dir)
+
+        mania = self.index.find(gamemode=Gamemode(Gamemode.MANIA), od=(8, None))
+        self.assertEqual(len(mania), 1)
+        self.assertEqual(mania[0]['title'], 'GHOST')
+
+        self.assertEqual(len(self.index.find(gamemode=Gamemode.MANIA, od=(None, 1))), 0)
+
+        with self.assertRaises(BeatmapIndex.BeatmapIndexException):
+            self.index.find(not_a_column=1)
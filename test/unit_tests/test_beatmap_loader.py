@@ -0,0 +1,51 @@
+import unittest
+import concurrent.futures
+
+import numpy as np
+
+from ... import BeatmapIO, BeatmapLoader, BeatmapCache, Hitobject
+from . import make_beatmap
+
+
+class TestBeatmapLoader(unittest.TestCase):
+
+    BEATMAP = make_beatmap([
+        '100,100,0,1,0,0:0:0:0:',
+        '100,100,1000,2,0,B|200:300|300:100,2,300',
+        '256,192,3000,12,0,4000,0:0:0:0:',
+    ], [ '0,500,4,0,0,100,1,0' ])
+
+    def test_options(self):
+        full = BeatmapLoader()
+        lazy = BeatmapLoader(fidelity=Hitobject.FIDELITY_NONE, cache=BeatmapCache())
+
+        beatmap      = full.load_beatmap(TestBeatmapLoader.BEATMAP)
+        lazy_beatmap = lazy.load_beatmap(TestBeatmapLoader.BEATMAP)
+
+        self.assertEqual(beatmap.hitobjects[1].fidelity, Hitobject.FIDELITY_FULL)
+        self.assertEqual(lazy_beatmap.hitobjects[1].fidelity, Hitobject.FIDELITY_NONE)
+        self.assertIsNone(full.cache)
+        self.assertEqual(lazy.cache.stats()['misses'], 1)
+
+        # Derived loaders share the cache
+        endpoints = lazy.with_options(fidelity=Hitobject.FIDELITY_ENDPOINTS)
+        self.assertIs(endpoints.cache, lazy.cache)
+        self.assertEqual(endpoints.tick_workers, lazy.tick_workers)
+
+        with self.assertRaises(ValueError):
+            BeatmapLoader(fidelity='some')
+
+        # Static methods use the default loader
+        self.assertIsNone(BeatmapIO.default_loader.cache)
+        self.assertTrue(np.array_equal(BeatmapIO.load_beatmap(TestBeatmapLoader.BEATMAP).tick_array()[0], beatmap.tick_array()[0]))
+
+
+    def test_threads(self):
+        loader   = BeatmapLoader()
+        expected = loader.load_beatmap(TestBeatmapLoader.BEATMAP).tick_array()[0]
+
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            beatmaps = list(pool.map(loader.load_beatmap, [ TestBeatmapLoader.BEATMAP ]*16))
+
+        for beatmap in beatmaps:
+            self.assertTrue(np.array_equal(beatmap.tick_array()[0], expected))
@@ -0,0 +1,143 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+from ... import BeatmapIO, BeatmapWatcher
+from . import MAPS_DIR
+
+
+class TestBeatmapWatcher(unittest.TestCase):
+
+    MAP = os.path.join(MAPS_DIR, 'osu', 'stargazer.osu')
+
+    def setUp(self):
+        self.tmp_dir  = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.tmp_dir, 'map.osu')
+        self.mtime_ns = os.stat(TestBeatmapWatcher.MAP).st_mtime_ns
+
+        shutil.copy(TestBeatmapWatcher.MAP, self.filepath)
+
+        with open(self.filepath, 'rt', encoding='utf-8') as f:
+            self.lines = f.read().splitlines()
+
+        self.hitobjects_idx = self.lines.index('[HitObjects]') + 1
+
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+
+    def write(self, lines: list[str]):
+        with open(self.filepath, 'wt', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+        # Filesystem timestamps may be too coarse to tell quick edits apart
+        self.mtime_ns += 1000000000
+        os.utime(self.filepath, ns=(self.mtime_ns, self.mtime_ns))
+
+
+    def assertSameAsLoaded(self, beatmap):
+        loaded = BeatmapIO.open_beatmap(self.filepath)
+
+        ticks, offsets = beatmap.tick_array()
+        loaded_ticks, loaded_offsets = loaded.tick_array()
+
+        self.assertTrue(np.array_equal(beatmap.hitobject_array(), loaded.hitobject_array()))
+        self.assertTrue(np.array_equal(ticks, loaded_ticks))
+        self.assertTrue(np.array_equal(offsets, loaded_offsets))
+        self.assertTrue(np.array_equal(beatmap.stack_heights, loaded.stack_heights))
+        self.assertEqual(beatmap.metadata.beatmap_md5, loaded.metadata.beatmap_md5)
+
+
+    def test_incremental(self):
+        watcher = BeatmapWatcher()
+
+        changes = watcher.watch(self.tmp_dir)
+        self.assertEqual([ change.kind for change in changes ], [ BeatmapWatcher.Change.ADDED ])
+        beatmap = watcher.get(self.filepath)
+
+        # Edit one hitobject in the middle
+        lines = list(self.lines)
+        k = 100
+        data = lines[self.hitobjects_idx + k].split(',')
+        data[0] = str(int(data[0]) + 7)
+        lines[self.hitobjects_idx + k] = ','.join(data)
+        self.write(lines)
+
+        changes = watcher.poll()
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].kind, BeatmapWatcher.Change.MODIFIED)
+        self.assertEqual(changes[0].sections, [ '[HitObjects]' ])
+        self.assertEqual(changes[0].hitobjects, (k, k + 1, k + 1))
+        self.assertIs(changes[0].beatmap, beatmap)
+        self.assertSameAsLoaded(beatmap)
+
+        # Append and remove hitobjects
+        num_hitobjects = len(beatmap.hitobjects)
+        del lines[self.hitobjects_idx + 10:self.hitobjects_idx + 13]
+        lines.append(lines[-1].replace(lines[-1].split(',')[2], str(int(lines[-1].split(',')[2]) + 500), 1))
+        self.write(lines)
+
+        changes = watcher.poll()
+        self.assertEqual(changes[0].hitobjects, (10, num_hitobjects, num_hitobjects - 2))
+        self.assertSameAsLoaded(beatmap)
+
+        # Touching without changes is not a change
+        self.write(lines)
+        self.assertEqual(watcher.poll(), [])
+
+
+    def test_full_reload(self):
+        watcher = BeatmapWatcher()
+        watcher.watch(self.filepath)
+
+        lines = [ 'OverallDifficulty:2' if line.startswith('OverallDifficulty:') else line for line in self.lines ]
+        self.write(lines)
+
+        changes = watcher.poll()
+        self.assertEqual(changes[0].sections, [ '[Difficulty]' ])
+        self.assertIsNone(changes[0].hitobjects)
+        self.assertEqual(watcher.get(self.filepath).difficulty.od, 2)
+        self.assertSameAsLoaded(watcher.get(self.filepath))
+
+
+    def test_failed_and_removed(self):
+        received = []
+
+        watcher = BeatmapWatcher()
+        watcher.subscribe(received.append)
+        watcher.watch(self.tmp_dir)
+        beatmap = watcher.get(self.filepath)
+
+        lines = list(self.lines)
+        lines[self.hitobjects_idx] = '1,2,3,not a type'
+        self.write(lines)
+
+        changes = watcher.poll()
+        self.assertEqual(changes[0].kind, BeatmapWatcher.Change.FAILED)
+        self.assertIs(watcher.get(self.filepath), beatmap)
+
+        os.remove(self.filepath)
+        watcher.poll()
+
+        self.assertEqual([ change.kind for change in received ], [ BeatmapWatcher.Change.ADDED, BeatmapWatcher.Change.FAILED, BeatmapWatcher.Change.REMOVED ])
+        self.assertEqual(len(watcher), 0)
+
+
+    def test_background(self):
+        modified = threading.Event()
+
+        with BeatmapWatcher(poll_interval=0.05) as watcher:
+            watcher.watch(self.tmp_dir)
+            watcher.subscribe(lambda change: modified.set() if change.kind == BeatmapWatcher.Change.MODIFIED else None)
+            watcher.start()
+
+            lines = list(self.lines)
+            lines.append(lines[-1])
+            self.write(lines)
+
+            self.assertTrue(modified.wait(5))
@@ -0,0 +1,67 @@
+import unittest
+import os
+import io
+import tempfile
+
+import numpy as np
+
+from ... import BeatmapIO, Mods
+from . import MAPS_DIR
+
+
+class TestBeatmapWriter(unittest.TestCase):
+
+    MAPS = [
+        os.path.join(MAPS_DIR, 'osu', 'Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'),
+        os.path.join(MAPS_DIR, 'osu', 'abraker - unknown (abraker) [slider_test].osu'),
+        os.path.join(MAPS_DIR, 'osu', 'stargazer.osu'),
+        os.path.join(MAPS_DIR, 'mania', 'Camellia - GHOST (qqqant) [Collab PHANTASM [MX]].osu'),
+    ]
+
+    def assertBeatmapEqual(self, a, b):
+        self.assertEqual(a.metadata.name, b.metadata.name)
+        self.assertEqual(a.metadata.beatmap_format, b.metadata.beatmap_format)
+        self.assertEqual(vars(a.difficulty), vars(b.difficulty))
+        self.assertEqual(a.gamemode, b.gamemode)
+        self.assertTrue(np.array_equal(a.timing_array(), b.timing_array()))
+        self.assertTrue(np.array_equal(a.hitobject_array(), b.hitobject_array()))
+
+        ticks_a, offsets_a = a.tick_array()
+        ticks_b, offsets_b = b.tick_array()
+        self.assertTrue(np.array_equal(offsets_a, offsets_b))
+        self.assertTrue(np.allclose(ticks_a, ticks_b))
+
+
+    def test_round_trip(self):
+        for path in TestBeatmapWriter.MAPS:
+            beatmap = BeatmapIO.open_beatmap(path)
+
+            stream = io.StringIO()
+            BeatmapIO.write_beatmap(beatmap, stream)
+            self.assertBeatmapEqual(beatmap, BeatmapIO.load_beatmap(stream.getvalue()))
+
+
+    def test_mods(self):
+        beatmap = BeatmapIO.open_beatmap(os.path.join(MAPS_DIR, 'osu', 'stargazer.osu'))
+
+        # Rate changed times aren't whole ms, so slider end times wouldn't survive the round trip
+        for mods in [ Mods.DOUBLETIME, Mods.HALFTIME, Mods.HARDROCK ]:
+            with self.assertRaises(ValueError):
+                BeatmapIO.write_beatmap(beatmap.apply_mods(mods), io.StringIO())
+
+        # The beatmap the mods were applied to still writes, and applying them after reading gives the same result
+        stream = io.StringIO()
+        BeatmapIO.write_beatmap(beatmap, stream)
+
+        expected = beatmap.apply_mods(Mods.DOUBLETIME)
+        result   = BeatmapIO.load_beatmap(stream.getvalue()).apply_mods(Mods.DOUBLETIME)
+        self.assertBeatmapEqual(expected, result)
+
+
+    def test_write_beatmaps(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            beatmaps = [ (BeatmapIO.open_beatmap(path), os.path.join(tmpdir, f'{i}.osu')) for i, path in enumerate(TestBeatmapWriter.MAPS) ]
+            BeatmapIO.write_beatmaps(beatmaps)
+
+            for beatmap, filepath in beatmaps:
+                self.assertBeatmapEqual(beatmap, BeatmapIO.open_beatmap(filepath))
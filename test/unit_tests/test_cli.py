@@ -0,0 +1,85 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import contextlib
+
+import numpy as np
+
+from ... import BeatmapIO
+from ...src.cli import main
+from . import MAPS_DIR
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+
+    def run_main(self, argv: list[str]) -> int:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            return main(argv)
+
+
+    def test_load_errors(self):
+        broken = os.path.join(self.tmp_dir, 'broken.osu')
+        with open(broken, 'wt') as f:
+            f.write('osu file format v14\n\n[Difficulty]\nSliderMultiplier:1.4\n')
+
+        errors = os.path.join(self.tmp_dir, 'errors.jsonl')
+        self.assertEqual(self.run_main([ 'load', MAPS_DIR, broken, '--errors', errors ]), 0)
+
+        with open(errors) as f:
+            records = [ json.loads(line) for line in f ]
+
+        self.assertEqual([ record['path'] for record in records ], [ broken ])
+
+
+    def test_dump_json(self):
+        output = os.path.join(self.tmp_dir, 'maps.jsonl')
+        self.assertEqual(self.run_main([ 'dump', MAPS_DIR, '-o', output, '--ticks' ]), 0)
+
+        with open(output) as f:
+            records = [ json.loads(line) for line in f ]
+
+        self.assertEqual(len(records), 5)
+
+        beatmap = BeatmapIO.open_beatmap(records[0]['path'])
+        ticks, offsets = beatmap.tick_array()
+        self.assertEqual(records[0]['md5'], beatmap.metadata.beatmap_md5)
+        self.assertTrue(np.array_equal(np.asarray(records[0]['ticks']).reshape(ticks.shape), ticks))
+        self.assertTrue(np.array_equal(records[0]['tick_offsets'], offsets))
+
+
+    def test_dump_npz(self):
+        output = os.path.join(self.tmp_dir, 'npz')
+        self.assertEqual(self.run_main([ 'dump', MAPS_DIR, '-o', output, '--format', 'npz', '--ticks' ]), 0)
+
+        with open(os.path.join(output, 'metadata.jsonl')) as f:
+            records = [ json.loads(line) for line in f ]
+
+        for record in records:
+            beatmap = BeatmapIO.open_beatmap(record['path'])
+            with np.load(os.path.join(output, record['npz'])) as arrays:
+                self.assertTrue(np.array_equal(arrays['hitobjects'], beatmap.hitobject_array()))
+
+
+    def test_index(self):
+        db_path = os.path.join(self.tmp_dir, 'maps.db')
+        self.assertEqual(self.run_main([ 'index', MAPS_DIR, db_path ]), 0)
+        self.assertEqual(self.run_main([ 'index', MAPS_DIR, db_path ]), 0)
+        self.assertTrue(os.path.exists(db_path))
+
+
+    def test_profile(self):
+        pstats_path = os.path.join(self.tmp_dir, 'map.prof')
+        filepath = os.path.join(MAPS_DIR, 'osu', 'abraker - unknown (abraker) [250ms].osu')
+
+        self.assertEqual(self.run_main([ 'profile', filepath, '--repeat', '1', '--top', '3', '--pstats', pstats_path ]), 0)
+        self.assertTrue(os.path.exists(pstats_path))
@@ -0,0 +1,76 @@
+import unittest
+import os
+
+import numpy as np
+
+from ... import BeatmapIO, Gamemode, Hitobject, Mods
+from . import MAPS_DIR
+
+
+class TestDerivedDifficulty(unittest.TestCase):
+
+    def setUp(self):
+        self.beatmap = BeatmapIO.open_beatmap(os.path.join(MAPS_DIR, 'osu', 'Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'))
+
+
+    def test_values(self):
+        self.beatmap.set_ar(9)
+        self.beatmap.set_od(5)
+        self.beatmap.set_cs(4)
+
+        derived = self.beatmap.derived
+        self.assertAlmostEqual(derived.preempt, 600)
+        self.assertAlmostEqual(derived.fade_in, 400)
+        self.assertAlmostEqual(derived.hit_windows[300], 50)
+        self.assertAlmostEqual(derived.hit_windows[100], 100)
+        self.assertAlmostEqual(derived.hit_windows[50], 150)
+        self.assertAlmostEqual(derived.circle_radius, 36.48)
+
+        self.assertAlmostEqual(self.beatmap.apply_mods(Mods.DT).derived.preempt, 400)
+
+
+    def test_hit_windows_taiko(self):
+        self.beatmap.gamemode = Gamemode.TAIKO
+
+        self.beatmap.set_od(5)
+        self.assertEqual(set(self.beatmap.derived.hit_windows), { 300, 100 })
+        self.assertAlmostEqual(self.beatmap.derived.hit_windows[300], 35)
+        self.assertAlmostEqual(self.beatmap.derived.hit_windows[100], 80)
+
+        self.beatmap.set_od(2)
+        self.assertAlmostEqual(self.beatmap.derived.hit_windows[300], 44)
+        self.assertAlmostEqual(self.beatmap.derived.hit_windows[100], 104)
+
+        self.beatmap.set_od(8)
+        self.assertAlmostEqual(self.beatmap.derived.hit_windows[300], 26)
+        self.assertAlmostEqual(self.beatmap.derived.hit_windows[100], 62)
+
+
+    def test_hit_windows_catch(self):
+        self.beatmap.gamemode = Gamemode.CATCH
+        self.beatmap.set_od(5)
+
+        self.assertEqual(self.beatmap.derived.hit_windows, {})
+        self.assertNotIn('hit_window_300', self.beatmap.derived.scalars())
+        self.assertIsNotNone(self.beatmap.derived.circle_radius)
+
+
+    def test_recomputed_by_setters(self):
+        derived = self.beatmap.derived
+        self.assertIs(self.beatmap.derived, derived)
+
+        self.beatmap.set_ar(10)
+        self.assertIsNot(self.beatmap.derived, derived)
+        self.assertAlmostEqual(self.beatmap.derived.preempt, 450)
+
+
+    def test_slider_velocities(self):
+        derived = self.beatmap.derived
+
+        for i, hitobject in enumerate(self.beatmap.hitobjects):
+            if not hitobject.is_htype(Hitobject.SLIDER):
+                self.assertTrue(np.isnan(derived.velocities[i]))
+                continue
+
+            end_time = hitobject.start_time() + hitobject.repeats * hitobject.px_len / derived.velocities[i]
+            self.assertAlmostEqual(end_time, derived.end_times[i])
@@ -0,0 +1,34 @@
+import unittest
+
+from .. import equivalence
+
+
+class TestEquivalence(unittest.TestCase):
+
+    def test_engines(self):
+        # Process pool engine is left to the full harness run; it's slow to spin up
+        engines = { name : engine for name, engine in equivalence.ENGINES.items() if name != 'process_ticks' }
+        reports = equivalence.run(engines, equivalence.corpus(4, 20, seed=1))
+
+        for name, stages in reports.items():
+            for stage, report in stages.items():
+                self.assertTrue(report.passed(), f'{name} {stage}: {report.worst}')
+
+
+    def test_bezier(self):
+        reports = equivalence.run_bezier(equivalence.BEZIER_ENGINES, 20, seed=1)
+
+        for name, report in reports.items():
+            self.assertTrue(report.passed(), f'{name}: {report.worst}')
+
+
+    def test_detects_mismatch(self):
+        def shifted(beatmap_data):
+            beatmap = equivalence.BeatmapIO.load_beatmap(beatmap_data)
+            for hitobject in beatmap.hitobjects:
+                hitobject.hdata[equivalence.Hitobject.HDATA_POSX] += 1
+            return beatmap
+
+        reports = equivalence.run({ 'shifted' : shifted }, equivalence.corpus(1, 0, seed=1))
+        self.assertFalse(reports['shifted']['hitobjects'].passed())
+        self.assertTrue(reports['shifted']['timing'].passed())
@@ -0,0 +1,44 @@
+import unittest
+import os
+import math
+
+import numpy as np
+
+from ... import BeatmapIO, Hitobject, Features
+from . import MAPS_DIR
+
+
+class TestFeatures(unittest.TestCase):
+
+    def test_std(self):
+        beatmap  = BeatmapIO.open_beatmap(os.path.join(MAPS_DIR, 'osu', 'Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'))
+        features = Features.extract(beatmap)
+
+        hitobjects = beatmap.hitobjects
+        self.assertTrue(np.isnan(features['time_deltas'][0]))
+
+        for i in range(1, len(hitobjects)):
+            prev_end = hitobjects[i - 1].tick_data()[-1][:Hitobject.TDATA_T]
+            self.assertAlmostEqual(features['distances'][i], math.dist(prev_end, (hitobjects[i].pos_x(), hitobjects[i].pos_y())))
+            self.assertEqual(features['time_deltas'][i], hitobjects[i].start_time() - hitobjects[i - 1].start_time())
+
+            density = sum(1 for h in hitobjects[:i + 1] if hitobjects[i].start_time() - Features.DENSITY_WINDOW_MS <= h.start_time())
+            self.assertEqual(features['density'][i], density)
+
+
+    def test_mania(self):
+        beatmap  = BeatmapIO.open_beatmap(os.path.join(MAPS_DIR, 'mania', 'Camellia - GHOST (qqqant) [Collab PHANTASM [MX]].osu'))
+        features = Features.extract(beatmap)
+
+        hitobjects = beatmap.hitobjects
+        for i in range(0, len(hitobjects), 37):
+            column = hitobjects[i].pos_x()
+            prev   = [ h.start_time() for h in hitobjects[:i] if h.pos_x() == column ]
+
+            if len(prev) == 0:
+                self.assertTrue(np.isnan(features['column_deltas'][i]))
+            else:
+                self.assertEqual(features['column_deltas'][i], hitobjects[i].start_time() - max(prev))
+
+            chord = sum(1 for h in hitobjects if h.start_time() == hitobjects[i].start_time())
+            self.assertEqual(features['chord_sizes'][i], chord)
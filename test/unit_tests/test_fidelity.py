@@ -0,0 +1,114 @@
+import unittest
+import os
+import concurrent.futures
+
+import numpy as np
+
+from ... import BeatmapIO, Hitobject, Mods
+from . import MAPS_DIR
+
+
+class TestFidelity(unittest.TestCase):
+
+    MAP = os.path.join(MAPS_DIR, 'osu', 'abraker - unknown (abraker) [slider_test].osu')
+
+    def setUp(self):
+        self.full = BeatmapIO.open_beatmap(TestFidelity.MAP)
+
+
+    def test_none(self):
+        beatmap = BeatmapIO.open_beatmap(TestFidelity.MAP, fidelity=Hitobject.FIDELITY_NONE)
+        self.assertTrue(np.array_equal(beatmap.hitobject_array(), self.full.hitobject_array()))
+
+        slider = next(hitobject for hitobject in beatmap.hitobjects if hitobject.is_htype(Hitobject.SLIDER) and hitobject.end_time() > hitobject.start_time())
+        self.assertEqual(slider.fidelity, Hitobject.FIDELITY_NONE)
+        self.assertEqual(len(slider.gen_points), 0)
+        self.assertEqual(len(slider.tdata), 1)
+
+        # A lower minimum opts out of generating everything
+        self.assertEqual(len(slider.tick_data(Hitobject.FIDELITY_NONE)), 1)
+        self.assertEqual(slider.fidelity, Hitobject.FIDELITY_NONE)
+
+        slider.tick_data(Hitobject.FIDELITY_ENDPOINTS)
+        self.assertEqual(slider.fidelity, Hitobject.FIDELITY_ENDPOINTS)
+        self.assertEqual(len(slider.tdata), slider.repeats + 1)
+
+        # By default the slider is completed on first access
+        full_slider = self.full.hitobjects[beatmap.hitobjects.index(slider)]
+        self.assertTrue(np.array_equal(slider.tick_data(), full_slider.tick_data()))
+        self.assertEqual(slider.fidelity, Hitobject.FIDELITY_FULL)
+
+
+    def test_endpoints(self):
+        beatmap = BeatmapIO.open_beatmap(TestFidelity.MAP, fidelity=Hitobject.FIDELITY_ENDPOINTS)
+
+        for slider, full_slider in zip(beatmap.hitobjects, self.full.hitobjects):
+            if not slider.is_htype(Hitobject.SLIDER) or slider.end_time() == slider.start_time():
+                continue
+
+            ticks = np.asarray(slider.tdata)
+            self.assertEqual(len(ticks), slider.repeats + 1)
+            self.assertTrue(np.allclose(ticks[-1], [ *full_slider.time_to_pos(full_slider.end_time()), full_slider.end_time() ]))
+
+
+    def test_upgrade(self):
+        for fidelity in [ Hitobject.FIDELITY_NONE, Hitobject.FIDELITY_ENDPOINTS ]:
+            beatmap = BeatmapIO.open_beatmap(TestFidelity.MAP, fidelity=fidelity)
+
+            self.assertTrue(np.array_equal(beatmap.stack_heights, self.full.stack_heights))
+
+            ticks, offsets = beatmap.tick_array()
+            full_ticks, full_offsets = self.full.tick_array()
+            self.assertTrue(np.array_equal(offsets, full_offsets))
+            self.assertTrue(np.array_equal(ticks, full_ticks))
+
+
+    def test_arrays_keep_fidelity(self):
+        beatmap = BeatmapIO.open_beatmap(TestFidelity.MAP, fidelity=Hitobject.FIDELITY_ENDPOINTS)
+        sliders = [ hitobject for hitobject in beatmap.hitobjects if hitobject.is_htype(Hitobject.SLIDER) ]
+        gen_points = [ id(slider.gen_points) for slider in sliders ]
+
+        ticks, offsets = beatmap.tick_array(Hitobject.FIDELITY_ENDPOINTS)
+        self.assertTrue(np.array_equal(np.diff(offsets), [ len(hitobject.tdata) for hitobject in beatmap.hitobjects ]))
+
+        # Stacking only needs slider ends, which endpoints already has
+        self.assertTrue(np.array_equal(beatmap.stack_heights, self.full.stack_heights))
+
+        # No curve was generated again and no slider was upgraded
+        self.assertEqual([ id(slider.gen_points) for slider in sliders ], gen_points)
+        self.assertTrue(all(slider.fidelity == Hitobject.FIDELITY_ENDPOINTS for slider in sliders if slider.end_time() > slider.start_time()))
+
+        # A none load gets curves, but not all ticks, for stacking
+        beatmap = BeatmapIO.open_beatmap(TestFidelity.MAP, fidelity=Hitobject.FIDELITY_NONE)
+        self.assertTrue(np.array_equal(beatmap.stack_heights, self.full.stack_heights))
+        self.assertTrue(all(hitobject.fidelity != Hitobject.FIDELITY_FULL for hitobject in beatmap.hitobjects if hitobject.is_htype(Hitobject.SLIDER) and hitobject.end_time() > hitobject.start_time()))
+
+
+    def test_upgrade_threads(self):
+        beatmap = BeatmapIO.open_beatmap(TestFidelity.MAP, fidelity=Hitobject.FIDELITY_NONE)
+        copies  = [ beatmap.copy() for _ in range(8) ]
+
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda copy: copy.tick_array(Hitobject.FIDELITY_FULL), copies))
+
+        full_ticks, full_offsets = self.full.tick_array()
+        for ticks, offsets in results:
+            self.assertTrue(np.array_equal(offsets, full_offsets))
+            self.assertTrue(np.array_equal(ticks, full_ticks))
+
+
+    def test_upgrade_modded(self):
+        for fidelity in [ Hitobject.FIDELITY_NONE, Hitobject.FIDELITY_ENDPOINTS ]:
+            beatmap = BeatmapIO.open_beatmap(TestFidelity.MAP, fidelity=fidelity)
+            modded  = beatmap.apply_mods(Mods.HARDROCK | Mods.DOUBLETIME)
+            expected = self.full.apply_mods(Mods.HARDROCK | Mods.DOUBLETIME)
+
+            ticks, offsets = modded.tick_array(Hitobject.FIDELITY_FULL)
+            self.assertTrue(np.array_equal(offsets, expected.tick_array()[1]))
+            self.assertTrue(np.allclose(ticks, expected.tick_array()[0]))
+            self.assertTrue(np.array_equal(modded.hitobject_array(), expected.hitobject_array()))
+
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            BeatmapIO.open_beatmap(TestFidelity.MAP, fidelity='some')
@@ -0,0 +1,133 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import numpy as np
+
+from ... import BeatmapIO, BeatmapIndex, Fingerprint, FingerprintIndex
+from . import MAPS_DIR
+
+
+class TestFingerprint(unittest.TestCase):
+
+    MAP_PATH = os.path.join(MAPS_DIR, 'osu', 'stargazer.osu')
+
+    def setUp(self):
+        with open(TestFingerprint.MAP_PATH, 'rt', encoding='utf-8') as f:
+            self.data = f.read()
+
+        self.beatmap = BeatmapIO.load_beatmap(self.data)
+
+
+    def edited(self, offset_ms: int = 0, every: int = 0) -> str:
+        """
+        Copy of the map with everything shifted by ``offset_ms`` and every ``every``-th hitobject moved to the corner
+        """
+        head, hitobjects = self.data.split('[HitObjects]')
+        head, timing = head.split('[TimingPoints]')
+        head += '[TimingPoints]\n'
+
+        in_timing = True
+        for line in timing.strip().splitlines():
+            in_timing = in_timing and not line.startswith('[')
+
+            data = line.split(',')
+            if in_timing and len(data) > 1:
+                data[0] = str(float(data[0]) + offset_ms)
+            head += ','.join(data) + '\n'
+
+        lines = []
+        for i, line in enumerate(hitobjects.strip().splitlines()):
+            data = line.split(',')
+            data[2] = str(int(data[2]) + offset_ms)
+            if int(data[3]) & 8:
+                data[5] = str(int(data[5]) + offset_ms)
+            if every > 0 and i % every == 0:
+                data[0], data[1] = '0', '0'
+            lines.append(','.join(data))
+
+        return head + '[HitObjects]\n' + '\n'.join(lines) + '\n'
+
+
+    def test_similarity(self):
+        signature = Fingerprint.minhash(self.beatmap)
+        self.assertEqual(signature.shape, (Fingerprint.NUM_PERMUTATIONS,))
+        self.assertTrue(np.array_equal(Fingerprint.decode(Fingerprint.encode(signature)), signature))
+
+        # Offset changes don't affect the fingerprint, small edits lower the similarity a bit
+        shifted = Fingerprint.minhash(BeatmapIO.load_beatmap(self.edited(offset_ms=1000)))
+        self.assertEqual(Fingerprint.similarity(signature, shifted), 1.0)
+
+        edited = Fingerprint.minhash(BeatmapIO.load_beatmap(self.edited(every=50)))
+        self.assertGreater(Fingerprint.similarity(signature, edited), 0.5)
+        self.assertLess(Fingerprint.similarity(signature, edited), 1.0)
+
+        other = Fingerprint.minhash(BeatmapIO.load_beatmap(self.edited(every=2)))
+        self.assertLess(Fingerprint.similarity(signature, other), 0.5)
+
+
+    def test_index(self):
+        index = FingerprintIndex()
+
+        rng = np.random.default_rng(0)
+        index.add_many(range(1000), rng.integers(0, 2**32, (1000, Fingerprint.NUM_PERMUTATIONS), dtype=np.uint32))
+        index.add('original', Fingerprint.minhash(self.beatmap))
+        index.add('edited', Fingerprint.minhash(BeatmapIO.load_beatmap(self.edited(every=50))))
+
+        results = index.query(Fingerprint.minhash(self.beatmap))
+        self.assertEqual([ key for key, _ in results ], [ 'original', 'edited' ])
+        self.assertEqual(results[0][1], 1.0)
+
+        self.assertEqual(len(index.query(Fingerprint.minhash(self.beatmap), limit=1)), 1)
+
+
+    def test_empty(self):
+        self.assertEqual(Fingerprint.band_hashes(np.zeros((0, Fingerprint.NUM_PERMUTATIONS))).shape, (0, Fingerprint.NUM_BANDS))
+        self.assertEqual(FingerprintIndex().query(Fingerprint.minhash(self.beatmap)), [])
+
+        index = FingerprintIndex()
+        index.add_many([], [])
+        self.assertEqual(index.query(Fingerprint.minhash(self.beatmap)), [])
+
+        # Nothing indexed, and nothing with a fingerprint
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, 'index.db')
+            with BeatmapIndex(db_path) as index:
+                self.assertEqual(index.find_similar(self.beatmap), [])
+
+                index.update(MAPS_DIR)
+
+            with sqlite3.connect(db_path) as db:
+                db.execute('UPDATE beatmaps SET fingerprint = NULL')
+            db.close()
+
+            with BeatmapIndex(db_path) as index:
+                self.assertGreater(len(index), 0)
+                self.assertEqual(index.find_similar(self.beatmap), [])
+
+
+    def test_beatmap_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            songs_dir = os.path.join(tmpdir, 'Songs')
+            shutil.copytree(MAPS_DIR, songs_dir)
+
+            with open(os.path.join(songs_dir, 'copy.osu'), 'wt', encoding='utf-8') as f:
+                f.write(self.edited(offset_ms=20, every=50))
+
+            # Index made before fingerprints existed; the column is added on open
+            db_path = os.path.join(tmpdir, 'index.db')
+            with sqlite3.connect(db_path) as db:
+                db.execute('CREATE TABLE beatmaps (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL)')
+            db.close()
+
+            with BeatmapIndex(db_path) as index:
+                index.update(songs_dir)
+
+                similar = index.find_similar(os.path.join(songs_dir, 'osu', 'stargazer.osu'))
+                self.assertEqual([ record['path'] for record in similar ], [ os.path.join(songs_dir, 'copy.osu') ])
+
+                similar = index.find_similar(self.beatmap, threshold=0.99)
+                self.assertEqual(len(similar), 1)
+                self.assertEqual(similar[0]['similarity'], 1.0)
@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from ... import BeatmapIO, ManiaColumns
+from . import make_beatmap
+
+
+class TestManiaColumns(unittest.TestCase):
+
+    HITOBJECTS = [
+        '64,192,0,1,0,0:0:0:0:',
+        '448,192,0,1,0,0:0:0:0:',
+        '192,192,250,128,0,1000:0:0:0:0:',
+        '64,192,500,1,0,0:0:0:0:',
+        '320,192,750,1,0,0:0:0:0:',
+        '64,192,1500,128,0,2000:0:0:0:0:',
+    ]
+
+    def setUp(self):
+        self.beatmap = BeatmapIO.load_beatmap(make_beatmap(TestManiaColumns.HITOBJECTS, [ '0,500,4,0,0,100,1,0' ], mode=3))
+        self.columns = self.beatmap.mania_columns
+
+
+    def test_columns(self):
+        self.assertEqual(self.columns.keys, 4)
+        self.assertEqual(self.columns.offsets.tolist(), [ 0, 3, 4, 5, 6 ])
+
+        starts, ends, is_hold = self.columns.column(0)
+        self.assertEqual(starts.tolist(), [ 0, 500, 1500 ])
+        self.assertEqual(ends.tolist(), [ 0, 500, 2000 ])
+        self.assertEqual(is_hold.tolist(), [ False, False, True ])
+
+        self.assertEqual(self.columns.notes(0).tolist(), [ 0, 3, 5 ])
+        self.assertEqual(self.columns.holds(1).tolist(), [ [ 250, 1000 ] ])
+
+
+    def test_columns_from_x(self):
+        x = np.arange(512)
+        for keys in [ 4, 7, 10 ]:
+            expected = [ min(int(keys * pos_x / 512), keys - 1) for pos_x in x ]
+            self.assertEqual(ManiaColumns.columns_from_x(x, keys).tolist(), expected)
+
+        # Out of range x clamps to the last column
+        self.assertEqual(ManiaColumns.columns_from_x([ 600 ], 4).tolist(), [ 3 ])
+        self.assertEqual(self.beatmap.hitobject_array()[:, 0].tolist(), [ 0, 3, 1, 0, 2, 0 ])
+
+
+    def test_lookups(self):
+        self.assertEqual(self.columns.next_note(0, 0), 3)
+        self.assertEqual(self.columns.next_note(0, 0, inclusive=True), 0)
+        self.assertEqual(self.columns.next_note(0, 1500), -1)
+        self.assertEqual(self.columns.prev_note(0, 500), 0)
+        self.assertEqual(self.columns.prev_note(0, 0), -1)
+
+        self.assertEqual(self.columns.next_notes(0, np.asarray([ -1, 0, 499, 1000, 2000 ])).tolist(), [ 0, 3, 3, 5, -1 ])
+
+        self.assertEqual(self.columns.held_at(600).tolist(), [ False, True, False, False ])
+        self.assertEqual(self.columns.held_at(1600).tolist(), [ True, False, False, False ])
+
+
+    def test_chords(self):
+        self.assertEqual(self.columns.chord(1).tolist(), [ 0, 1 ])
+        self.assertEqual(self.columns.chord(2).tolist(), [ 2 ])
+        self.assertEqual(self.columns.chord_sizes.tolist(), [ 2, 1, 1, 1, 1 ])
+
+
+    def test_other_gamemodes(self):
+        beatmap = BeatmapIO.load_beatmap(make_beatmap(TestManiaColumns.HITOBJECTS[:2], [ '0,500,4,0,0,100,1,0' ]))
+        self.assertIsNone(beatmap.mania_columns)
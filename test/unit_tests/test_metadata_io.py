@@ -0,0 +1,45 @@
+import unittest
+import os
+import subprocess
+import sys
+
+from ... import BeatmapIO, MetadataIO
+from . import ROOT_DIR, make_beatmap
+
+
+class TestMetadataIO(unittest.TestCase):
+
+    BEATMAP = make_beatmap([ '256,192,0,1,0,0:0:0:0:' ], [ '0,500,4,0,0,100,1,0' ], mode=1,
+        general  = { 'StackLeniency' : 0.4 },
+        metadata = { 'Title' : 'Some Song', 'Artist' : 'Someone', 'Creator' : 'Mapper', 'Version' : 'Hard', 'BeatmapID' : 123 },
+        OverallDifficulty = 6,
+        ApproachRate      = None,
+    )
+
+    def test_matches_beatmap(self):
+        data = TestMetadataIO.BEATMAP.encode('utf-8')
+
+        beatmap = BeatmapIO.load_beatmap(data)
+        info    = MetadataIO.load_metadata(data)
+
+        self.assertEqual(vars(info.metadata), vars(beatmap.metadata))
+        self.assertEqual(info.gamemode, beatmap.gamemode)
+        self.assertEqual(info.stack_leniency, beatmap.stack_leniency)
+
+        # AR falls back to OD
+        for key in [ 'hp', 'cs', 'od', 'ar', 'sm', 'st' ]:
+            self.assertEqual(getattr(info.difficulty, key), getattr(beatmap.difficulty, key))
+
+
+    def test_no_numpy(self):
+        code = '\n'.join([
+            'import sys',
+            'import importlib',
+            f'sys.path.insert(0, {os.path.dirname(ROOT_DIR)!r})',
+            f'MetadataIO = importlib.import_module({__package__.rsplit(".", 2)[0]!r}).MetadataIO',
+            f'info = MetadataIO.load_metadata({TestMetadataIO.BEATMAP!r})',
+            'assert info.metadata.title == "Some Song"',
+            'assert "numpy" not in sys.modules, "numpy was imported"',
+            'assert not any(name.endswith(".beatmapIO") for name in sys.modules), "beatmapIO was imported"',
+        ])
+        subprocess.run([ sys.executable, '-c', code ], check=True)
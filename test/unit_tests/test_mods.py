@@ -0,0 +1,55 @@
+import unittest
+import os
+
+import numpy as np
+
+from ... import BeatmapIO, BeatmapBase, Hitobject, Mods
+from . import MAPS_DIR
+
+
+class TestMods(unittest.TestCase):
+
+    def setUp(self):
+        self.beatmap = BeatmapIO.open_beatmap(os.path.join(MAPS_DIR, 'osu', 'Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'))
+
+
+    def test_rate(self):
+        beatmap = self.beatmap.apply_mods(Mods.DT)
+
+        self.assertEqual(beatmap.rate, 1.5)
+        self.assertEqual(beatmap.difficulty.ar, self.beatmap.difficulty.ar)
+        self.assertAlmostEqual(beatmap.bpm_max, self.beatmap.bpm_max * 1.5)
+        self.assertAlmostEqual(beatmap.timing_points[0].offset, self.beatmap.timing_points[0].offset / 1.5)
+        self.assertAlmostEqual(beatmap.hitobjects[23].start_time(), 28399 / 1.5)
+        self.assertAlmostEqual(beatmap.hitobjects[23].end_time(), 29299 / 1.5)
+        self.assertTrue(np.allclose(beatmap.hitobjects[23].tick_data()[:, Hitobject.TDATA_T], self.beatmap.hitobjects[23].tick_data()[:, Hitobject.TDATA_T] / 1.5))
+
+        # The original is untouched
+        self.assertEqual(self.beatmap.hitobjects[23].start_time(), 28399)
+        self.assertEqual(self.beatmap.rate, 1.0)
+
+
+    def test_hardrock(self):
+        beatmap = self.beatmap.apply_mods(Mods.HR)
+
+        self.assertAlmostEqual(beatmap.difficulty.cs, min(self.beatmap.difficulty.cs * 1.3, 10))
+        self.assertAlmostEqual(beatmap.difficulty.od, min(self.beatmap.difficulty.od * 1.4, 10))
+        self.assertEqual(beatmap.hitobjects[23].pos_y(), BeatmapBase.PLAYFIELD_HEIGHT - 116)
+
+        slider = beatmap.hitobjects[23]
+        for tick in slider.tick_data():
+            self.assertTrue(np.allclose(slider.time_to_pos(tick[Hitobject.TDATA_T]), tick[:Hitobject.TDATA_T]))
+
+        with self.assertRaises(ValueError):
+            beatmap.apply_mods(Mods.HR)
+
+        with self.assertRaises(ValueError):
+            self.beatmap.apply_mods(Mods.HR | Mods.EZ)
+
+
+    def test_cache(self):
+        beatmap = self.beatmap.apply_mods(Mods.HT, cache=True)
+        self.assertIs(self.beatmap.apply_mods(Mods.HT, cache=True), beatmap)
+
+        self.beatmap.set_od(5)
+        self.assertIsNot(self.beatmap.apply_mods(Mods.HT, cache=True), beatmap)
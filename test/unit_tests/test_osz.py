@@ -0,0 +1,55 @@
+import unittest
+import os
+import hashlib
+import zipfile
+import tempfile
+
+from ... import BeatmapIO
+from . import MAPS_DIR
+
+
+class TestOsz(unittest.TestCase):
+
+    MAPS = [
+        os.path.join(MAPS_DIR, 'osu', 'Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'),
+        os.path.join(MAPS_DIR, 'osu', 'abraker - unknown (abraker) [250ms].osu'),
+    ]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.osz_path = os.path.join(self.tmpdir.name, 'set.osz')
+
+        with zipfile.ZipFile(self.osz_path, 'w', zipfile.ZIP_DEFLATED) as osz_file:
+            for path in TestOsz.MAPS:
+                osz_file.write(path, os.path.basename(path))
+            osz_file.writestr('audio.mp3', b'\x00'*1024)
+
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+
+    def test_open_osz(self):
+        beatmaps = BeatmapIO.open_osz(self.osz_path)
+        self.assertEqual(list(beatmaps.keys()), [ os.path.basename(path) for path in TestOsz.MAPS ])
+
+        for path in TestOsz.MAPS:
+            expected = BeatmapIO.open_beatmap(path)
+            beatmap  = beatmaps[os.path.basename(path)]
+
+            self.assertEqual(len(beatmap.hitobjects), len(expected.hitobjects))
+            self.assertEqual(beatmap.metadata.beatmap_md5, expected.metadata.beatmap_md5)
+
+            with open(path, 'rb') as f:
+                self.assertEqual(beatmap.metadata.beatmap_md5, hashlib.md5(f.read()).hexdigest())
+
+
+    def test_open_osz_dir(self):
+        with open(os.path.join(self.tmpdir.name, 'broken.osz'), 'wb') as f:
+            f.write(b'not a zip')
+
+        with self.assertRaises(BeatmapIO.BeatmapIOException):
+            list(BeatmapIO.open_osz_dir(self.tmpdir.name))
+
+        results = list(BeatmapIO.open_osz_dir(self.tmpdir.name, skip_errors=True))
+        self.assertEqual([ name for _, name, _ in results ], [ os.path.basename(path) for path in TestOsz.MAPS ])
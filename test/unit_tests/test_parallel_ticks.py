@@ -0,0 +1,50 @@
+import unittest
+import os
+
+import numpy as np
+
+from ... import BeatmapIO
+from . import MAPS_DIR
+
+
+class TestParallelTicks(unittest.TestCase):
+
+    MAPS = [
+        os.path.join(MAPS_DIR, 'osu', 'abraker - unknown (abraker) [slider_test].osu'),
+        os.path.join(MAPS_DIR, 'osu', 'stargazer.osu'),
+    ]
+
+    def setUp(self):
+        self.threshold = BeatmapIO.PARALLEL_TICK_THRESHOLD
+        BeatmapIO.PARALLEL_TICK_THRESHOLD = 0
+
+
+    def tearDown(self):
+        BeatmapIO.PARALLEL_TICK_THRESHOLD = self.threshold
+
+
+    def test_same_as_serial(self):
+        for filepath in TestParallelTicks.MAPS:
+            serial = BeatmapIO.open_beatmap(filepath)
+            ticks, offsets = serial.tick_array()
+
+            for threads in [ False, True ]:
+                beatmap = BeatmapIO.open_beatmap(filepath, tick_workers=2, tick_threads=threads)
+
+                parallel_ticks, parallel_offsets = beatmap.tick_array()
+                self.assertTrue(np.array_equal(offsets, parallel_offsets))
+                self.assertTrue(np.array_equal(ticks, parallel_ticks))
+                self.assertTrue(np.array_equal(serial.hitobject_array(), beatmap.hitobject_array()))
+
+                for a, b in zip(serial.hitobjects, beatmap.hitobjects):
+                    if a.is_htype(a.SLIDER) and a.end_time() > a.start_time():
+                        self.assertTrue(np.allclose(a.time_to_pos(a.end_time()), b.time_to_pos(b.end_time())))
+
+
+    def test_no_sliders(self):
+        filepath = os.path.join(MAPS_DIR, 'mania', 'Camellia - GHOST (qqqant) [Collab PHANTASM [MX]].osu')
+        serial   = BeatmapIO.open_beatmap(filepath)
+
+        for threads in [ False, True ]:
+            beatmap = BeatmapIO.open_beatmap(filepath, tick_workers=2, tick_threads=threads)
+            self.assertTrue(np.array_equal(serial.hitobject_array(), beatmap.hitobject_array()))
@@ -0,0 +1,65 @@
+import unittest
+import os
+
+import numpy as np
+
+from ... import BeatmapIO, Hitobject
+from . import MAPS_DIR
+
+
+class TestResamplePath(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.beatmap = BeatmapIO.open_beatmap(os.path.join(MAPS_DIR, 'osu', 'abraker - unknown (abraker) [slider_test].osu'))
+        cls.sliders = [ hitobject for hitobject in cls.beatmap.hitobjects if hitobject.is_htype(Hitobject.SLIDER) ]
+
+
+    def test_spacing(self):
+        for slider in TestResamplePath.sliders:
+            points = slider.resample_path(spacing_px=5)
+            length = slider.length_sums[-1] if len(slider.length_sums) > 0 else 0
+
+            self.assertTrue(np.allclose(points[0], slider.gen_points[0]))
+            self.assertTrue(np.allclose(points[-1], slider.gen_points[-1]))
+            self.assertEqual(len(points), max(int(np.ceil((length - slider.PRECISION_THRESHOLD_PX) / 5)), 0) + 1)
+
+            # Distance along the path between consecutive points never exceeds the spacing; straight
+            # segments are exactly the spacing apart
+            spacing = np.linalg.norm(np.diff(points, axis=0), axis=1)
+            self.assertTrue(np.all(spacing <= 5 + 1e-3))
+
+
+    def test_num_points(self):
+        for slider in TestResamplePath.sliders:
+            points = slider.resample_path(num_points=16)
+
+            self.assertEqual(len(points), 16)
+            self.assertTrue(np.allclose(points[-1], slider.gen_points[-1]))
+
+
+    def test_batch(self):
+        points, offsets = TestResamplePath.beatmap.resample_paths(spacing_px=8)
+
+        self.assertEqual(len(offsets), len(TestResamplePath.beatmap.hitobjects) + 1)
+        self.assertEqual(offsets[-1], len(points))
+
+        for i, hitobject in enumerate(TestResamplePath.beatmap.hitobjects):
+            if not hitobject.is_htype(Hitobject.SLIDER):
+                self.assertEqual(offsets[i + 1], offsets[i])
+                continue
+
+            self.assertTrue(np.allclose(points[offsets[i]:offsets[i + 1]], hitobject.resample_path(spacing_px=8)))
+
+
+    def test_invalid(self):
+        slider = TestResamplePath.sliders[0]
+
+        with self.assertRaises(ValueError):
+            slider.resample_path()
+
+        with self.assertRaises(ValueError):
+            slider.resample_path(spacing_px=5, num_points=5)
+
+        with self.assertRaises(ValueError):
+            slider.resample_path(num_points=1)
@@ -0,0 +1,121 @@
+import unittest
+import os
+import sys
+import subprocess
+
+import numpy as np
+
+from multiprocessing import shared_memory
+
+from ... import BeatmapIO, BeatmapBase, Features, Hitobject, Mods, SharedBeatmap, SharedBeatmapView
+from . import MAPS_DIR, ROOT_DIR
+
+
+def view_length(descriptor: dict) -> int:
+    with SharedBeatmapView(descriptor) as view:
+        return len(view.hitobjects)
+
+
+class TestSharedBeatmap(unittest.TestCase):
+
+    def test_round_trip(self):
+        beatmap = BeatmapIO.open_beatmap(os.path.join(MAPS_DIR, 'osu', 'Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'))
+        shared  = SharedBeatmap.export(beatmap)
+
+        with SharedBeatmapView(shared.acquire()) as view:
+            self.assertEqual(len(view.hitobjects), len(beatmap.hitobjects))
+            self.assertEqual(view.metadata.name, beatmap.metadata.name)
+            self.assertEqual(view.difficulty.od, beatmap.difficulty.od)
+            self.assertEqual(len(view.timing_points), len(beatmap.timing_points))
+
+            self.assertTrue(view.hitobjects[23].is_htype(Hitobject.SLIDER))
+            self.assertEqual(view.hitobjects[23].start_time(), 28399)
+            self.assertTrue(np.array_equal(view.hitobjects[23].tick_data(), beatmap.hitobjects[23].tick_data()))
+            self.assertTrue(np.array_equal(view.data(), beatmap.data()))
+
+            with self.assertRaises(ValueError):
+                view.hitobject_array()[0, Hitobject.HDATA_POSX] = 0
+
+        shared.release()
+        self.assertIn(shared.name, SharedBeatmap.live())
+
+        shared.release()
+        self.assertNotIn(shared.name, SharedBeatmap.live())
+
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=shared.name)
+
+
+    def test_analysis(self):
+        beatmap = BeatmapIO.open_beatmap(os.path.join(MAPS_DIR, 'osu', 'stargazer.osu'))
+        shared  = SharedBeatmap.export(beatmap)
+
+        # What workers of a pipeline run on the views they're handed
+        with SharedBeatmapView(shared.acquire()) as view:
+            features = Features.extract(view)
+            expected = Features.extract(beatmap)
+            for name, values in expected.items():
+                self.assertTrue(np.array_equal(features[name], values, equal_nan=True), name)
+
+            # Views have no slider paths, so slider ends are their last tick instead; a few
+            # hitobjects right at the stacking distance can come out differently
+            self.assertEqual(view.stack_heights.shape, beatmap.stack_heights.shape)
+            self.assertGreater(np.mean(view.stack_heights == beatmap.stack_heights), 0.99)
+
+            ticks, tick_offsets = view.stacked_tick_array()
+            self.assertEqual(ticks.shape, beatmap.stacked_tick_array()[0].shape)
+            self.assertTrue(np.array_equal(tick_offsets, beatmap.tick_array()[1]))
+
+        shared.release()
+        shared.release()
+
+
+    def test_pool(self):
+        # Workers share the owner's resource tracker. Attaching must not touch the owner's registration,
+        # or the tracker fails to unregister the segment on release (and wouldn't clean it up on a crash).
+        package = __package__.rsplit('.', 2)[0]
+        code = '\n'.join([
+            'import sys, importlib, multiprocessing',
+            f'sys.path.insert(0, {os.path.dirname(ROOT_DIR)!r})',
+            f'package = importlib.import_module({package!r})',
+            f'test = importlib.import_module({__name__!r})',
+            'if __name__ == "__main__":',
+            f'    beatmap = package.BeatmapIO.open_beatmap({os.path.join(MAPS_DIR, "osu", "stargazer.osu")!r})',
+            '    shared = package.SharedBeatmap.export(beatmap)',
+            '    with multiprocessing.get_context("spawn").Pool(2) as pool:',
+            '        lengths = pool.map(test.view_length, [ shared.acquire() for _ in range(4) ])',
+            '    assert lengths == [ len(beatmap.hitobjects) ]*4, lengths',
+            '    for _ in range(5): shared.release()',
+            '    assert shared.name not in package.SharedBeatmap.live()',
+        ])
+
+        result = subprocess.run([ sys.executable, '-c', code ], capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertNotIn('KeyError', result.stderr)
+        self.assertNotIn('leaked', result.stderr)
+
+
+    def test_apply_mods(self):
+        beatmap = BeatmapIO.open_beatmap(os.path.join(MAPS_DIR, 'osu', 'Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'))
+        shared  = SharedBeatmap.export(beatmap)
+
+        with SharedBeatmapView(shared.acquire()) as view:
+            modded = {
+                mods : view.apply_mods(mods, cache=True)
+                    for mods in [ Mods.HARDROCK, Mods.EASY, Mods.HARDROCK | Mods.DOUBLETIME ]
+            }
+            self.assertIs(view.apply_mods(Mods.HARDROCK, cache=True), modded[Mods.HARDROCK])
+
+        # The results don't reference the segment, so they outlive the view
+        shared.release()
+        shared.release()
+
+        for mods, result in modded.items():
+            expected = beatmap.apply_mods(mods)
+            self.assertIsInstance(result, BeatmapBase)
+            self.assertEqual(result.mods, mods)
+            self.assertEqual(vars(result.difficulty), vars(expected.difficulty))
+            self.assertTrue(np.array_equal(result.hitobject_array(), expected.hitobject_array()))
+            self.assertTrue(np.allclose(result.tick_array()[0], expected.tick_array()[0]))
+            self.assertTrue(np.array_equal(result.timing_array(), expected.timing_array()))
+            self.assertEqual(result.derived.hit_windows, expected.derived.hit_windows)
@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+
+from ... import BeatmapIO, Hitobject, Mods
+from . import make_beatmap
+
+
+class TestStacking(unittest.TestCase):
+
+    BEATMAP = make_beatmap([
+        '100,100,0,1,0,0:0:0:0:',
+        '100,100,100,1,0,0:0:0:0:',
+        '100,100,200,1,0,0:0:0:0:',
+        '100,100,850,1,0,0:0:0:0:',
+        '300,300,3000,2,0,L|400:300,1,100',
+        '400,300,3600,1,0,0:0:0:0:',
+        '401,300,3700,1,0,0:0:0:0:',
+    ], [ '0,500,4,0,0,100,1,0' ], general={ 'StackLeniency' : 0.5 }, ApproachRate=5, SliderMultiplier=1)
+
+    def setUp(self):
+        self.beatmap = BeatmapIO.load_beatmap(TestStacking.BEATMAP)
+
+
+    def test_stack_heights(self):
+        self.assertEqual(self.beatmap.stack_leniency, 0.5)
+
+        # Circles stack up-left; circles on a slider end stack down-right, away from the slider
+        self.assertEqual(self.beatmap.stack_heights.tolist(), [ 2, 1, 0, 0, 0, -1, -2 ])
+
+
+    def test_stacked_positions(self):
+        raw     = self.beatmap.hitobject_array()
+        stacked = self.beatmap.stacked_hitobject_array()
+
+        offset = -self.beatmap.stack_heights*self.beatmap.derived.circle_radius/10
+        self.assertTrue(np.allclose(stacked[:, Hitobject.HDATA_POSX], raw[:, Hitobject.HDATA_POSX] + offset))
+        self.assertTrue(np.allclose(stacked[:, Hitobject.HDATA_POSY], raw[:, Hitobject.HDATA_POSY] + offset))
+        self.assertTrue(np.array_equal(stacked[:, Hitobject.HDATA_TSRT:], raw[:, Hitobject.HDATA_TSRT:]))
+
+        ticks, offsets = self.beatmap.tick_array()
+        stacked_ticks, stacked_offsets = self.beatmap.stacked_tick_array()
+        self.assertTrue(np.array_equal(offsets, stacked_offsets))
+        self.assertTrue(np.allclose(stacked_ticks[:, Hitobject.TDATA_X], ticks[:, Hitobject.TDATA_X] + np.repeat(offset, np.diff(offsets))))
+
+
+    def test_window(self):
+        # Shorter leniency; the 100 ms gaps no longer fit in the stacking window
+        self.beatmap.stack_leniency = 0.05
+        self.beatmap.update_stacking()
+        self.assertEqual(self.beatmap.stack_heights.tolist(), [ 0, 0, 0, 0, 0, 0, 0 ])
+
+
+    def test_mods(self):
+        self.assertEqual(self.beatmap.apply_mods(Mods.DT).stack_heights.tolist(), self.beatmap.stack_heights.tolist())
+
+        # EZ halves AR, which lengthens preempt and with it the stacking window
+        self.assertEqual(self.beatmap.apply_mods(Mods.EZ).stack_heights.tolist(), [ 3, 2, 1, 0, 0, -1, -2 ])
@@ -0,0 +1,102 @@
+import unittest
+import os
+import tempfile
+import importlib.util
+
+import numpy as np
+
+from ... import BeatmapIO, TableExport, TableShardWriter, Hitobject
+from . import MAPS_DIR
+
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+HAS_PANDAS  = importlib.util.find_spec('pandas') is not None
+
+
+class TestTableExport(unittest.TestCase):
+
+    MAPS = [
+        os.path.join(MAPS_DIR, 'osu', 'abraker - unknown (abraker) [slider_test].osu'),
+        os.path.join(MAPS_DIR, 'mania', 'Camellia - GHOST (qqqant) [Collab PHANTASM [MX]].osu'),
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.beatmaps = [ BeatmapIO.open_beatmap(filepath) for filepath in TestTableExport.MAPS ]
+
+
+    def test_columns(self):
+        beatmap = self.beatmaps[0]
+        columns = TableExport.columns(beatmap, 'hitobjects')
+
+        self.assertEqual(list(columns), list(TableExport.HITOBJECT_COLUMNS))
+        self.assertTrue(np.array_equal(columns['start_time'], beatmap.hitobject_array()[:, Hitobject.HDATA_TSRT]))
+        self.assertTrue(all(column.flags['C_CONTIGUOUS'] for column in columns.values()))
+
+        # Type bit flags are ints, not part of the float buffer
+        self.assertEqual(columns['type'].dtype, np.int64)
+        self.assertEqual(columns['x'].dtype, np.float64)
+        self.assertTrue(np.array_equal(columns['type'], beatmap.hitobject_array()[:, Hitobject.HDATA_TYPE]))
+
+        ticks, offsets = beatmap.tick_array()
+        columns = TableExport.columns(beatmap, 'ticks')
+        self.assertTrue(np.array_equal(columns['time'], ticks[:, Hitobject.TDATA_T]))
+        self.assertTrue(np.array_equal(np.searchsorted(columns['hitobject'], np.arange(len(beatmap.hitobjects))), offsets[:-1]))
+
+
+    def test_batch(self):
+        columns = TableExport.columns(self.beatmaps, 'ticks', first_id=10)
+
+        ticks = [ beatmap.tick_array()[0] for beatmap in self.beatmaps ]
+        self.assertTrue(np.array_equal(np.bincount(columns['beatmap'] - 10), [ len(t) for t in ticks ]))
+        self.assertTrue(np.array_equal(columns['time'], np.concatenate([ t[:, -1] for t in ticks ])))
+
+        # osu!mania ticks are (column, time)
+        is_mania = columns['beatmap'] == 11
+        self.assertTrue(np.all(np.isnan(columns['y'][is_mania])))
+        self.assertTrue(np.array_equal(columns['x'][is_mania], ticks[1][:, 0]))
+
+
+    @unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+    def test_arrow(self):
+        import pyarrow as pa
+
+        columns = TableExport.columns(self.beatmaps, 'hitobjects')
+        batch   = TableExport.to_arrow(self.beatmaps, 'hitobjects')
+
+        self.assertEqual(batch.schema.names, list(columns))
+        self.assertTrue(np.array_equal(batch.column('x').to_numpy(), columns['x']))
+        self.assertEqual(batch.schema.field('type').type, pa.int64())
+        self.assertEqual(batch.schema.field('beatmap').type, pa.int64())
+
+
+    @unittest.skipUnless(HAS_PANDAS, 'pandas is not installed')
+    def test_pandas(self):
+        frame = TableExport.to_pandas(self.beatmaps, 'timing_points')
+
+        self.assertEqual(list(frame.columns), [ 'beatmap' ] + list(TableExport.TIMING_COLUMNS))
+        self.assertTrue(np.array_equal(frame['bpm'].to_numpy(), np.concatenate([ b.timing_array()[:, 5] for b in self.beatmaps ])))
+
+        frame = TableExport.to_pandas(self.beatmaps, 'hitobjects')
+        self.assertEqual(list(frame.columns), [ 'beatmap' ] + list(TableExport.HITOBJECT_COLUMNS))
+        self.assertEqual(frame['type'].dtype, np.int64)
+
+
+    @unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+    def test_shards(self):
+        import pyarrow as pa
+
+        with tempfile.TemporaryDirectory() as dirpath:
+            with TableShardWriter(dirpath, format='ipc', max_rows_per_shard=500, batch_rows=100) as writer:
+                self.assertEqual(writer.add_files(TestTableExport.MAPS), 2)
+
+            shards = sorted(filename for filename in os.listdir(dirpath) if filename.startswith('hitobjects-'))
+            self.assertGreater(len(shards), 1)
+
+            tables = [ pa.ipc.open_file(os.path.join(dirpath, filename)).read_all() for filename in shards ]
+            self.assertEqual(sum(table.num_rows for table in tables), sum(len(b.hitobjects) for b in self.beatmaps))
+            self.assertTrue(all(table.num_rows <= 500 for table in tables))
+            self.assertEqual(tables[0].schema.field('type').type, pa.int64())
+
+            columns = TableExport.columns(self.beatmaps, 'hitobjects')
+            self.assertTrue(np.array_equal(pa.concat_tables(tables).column('type').to_numpy(), columns['type']))
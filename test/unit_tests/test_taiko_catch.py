@@ -0,0 +1,87 @@
+import unittest
+import io
+
+import numpy as np
+
+from ... import BeatmapIO, Gamemode, Hitobject
+from . import make_beatmap
+
+
+class TestTaikoCatch(unittest.TestCase):
+
+    TIMING_POINTS = [
+        '0,500,4,0,0,100,1,0',
+        '1000,-50,4,0,0,100,0,0',
+    ]
+
+    HITOBJECTS = [
+        '256,192,0,1,0,0:0:0:0:',
+        '256,192,250,1,2,0:0:0:0:',
+        '256,192,500,5,12,0:0:0:0:',
+        '100,100,1000,2,4,L|300:100,2,200',
+        '256,192,3000,12,0,4000,0:0:0:0:',
+    ]
+
+    def test_taiko(self):
+        beatmap = BeatmapIO.load_beatmap(make_beatmap(TestTaikoCatch.HITOBJECTS, TestTaikoCatch.TIMING_POINTS, mode=Gamemode.TAIKO))
+        self.assertEqual(beatmap.gamemode, Gamemode.TAIKO)
+
+        self.assertEqual([ hitobject.is_kat() for hitobject in beatmap.hitobjects[:3] ], [ False, True, True ])
+        self.assertEqual([ hitobject.is_big() for hitobject in beatmap.hitobjects[:4] ], [ False, False, True, True ])
+
+        # Drumroll lasts as long as the slider would; 2 spans of 200 px at 2x slider velocity
+        drumroll = beatmap.hitobjects[3]
+        self.assertAlmostEqual(drumroll.end_time(), 1000 + 2*200/(1.4*100*2/500))
+
+        # Hits every 1/4 of the uninherited beat
+        self.assertTrue(np.allclose(drumroll.tick_data()[:, Hitobject.TDATA_T], np.arange(1000, 1751, 125)))
+
+        self.assertEqual(beatmap.hitobjects[4].end_time(), 4000)
+
+        # Drumrolls have no path
+        points, offsets = beatmap.resample_paths(spacing_px=10)
+        self.assertEqual(len(points), 0)
+        self.assertEqual(len(offsets), len(beatmap.hitobjects) + 1)
+
+
+    def test_catch(self):
+        beatmap = BeatmapIO.load_beatmap(make_beatmap(TestTaikoCatch.HITOBJECTS, TestTaikoCatch.TIMING_POINTS, mode=Gamemode.CATCH))
+        self.assertEqual(beatmap.gamemode, Gamemode.CATCH)
+
+        juice_stream = beatmap.hitobjects[3]
+        ticks = juice_stream.tick_data()
+
+        # Fruits at the head, repeat and tail, tiny droplets in between
+        fruits = ticks[juice_stream.tick_types == juice_stream.FRUIT]
+        self.assertTrue(np.allclose(fruits[:, Hitobject.TDATA_T], [ 1000, (1000 + juice_stream.end_time())/2, juice_stream.end_time() ]))
+        self.assertTrue(np.allclose(fruits[:, Hitobject.TDATA_X], [ 100, 300, 100 ], atol=0.1))
+
+        self.assertTrue(np.all(juice_stream.tick_types[1:4] == juice_stream.TINY_DROPLET))
+        self.assertTrue(np.all(np.diff(ticks[:, Hitobject.TDATA_T]) > 0))
+
+        # Tiny droplets lie on the path
+        for x, y, t in ticks:
+            self.assertTrue(np.allclose([ x, y ], juice_stream.time_to_pos(t)))
+
+        # Bananas every 1000/16 ms over the whole banana shower, inclusive
+        bananas = beatmap.hitobjects[4].tick_data()
+        self.assertTrue(np.allclose(bananas[:, Hitobject.TDATA_T], np.linspace(3000, 4000, 17)))
+
+
+    def test_catch_zero_length_banana_shower(self):
+        beatmap = BeatmapIO.load_beatmap(make_beatmap(TestTaikoCatch.HITOBJECTS[:-1] + [ '256,192,3000,12,0,3000,0:0:0:0:' ], TestTaikoCatch.TIMING_POINTS, mode=Gamemode.CATCH))
+
+        self.assertEqual(beatmap.hitobjects[4].tick_data().shape, (0, 3))
+        self.assertEqual(len(beatmap.tick_array()[0]), beatmap.tick_array()[1][-1])
+
+
+    def test_write(self):
+        for mode in [ Gamemode.TAIKO, Gamemode.CATCH ]:
+            beatmap = BeatmapIO.load_beatmap(make_beatmap(TestTaikoCatch.HITOBJECTS, TestTaikoCatch.TIMING_POINTS, mode=mode))
+
+            stream = io.StringIO()
+            BeatmapIO.write_beatmap(beatmap, stream)
+            written = BeatmapIO.load_beatmap(stream.getvalue())
+
+            self.assertTrue(np.array_equal(beatmap.hitobject_array(), written.hitobject_array()))
+            self.assertEqual([ hitobject.hitsound for hitobject in written.hitobjects ], [ 0, 2, 12, 4, 0 ])
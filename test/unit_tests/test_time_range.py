@@ -0,0 +1,63 @@
+import unittest
+import os
+
+import numpy as np
+
+from ... import BeatmapIO, BeatmapLoader, BeatmapCache, Hitobject
+from . import MAPS_DIR, make_beatmap
+
+
+class TestTimeRange(unittest.TestCase):
+
+    MAPS = [
+        os.path.join(MAPS_DIR, 'osu', 'stargazer.osu'),
+        os.path.join(MAPS_DIR, 'osu', 'abraker - unknown (abraker) [slider_test].osu'),
+        os.path.join(MAPS_DIR, 'mania', 'Camellia - GHOST (qqqant) [Collab PHANTASM [MX]].osu'),
+    ]
+
+    def test_same_as_full_load(self):
+        for filepath in TestTimeRange.MAPS:
+            full = BeatmapIO.open_beatmap(filepath)
+            hitobject_data = full.hitobject_array()
+
+            start = hitobject_data[len(hitobject_data) // 3, Hitobject.HDATA_TSRT]
+            end   = hitobject_data[len(hitobject_data) // 2, Hitobject.HDATA_TSRT]
+
+            beatmap = BeatmapIO.open_beatmap(filepath, time_range=(start, end))
+
+            overlapping = ( hitobject_data[:, Hitobject.HDATA_TEND] >= start ) & ( hitobject_data[:, Hitobject.HDATA_TSRT] <= end )
+            self.assertTrue(np.array_equal(beatmap.hitobject_array(), hitobject_data[overlapping]))
+            self.assertTrue(np.array_equal(beatmap.timing_array(), full.timing_array()))
+
+            for i, hitobject in zip(np.flatnonzero(overlapping), beatmap.hitobjects):
+                self.assertTrue(np.array_equal(hitobject.tdata, full.hitobjects[i].tdata))
+
+
+    def test_long_objects_before_window(self):
+        # Slider and spinner starting before the window and ending inside it are kept
+        beatmap_data = make_beatmap([
+            '100,100,0,1,0,0:0:0:0:',
+            '100,100,500,2,0,L|400:100,1,300,0:0|0:0,0:0:0:0:',
+            '256,192,1000,12,0,3000,0:0:0:0:',
+            '100,100,1200,2,0,L|150:100,1,50,0:0|0:0,0:0:0:0:',
+            '100,100,2000,1,0,0:0:0:0:',
+            '100,100,5000,1,0,0:0:0:0:',
+        ], [ '0,500,4,2,0,100,1,0' ], SliderMultiplier=1)
+
+        beatmap = BeatmapIO.load_beatmap(beatmap_data, time_range=(1800, 2500))
+        self.assertEqual([ hitobject.start_time() for hitobject in beatmap.hitobjects ], [ 500, 1000, 2000 ])
+
+
+    def test_loader_cache(self):
+        with open(TestTimeRange.MAPS[0], 'rb') as f:
+            beatmap_data = f.read()
+
+        loader = BeatmapLoader(cache=BeatmapCache())
+        full   = loader.load_beatmap(beatmap_data)
+        window = loader.with_options(time_range=(60000, 90000)).load_beatmap(beatmap_data)
+
+        self.assertLess(len(window.hitobjects), len(full.hitobjects))
+        self.assertEqual(len(loader.cache), 2)
+
+        with self.assertRaises(ValueError):
+            BeatmapLoader(time_range=(10, 0))